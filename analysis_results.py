@@ -0,0 +1,221 @@
+"""
+Bellekte çok sayıda tutulan analiz sonuçları için sıkı (compact) sonuç tipleri.
+
+analyze_face / analyze_body sözlükleri iç içe sözlükler, listeler ve her sonuç için ayrı
+hex metinleri içerir. FaceResult ve BodyResult __slots__ kullanır: RGB değerleri tek bir
+24 bitlik tamsayıda, etiketler paylaşılan (intern edilmiş) metinler olarak saklanır,
+hex ise gerektiğinde RGB'den üretilir. to_dict() mevcut Türkçe anahtarlı şemayı aynen döndürür.
+
+Bellek ölçümü: python analysis_results.py --adet 100000
+"""
+import argparse
+import sys
+import tracemalloc
+
+import numpy as np
+
+
+def pack_rgb(rgb):
+    """[r, g, b] değerini 0xRRGGBB tamsayısına çevirir"""
+    r, g, b = (int(v) for v in rgb[:3])
+    return (r << 16) | (g << 8) | b
+
+
+def unpack_rgb(value):
+    """0xRRGGBB tamsayısını [r, g, b] listesine çevirir"""
+    return [(value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF]
+
+
+def _hex_override(rgb_value, hex_value):
+    # Hex RGB'den üretilebiliyorsa saklanmaz (None); farklıysa (ör. varsayılan sonuç) aynen tutulur
+    return None if hex_value == f"#{rgb_value:06x}" else sys.intern(hex_value)
+
+
+class FaceResult:
+    """Tek bir yüz analizi sonucu (analyze_face sözlüğünün sıkı karşılığı)"""
+
+    __slots__ = ("ten_rgb", "ten_rengi", "goz_rgb", "goz_rengi", "yuz_sekli", "oran",
+                 "_ten_hex", "_goz_hex")
+
+    def __init__(self, ten_rgb, ten_rengi, goz_rgb, goz_rengi, yuz_sekli, oran, ten_hex=None, goz_hex=None):
+        self.ten_rgb = ten_rgb
+        self.ten_rengi = sys.intern(ten_rengi)
+        self.goz_rgb = goz_rgb
+        self.goz_rengi = sys.intern(goz_rengi)
+        self.yuz_sekli = sys.intern(yuz_sekli)
+        self.oran = oran
+        self._ten_hex = ten_hex
+        self._goz_hex = goz_hex
+
+    @classmethod
+    def from_dict(cls, result):
+        """analyze_face sonuç sözlüğünden oluşturur"""
+        skin, eye, shape = result["ten_rengi"], result["goz_rengi"], result["yuz_sekli"]
+        ten_rgb, goz_rgb = pack_rgb(skin["rgb"]), pack_rgb(eye["rgb"])
+        return cls(ten_rgb, skin["tahmini_renk"], goz_rgb, eye["tahmini_renk"],
+                   shape["sekil"], shape["oran"],
+                   _hex_override(ten_rgb, skin["hex"]), _hex_override(goz_rgb, eye["hex"]))
+
+    @property
+    def ten_hex(self):
+        return self._ten_hex or f"#{self.ten_rgb:06x}"
+
+    @property
+    def goz_hex(self):
+        return self._goz_hex or f"#{self.goz_rgb:06x}"
+
+    def to_dict(self):
+        """analyze_face ile aynı şemada sözlük döndürür"""
+        return {
+            "ten_rengi": {
+                "rgb": unpack_rgb(self.ten_rgb),
+                "hex": self.ten_hex,
+                "tahmini_renk": self.ten_rengi
+            },
+            "goz_rengi": {
+                "rgb": unpack_rgb(self.goz_rgb),
+                "hex": self.goz_hex,
+                "tahmini_renk": self.goz_rengi
+            },
+            "yuz_sekli": {
+                "sekil": self.yuz_sekli,
+                "oran": self.oran
+            }
+        }
+
+    def __repr__(self):
+        return f"FaceResult(ten={self.ten_rengi}, goz={self.goz_rengi}, sekil={self.yuz_sekli}, oran={self.oran})"
+
+
+class BodyResult:
+    """Tek bir vücut analizi sonucu (analyze_body sözlüğünün sıkı karşılığı)"""
+
+    __slots__ = ("vucut_tipi", "aciklama", "omuz_kalca_orani", "bel_kalca_orani", "boy_genislik_orani")
+
+    def __init__(self, vucut_tipi, aciklama, omuz_kalca_orani, bel_kalca_orani, boy_genislik_orani):
+        self.vucut_tipi = sys.intern(vucut_tipi)
+        self.aciklama = sys.intern(aciklama)
+        self.omuz_kalca_orani = omuz_kalca_orani
+        self.bel_kalca_orani = bel_kalca_orani
+        self.boy_genislik_orani = boy_genislik_orani
+
+    @classmethod
+    def from_dict(cls, result):
+        """analyze_body sonuç sözlüğünden oluşturur"""
+        ratios = result["oranlar"]
+        return cls(result["vucut_tipi"], result["aciklama"], ratios["omuz_kalca_orani"],
+                   ratios["bel_kalca_orani"], ratios["boy_genislik_orani"])
+
+    def to_dict(self):
+        """analyze_body ile aynı şemada sözlük döndürür"""
+        return {
+            "vucut_tipi": self.vucut_tipi,
+            "aciklama": self.aciklama,
+            "oranlar": {
+                "omuz_kalca_orani": self.omuz_kalca_orani,
+                "bel_kalca_orani": self.bel_kalca_orani,
+                "boy_genislik_orani": self.boy_genislik_orani
+            }
+        }
+
+    def __repr__(self):
+        return f"BodyResult(tip={self.vucut_tipi}, omuz_kalca={self.omuz_kalca_orani})"
+
+
+def compact_result(kind, result):
+    """Sonuç sözlüğünü türüne göre FaceResult/BodyResult'a çevirir (None ise None)"""
+    if result is None:
+        return None
+    return FaceResult.from_dict(result) if kind == "yuz" else BodyResult.from_dict(result)
+
+
+def _sample_results(count, seed=0):
+    """Ölçüm için gerçekçi (her biri ayrı liste ve hex metni içeren) yüz sonuç sözlükleri üretir"""
+    rng = np.random.default_rng(seed)
+    skin_labels = ["açık", "orta", "koyu"]
+    eye_labels = ["mavi", "yeşil", "kahverengi", "gri", "siyah"]
+    shapes = ["oval", "yuvarlak", "kare", "kalp"]
+    colors = rng.integers(0, 256, size=(count, 6))
+    ratios = np.round(rng.uniform(0.6, 1.1, size=count), 2)
+
+    results = []
+    for i in range(count):
+        skin, eye = colors[i, :3].astype(np.int32), colors[i, 3:].astype(np.int32)
+        results.append({
+            "ten_rengi": {"rgb": skin.tolist(), "hex": "#%02x%02x%02x" % tuple(skin.tolist()),
+                          "tahmini_renk": skin_labels[i % 3]},
+            "goz_rengi": {"rgb": eye.tolist(), "hex": "#%02x%02x%02x" % tuple(eye.tolist()),
+                          "tahmini_renk": eye_labels[i % 5]},
+            "yuz_sekli": {"sekil": shapes[i % 4], "oran": float(ratios[i])},
+        })
+    return results
+
+
+def _copy_result(result):
+    """
+    Sonuç sözlüğünün analizcinin üreteceği gibi bağımsız bir kopyası: listeler, hex metinleri
+    ve oran değerleri yeni nesnelerdir; yalnızca etiket metinleri (kaynak koddaki sabitler) paylaşılır.
+    """
+    copy = {}
+    for key in ("ten_rengi", "goz_rengi"):
+        rgb = [int(v) for v in result[key]["rgb"]]
+        copy[key] = {"rgb": rgb, "hex": "#%02x%02x%02x" % tuple(rgb),
+                     "tahmini_renk": result[key]["tahmini_renk"]}
+    shape = result["yuz_sekli"]
+    copy["yuz_sekli"] = {"sekil": shape["sekil"], "oran": round(shape["oran"], 2)}
+    return copy
+
+
+def _traced_size(before):
+    """before anlık görüntüsünden bu yana ayrılmış ve hâlâ tutulan bayt miktarı"""
+    return sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+
+
+def measure_memory(count=100000):
+    """
+    Sözlük ve sıkı sonuç tiplerinin sonuç başına bellek kullanımını (bayt) döndürür.
+    Sıkı tipler sözlüklerden oluşturulur, sonra sözlükler bırakılır; böylece ölçüm
+    FaceResult'ların tek başına tuttuğu belleği (oran, sayı ve hex nesneleri dahil) içerir.
+    """
+    if count < 1:
+        raise ValueError("Ölçüm için en az bir sonuç gerekir")
+
+    # Üretim sırasındaki NumPy geçicileri ölçüme girmesin diye ölçülen bağımsız kopyalardır
+    source = _sample_results(count)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        results = [_copy_result(result) for result in source]
+        dict_bytes = _traced_size(before)
+
+        compact = [FaceResult.from_dict(result) for result in results]
+        # Şema uyumluluğu
+        if any(converted.to_dict() != original for original, converted in zip(results[:1000], compact[:1000])):
+            raise ValueError("to_dict() özgün sonuçla aynı değil")
+
+        del results
+        compact_bytes = _traced_size(before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "adet": count,
+        "sozluk_bayt": round(dict_bytes / count, 1),
+        "sikistirilmis_bayt": round(compact_bytes / count, 1),
+        "oran": round(dict_bytes / compact_bytes, 2) if compact_bytes > 0 else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sonuç tiplerinin bellek kullanımını ölçer")
+    parser.add_argument("--adet", type=int, default=100000, help="Ölçülecek sonuç sayısı")
+    args = parser.parse_args()
+    if args.adet < 1:
+        parser.error("--adet en az 1 olmalı")
+
+    stats = measure_memory(args.adet)
+    print(f"{stats['adet']} yüz sonucu:")
+    print(f"  sözlük:        {stats['sozluk_bayt']:8.1f} bayt/sonuç")
+    print(f"  FaceResult:    {stats['sikistirilmis_bayt']:8.1f} bayt/sonuç")
+    print(f"  kazanç:        {stats['oran']}x")
@@ -0,0 +1,216 @@
+import argparse
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+from face_analyzer import FaceAnalyzer
+from body_analyzer import BodyAnalyzer
+
+
+class AnalysisJob:
+    """Sunucuya gelen tek bir analiz isteği"""
+
+    def __init__(self, kind, data):
+        self.kind = kind  # "yuz" veya "vucut"
+        self.data = data
+        self.result = None
+        self.error = None
+        self.status = 200
+        self.created = perf_counter()
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+
+class AnalysisWorkerPool:
+    """
+    Modelleri bellekte sıcak tutan işçi havuzu.
+    Her işçi kendi FaceAnalyzer/BodyAnalyzer örneğini yükler (MediaPipe örnekleri thread güvenli değil).
+    Her işçi kuyruktan tek seferde bir iş alır: MediaPipe toplu çıkarım yapmadığından işleri bir işçide
+    biriktirmek kazanç sağlamaz, yalnızca boştaki işçiler varken istekleri bekletir.
+    """
+
+    def __init__(self, num_workers=2, max_queue=64):
+        self.num_workers = num_workers
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.ready = threading.Barrier(num_workers + 1)
+        self._threads = []
+
+    def start(self):
+        """İşçileri başlatır ve tüm modeller yüklenene kadar bekler"""
+        for _ in range(self.num_workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        try:
+            self.ready.wait()
+        except threading.BrokenBarrierError:
+            raise ValueError("Analiz modelleri yüklenemedi")
+
+    def submit(self, job):
+        """İşi kuyruğa ekler; kuyruk doluysa False döndürür"""
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            return False
+        return True
+
+    def _worker(self):
+        try:
+            face_analyzer = FaceAnalyzer(color_table=True)
+            body_analyzer = BodyAnalyzer()
+        except Exception as e:
+            print(f"Model yükleme hatası: {e}")
+            self.ready.abort()
+            return
+        self.ready.wait()
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+
+            job.started = perf_counter()
+            try:
+                self._run_job(job, face_analyzer, body_analyzer)
+            except ValueError as e:
+                job.status, job.error = 400, str(e)
+            except Exception as e:
+                print(f"Sunucu analiz hatası: {e}")
+                job.status, job.error = 500, str(e)
+            job.finished = perf_counter()
+            job.done.set()
+
+    def _run_job(self, job, face_analyzer, body_analyzer):
+        """Yüklenen görüntüyü doğrudan bellekten çözüp analiz eder"""
+        if job.kind == "yuz":
+            result = face_analyzer.analyze_face_bytes(job.data)[0]
+        else:
+            result = body_analyzer.analyze_body_bytes(job.data)[0]
+
+        if not result:
+            job.status = 422
+            job.error = "Görüntüde yüz bulunamadı" if job.kind == "yuz" else "Görüntüde vücut bulunamadı"
+        else:
+            job.result = result
+
+    def stop(self):
+        for _ in self._threads:
+            self.jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /analiz/yuz veya /analiz/vucut: istek gövdesi ham görüntü dosyasıdır
+    (ör. curl --data-binary @resim.jpg). Sonuç JSON olarak, süreler Server-Timing başlığında döner.
+    GET /saglik: sunucu durumu.
+    """
+
+    routes = {"/analiz/yuz": "yuz", "/analiz/vucut": "vucut", "/analyze/face": "yuz", "/analyze/body": "vucut"}
+    server_version = "Humanalyzer/1.0"
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path in ("/saglik", "/health"):
+            pool = self.server.pool
+            self._send_json(200, {"durum": "hazir", "isciler": pool.num_workers, "kuyruk": pool.jobs.qsize()})
+        else:
+            self._send_json(404, {"hata": "Bulunamadı"})
+
+    def do_POST(self):
+        kind = self.routes.get(self.path)
+        if kind is None:
+            self._send_json(404, {"hata": "Bulunamadı"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(400, {"hata": "Görüntü verisi gönderilmedi"})
+            return
+        if length > self.server.max_upload:
+            self._send_json(413, {"hata": "Görüntü çok büyük"})
+            return
+
+        received = perf_counter()
+        job = AnalysisJob(kind, self.rfile.read(length))
+        upload_ms = (perf_counter() - received) * 1000
+
+        if not self.server.pool.submit(job):
+            self._send_json(503, {"hata": "Sunucu meşgul, lütfen tekrar deneyin"}, {"Retry-After": "1"})
+            return
+
+        if not job.done.wait(self.server.request_timeout):
+            self._send_json(504, {"hata": "Analiz zaman aşımına uğradı"})
+            return
+
+        queue_ms = (job.started - job.created) * 1000
+        analyze_ms = (job.finished - job.started) * 1000
+        total_ms = upload_ms + (job.finished - job.created) * 1000
+        headers = {
+            "Server-Timing": f"upload;dur={upload_ms:.1f}, queue;dur={queue_ms:.1f}, "
+                             f"analyze;dur={analyze_ms:.1f}, total;dur={total_ms:.1f}",
+        }
+
+        if job.error is not None:
+            self._send_json(job.status, {"hata": job.error}, headers)
+        else:
+            self._send_json(200, job.result, headers)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """İşçi havuzunu tutan yerel HTTP analiz sunucusu"""
+
+    daemon_threads = True
+
+    def __init__(self, address, pool, max_upload=20 * 1024 * 1024, request_timeout=30, verbose=False):
+        super().__init__(address, AnalysisRequestHandler)
+        self.pool = pool
+        self.max_upload = max_upload
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+
+
+def serve(host="127.0.0.1", port=8765, num_workers=2, verbose=False):
+    """Modelleri yükler ve sunucuyu Ctrl+C'ye kadar çalıştırır"""
+    pool = AnalysisWorkerPool(num_workers=num_workers)
+    print("Modeller yükleniyor...")
+    pool.start()
+
+    server = AnalysisServer((host, port), pool, verbose=verbose)
+    print(f"Analiz sunucusu http://{host}:{port} adresinde çalışıyor (durdurmak için Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nSunucu kapatılıyor...")
+    finally:
+        server.server_close()
+        pool.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Humanalyzer yerel HTTP analiz sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="Model yükleyen işçi sayısı")
+    parser.add_argument("--verbose", action="store_true", help="Her isteği logla")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.verbose)
@@ -1,21 +1,54 @@
 import os
+import re
 from datetime import datetime
+from time import time, perf_counter
 
 import cv2
-from audio_handler import AudioHandler
+from frame_io import WindowSink
 from face_analyzer import FaceAnalyzer
 from body_analyzer import BodyAnalyzer
 from capture_analyzer import CaptureAnalyzer
+from image_catalog import ImageCatalog
+from folder_watcher import FolderWatcher
+from results_db import ResultsDatabase
 
 
 class FaceAnalyzeApp:
     """Ana uygulama sınıfı - Yüz analizi, vücut analizi ve ses işlemlerini birleştirir"""
 
-    def __init__(self):
+    # Sesli seçimde sayıların kelime karşılıkları; onlar ve birler birleştirilir ("on bir" = 11)
+    NUMBER_WORDS = {"bir": 1, "iki": 2, "üç": 3, "dört": 4, "beş": 5, "altı": 6, "yedi": 7, "sekiz": 8, "dokuz": 9}
+    TENS_WORDS = {"on": 10, "yirmi": 20, "otuz": 30, "kırk": 40, "elli": 50,
+                  "altmış": 60, "yetmiş": 70, "seksen": 80, "doksan": 90}
+
+    # Sesli modda sık tekrarlanan sabit cümleler (açılışta önbelleğe alınır)
+    STATIC_PROMPTS = [
+        "Bir komut söyleyin",
+        "Sizi anlayamadım, lütfen tekrar deneyin.",
+        "Anlaşılamadı. Yardım için yardım diyebilirsiniz.",
+        "Lütfen analiz etmek istediğiniz resmin numarasını söyleyin",
+        "Geçersiz seçim, lütfen tekrar deneyin.",
+        "Resim analiz ediliyor, lütfen bekleyin.",
+        "Vücut analizi yapılıyor, lütfen bekleyin.",
+        "Resimde yüz tespit edilemedi!",
+        "Resimde vücut tespit edilemedi!",
+        "Analiz tamamlandı. Başka bir görsel analiz etmek için bir, ana menüye dönmek için iki, çıkmak için üç diyebilirsiniz.",
+        "Başka bir görsel analiz ediliyor.",
+        "Ana menüye dönülüyor.",
+        "Kamera modu seçiniz. Canlı analiz, anlık görüntü alma veya ana menüye dönme.",
+        "Görüntü alınıyor ve analiz ediliyor.",
+        "Görüntü alındı ve analiz edildi.",
+        "Anlık görüntü kaydediliyor.",
+        "Program kapatılıyor. Hoşçakalın.",
+        "Uygulama kapatılıyor. Hoşçakalın.",
+    ]
+
+    def __init__(self, dedupe_distance=None):
         self.face_analyzer = FaceAnalyzer()
         self.body_analyzer = BodyAnalyzer()
         self.capture_analyzer = CaptureAnalyzer(face_analyzer=self.face_analyzer)
-        self.audio_handler = AudioHandler()
+        # Ses işlemleri (speech_recognition, gTTS, playsound) yalnızca sesli modda yüklenir
+        self._audio_handler = None
 
         # Proje dizinini al
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,33 +57,39 @@ class FaceAnalyzeApp:
         # Eğer klasör yoksa oluştur
         if not os.path.exists(self.images_dir):
             os.makedirs(self.images_dir)
+        # Images klasörünün kataloğu (dosya bilgileri ve analiz durumları diskte saklanır)
+        self.catalog = ImageCatalog(self.images_dir)
 
         # Results klasörü
         self.results_dir = os.path.join(self.base_dir, 'results')
         # Eğer klasör yoksa oluştur
         if not os.path.exists(self.results_dir):
             os.makedirs(self.results_dir)
+        # Analiz sonuçları veritabanı (etiketlere göre sorgulanabilir)
+        self.database = ResultsDatabase(os.path.join(self.results_dir, "analiz.db"))
 
         # İletişim modu (True: sesli, False: yazılı)
         self.voice_mode = None
 
-    def get_image_list(self):
-        """Images klasöründeki görselleri listeler"""
-        # Sadece resim dosyalarını kabul et
-        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
-        image_files = []
+        # Klasör izlemede neredeyse aynı resimlerin sonucunu yeniden kullanma eşiği (bit, None: kapalı)
+        self.dedupe_distance = dedupe_distance
+
+    @property
+    def audio_handler(self):
+        """Ses işleyicisini ilk kullanımda oluşturur"""
+        if self._audio_handler is None:
+            from audio_handler import AudioHandler
+            self._audio_handler = AudioHandler()
+        return self._audio_handler
 
+    def get_image_list(self):
+        """Images klasöründeki görselleri listeler (katalogdan; yalnızca değişen dosyalar yeniden okunur)"""
         try:
-            # Dizindeki tüm dosyaları kontrol et
-            for filename in os.listdir(self.images_dir):
-                # Dosya uzantısını kontrol et
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in image_extensions:
-                    image_files.append(filename)
+            self.catalog.refresh()
         except Exception as e:
             print(f"Resim listeleme hatası: {e}")
 
-        return image_files
+        return self.catalog.names()
 
     def display_image_menu(self):
         """Kullanıcıya resim seçim menüsü gösterir"""
@@ -74,16 +113,14 @@ class FaceAnalyzeApp:
 
         while True:
             if self.voice_mode:
-                selection = self.get_voice_input()
+                selection = self.get_voice_input(self.audio_handler.number_grammar)
                 # Sesli komuttan sayı elde etmeye çalış
                 if selection:
                     if "çık" in selection or "iptal" in selection:
                         return None
-                    # Sayıyı bul
-                    for i in range(1, len(image_files) + 1):
-                        if str(i) in selection:
-                            selection = i
-                            break
+                    number = self.parse_number(selection)
+                    if number is not None:
+                        selection = number
             else:
                 selection = input("Seçiminiz: ")
                 if selection.lower() == 'q':
@@ -104,9 +141,29 @@ class FaceAnalyzeApp:
                 if self.voice_mode:
                     self.audio_handler.speak_text("Geçersiz seçim, lütfen tekrar deneyin.")
 
-    def get_voice_input(self):
-        """Sesli komut al"""
-        return self.audio_handler.listen_command()
+    def get_voice_input(self, grammar=None):
+        """Sesli komut al (grammar verilirse tanıma bu kelimelerle sınırlanır)"""
+        return self.audio_handler.listen_command(grammar)
+
+    def parse_number(self, text):
+        """
+        Metindeki ilk sayıyı döndürür: rakamla ("11") veya kelimeyle ("on bir", "yirmi üç").
+        Sayı yoksa None döndürür.
+        """
+        digits = re.search(r"\d+", text)
+        if digits:
+            return int(digits.group())
+
+        value = None
+        for word in text.split():
+            if value is None and word in self.TENS_WORDS:
+                value = self.TENS_WORDS[word]
+            elif word in self.NUMBER_WORDS:
+                # Birler basamağı sayıyı tamamlar ("on" + "bir")
+                return (value or 0) + self.NUMBER_WORDS[word]
+            elif value is not None:
+                break
+        return value
 
     def get_text_input(self, prompt):
         """Metin girişi al"""
@@ -133,6 +190,8 @@ class FaceAnalyzeApp:
                 if choice == "1":
                     self.voice_mode = True
                     print("Sesli mod seçildi.")
+                    # Sabit komut cümlelerini arka planda önbelleğe al
+                    self.audio_handler.prewarm(self.STATIC_PROMPTS)
                     self.audio_handler.speak_text("Sesli mod etkinleştirildi. Size nasıl yardımcı olabilirim?")
                     break
                 elif choice == "2":
@@ -153,12 +212,20 @@ class FaceAnalyzeApp:
         # İletişim modunu seç
         self.select_interaction_mode()
 
+        try:
+            self._command_loop()
+        finally:
+            # Toplanan analiz durumlarını kaydet
+            self.catalog.close()
+
+    def _command_loop(self):
+        """Komutları alıp işleyen döngü ('çıkış' ile biter)"""
         while True:
-            print("\nKomutlar: 'yüz analiz', 'vücut analiz', 'kamera', 'çıkış', 'yardım'")
+            print("\nKomutlar: 'yüz analiz', 'vücut analiz', 'kamera', 'video', 'izle', 'çıkış', 'yardım'")
 
             if self.voice_mode:
                 self.audio_handler.speak_text("Bir komut söyleyin")
-                command = self.get_voice_input()
+                command = self.get_voice_input(self.audio_handler.command_grammar)
                 if not command:
                     self.audio_handler.speak_text("Sizi anlayamadım, lütfen tekrar deneyin.")
                     continue
@@ -174,6 +241,10 @@ class FaceAnalyzeApp:
             elif command and (
                     'kamera' in command or 'camera' in command or 'yakala' in command or 'capture' in command):
                 self.process_camera_command()
+            elif command and 'video' in command:
+                self.process_video_command()
+            elif command and ('izle' in command or 'watch' in command):
+                self.process_watch_command()
             elif command and 'yardım' in command:
                 self.show_help()
             elif command and ('çıkış' in command or 'kapat' in command):
@@ -186,6 +257,15 @@ class FaceAnalyzeApp:
                 if self.voice_mode:
                     self.audio_handler.speak_text("Anlaşılamadı. Yardım için yardım diyebilirsiniz.")
 
+    def _store_result(self, kind, image_path, result, duration_ms=None):
+        """Analiz sonucunu ve süresini veritabanına ekler (kaynak özeti katalogdan alınır)"""
+        name = os.path.basename(image_path)
+        entry = self.catalog.get(name)
+        try:
+            self.database.add_results([(kind, image_path, result, entry["ozet"] if entry else None, duration_ms)])
+        except Exception as e:
+            print(f"Veritabanı yazma hatası: {e}")
+
     def process_face_analyze_command(self):
         """Yüz analizi komutunu işler"""
         while True:
@@ -204,18 +284,25 @@ class FaceAnalyzeApp:
 
             print("Resim analiz ediliyor, lütfen bekleyin...")
             if self.voice_mode:
-                self.audio_handler.speak_text("Resim analiz ediliyor, lütfen bekleyin.")
+                self.audio_handler.speak_async("Resim analiz ediliyor, lütfen bekleyin.", category="durum")
 
             try:
+                start = perf_counter()
                 result, image, skin_mask, right_eye_mask, left_eye_mask = self.face_analyzer.analyze_face(image_path)
+                duration_ms = (perf_counter() - start) * 1000
 
                 if not result:
+                    self.catalog.mark_analyzed(os.path.basename(image_path), "yuz", "bulunamadi")
                     print("Resimde yüz tespit edilemedi!")
                     if self.voice_mode:
+                        self.audio_handler.cancel_speech("durum")
                         self.audio_handler.speak_text("Resimde yüz tespit edilemedi!")
                     # Tekrar resim seçme menüsüne yönlendir
                     continue
 
+                self.catalog.mark_analyzed(os.path.basename(image_path), "yuz", "tamam")
+                self._store_result("yuz", image_path, result, duration_ms)
+
                 # Görselleştirme
                 viz_image = self.face_analyzer.visualize_results(
                     image, skin_mask, right_eye_mask, left_eye_mask, result
@@ -240,7 +327,9 @@ class FaceAnalyzeApp:
                     goz_rengi = result['goz_rengi']['tahmini_renk']
                     yuz_sekli = result['yuz_sekli']['sekil']
 
-                    self.audio_handler.speak_text(
+                    # Henüz seslendirilmemiş durum mesajları artık geçersiz
+                    self.audio_handler.cancel_speech("durum")
+                    self.audio_handler.speak_async(
                         f"Analiz sonuçları: Ten rengi {ten_rengi}, Göz rengi {goz_rengi}, Yüz şekli {yuz_sekli}")
 
                 # Görüntüyü kaydet - sonuç görsellerini results klasörüne kaydet
@@ -274,6 +363,7 @@ class FaceAnalyzeApp:
                 return
 
             except Exception as e:
+                self.catalog.mark_analyzed(os.path.basename(image_path), "yuz", "hata")
                 print(f"Hata: {e}")
                 if self.voice_mode:
                     self.audio_handler.speak_text("Analiz sırasında bir hata oluştu.")
@@ -298,18 +388,25 @@ class FaceAnalyzeApp:
 
             print("Resim analiz ediliyor, lütfen bekleyin...")
             if self.voice_mode:
-                self.audio_handler.speak_text("Vücut analizi yapılıyor, lütfen bekleyin.")
+                self.audio_handler.speak_async("Vücut analizi yapılıyor, lütfen bekleyin.", category="durum")
 
             try:
+                start = perf_counter()
                 result, image, pose_landmarks = self.body_analyzer.analyze_body(image_path)
+                duration_ms = (perf_counter() - start) * 1000
 
                 if not result:
+                    self.catalog.mark_analyzed(os.path.basename(image_path), "vucut", "bulunamadi")
                     print("Resimde vücut tespit edilemedi!")
                     if self.voice_mode:
+                        self.audio_handler.cancel_speech("durum")
                         self.audio_handler.speak_text("Resimde vücut tespit edilemedi!")
                     # Tekrar resim seçme menüsüne yönlendir
                     continue
 
+                self.catalog.mark_analyzed(os.path.basename(image_path), "vucut", "tamam")
+                self._store_result("vucut", image_path, result, duration_ms)
+
                 # Görselleştirme
                 viz_image = self.body_analyzer.visualize_results(
                     image, pose_landmarks, result
@@ -329,7 +426,9 @@ class FaceAnalyzeApp:
                     vucut_tipi = result['vucut_tipi']
                     aciklama = result['aciklama']
 
-                    self.audio_handler.speak_text(f"Vücut analizi sonuçları: Vücut tipi {vucut_tipi}, {aciklama}")
+                    # Henüz seslendirilmemiş durum mesajları artık geçersiz
+                    self.audio_handler.cancel_speech("durum")
+                    self.audio_handler.speak_async(f"Vücut analizi sonuçları: Vücut tipi {vucut_tipi}, {aciklama}")
 
                 # Görüntüyü kaydet - sonuç görsellerini results klasörüne kaydet
                 output_filename = os.path.basename(image_path)
@@ -362,6 +461,7 @@ class FaceAnalyzeApp:
                 return
 
             except Exception as e:
+                self.catalog.mark_analyzed(os.path.basename(image_path), "vucut", "hata")
                 print(f"Hata: {e}")
                 if self.voice_mode:
                     self.audio_handler.speak_text("Analiz sırasında bir hata oluştu.")
@@ -381,7 +481,7 @@ class FaceAnalyzeApp:
 
         choice = None
         if self.voice_mode:
-            voice_input = self.audio_handler.listen_command()
+            voice_input = self.audio_handler.listen_command(self.audio_handler.command_grammar)
             if voice_input:
                 if "canlı" in voice_input or "başlat" in voice_input or "bir" in voice_input:
                     choice = "1"
@@ -396,7 +496,7 @@ class FaceAnalyzeApp:
             # Canlı analiz başlat
             print("Canlı yüz analizi başlatılıyor...")
             if self.voice_mode:
-                self.audio_handler.speak_text("Canlı yüz analizi başlatılıyor. Çıkmak için Q tuşuna basın.")
+                self.audio_handler.speak_async("Canlı yüz analizi başlatılıyor. Çıkmak için Q tuşuna basın.", category="durum")
 
             try:
                 # Kamerayı başlat
@@ -409,44 +509,26 @@ class FaceAnalyzeApp:
                 self.capture_analyzer.running = True
                 print("Canlı analiz aktif. Çıkmak için 'q' tuşuna basın.")
 
-                last_analysis_time = datetime.now()
-
-                while self.capture_analyzer.running:
-                    # Kare yakala
-                    ret, frame = self.capture_analyzer.camera.read()
-                    if not ret:
-                        print("Kamera görüntüsü alınamıyor!")
-                        break
-
-                    # Analiz zamanını kontrol et
-                    current_time = datetime.now()
-                    time_diff = (current_time - last_analysis_time).total_seconds()  # saniye cinsinden float
-                    if time_diff >= self.capture_analyzer.analysis_interval:
-                        # Kareyi analiz et
-                        analysis_result = self.capture_analyzer.analyze_frame(frame)
-                        if analysis_result:
-                            self.capture_analyzer.current_results = analysis_result
-                        last_analysis_time = current_time
-
-                    # Sonuçları görselleştir
-                    if self.capture_analyzer.current_results:
-                        frame = self.capture_analyzer.visualize_frame(frame, self.capture_analyzer.current_results)
-
-                    # Pencere başlığını güncelle - kullanıcı bilgileri ile
-                    window_title = f"Canlı Yüz Analizi - Kullanıcı: {self.capture_analyzer.current_user} - Çıkmak için 'q' tuşuna basın"
-                    cv2.imshow(window_title, frame)
+                # Pencere başlığı - kullanıcı bilgileri ile
+                window_title = f"Canlı Yüz Analizi - Kullanıcı: {self.capture_analyzer.current_user} - Çıkmak için 'q' tuşuna basın"
+                pipeline = self.capture_analyzer.create_pipeline(sink=WindowSink(window_title))
 
+                def on_key(context):
                     # Tuş kontrolü
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == ord('q'):
-                        break
-                    elif key == ord('s'):  # 's' tuşu ile anlık görüntü alma
-                        timestamp = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+                    if context.key == ord('q'):
+                        return False
+                    elif context.key == ord('s'):  # 's' tuşu ile anlık görüntü alma
+                        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
                         snapshot_path = os.path.join(self.results_dir, f"snapshot_{timestamp}.jpg")
-                        cv2.imwrite(snapshot_path, frame)
-                        print(f"Anlık görüntü kaydedildi: {snapshot_path}")
+                        # Arka planda kaydet - önizleme donmaz
+                        self.capture_analyzer.snapshot_writer.submit(
+                            snapshot_path, context.viz_frame, context.result,
+                            on_done=self.capture_analyzer._report_snapshot)
                         if self.voice_mode:
-                            self.audio_handler.speak_text("Anlık görüntü kaydedildi.")
+                            self.audio_handler.speak_async("Anlık görüntü kaydediliyor.", category="durum")
+                    return True
+
+                pipeline.run(on_key=on_key)
 
                 # Temizle
                 self.capture_analyzer.stop_capture()
@@ -465,7 +547,7 @@ class FaceAnalyzeApp:
             # Anlık görüntü al
             print("Kamera hazırlanıyor...")
             if self.voice_mode:
-                self.audio_handler.speak_text("Anlık görüntü almak için kamera hazırlanıyor.")
+                self.audio_handler.speak_async("Anlık görüntü almak için kamera hazırlanıyor.", category="durum")
 
             try:
                 # Kamerayı başlat
@@ -481,129 +563,56 @@ class FaceAnalyzeApp:
                     self.audio_handler.speak_text(
                         "Kamera hazır. Görüntü almak için boşluk veya enter tuşuna basın. İptal etmek için Q tuşuna basın.")
 
-                capture_done = False
-                countdown_active = False
-                countdown_start = 0
                 countdown_seconds = 3  # 3 saniyelik geri sayım
+                state = {"countdown_start": None}
 
-                while not capture_done:
-                    # Kare yakala
-                    ret, frame = self.capture_analyzer.camera.read()
-                    if not ret:
-                        break
+                # Önizleme: analiz yapmadan yalnızca kareleri göster
+                pipeline = self.capture_analyzer.create_pipeline(
+                    sink=WindowSink("Kamera Önizleme - Poz verebilirsiniz"), analyze=False)
 
-                    display_frame = frame.copy()
+                def draw_overlay(context):
+                    display_frame = context.frame.copy()
 
                     # Eğer geri sayım aktifse
-                    if countdown_active:
-                        current_time = datetime.now()
-                        elapsed = current_time - countdown_start
-                        remaining = max(0, countdown_seconds - int(elapsed))
-
-                        if remaining > 0:
-                            # Geri sayım görüntüsü
-                            cv2.putText(display_frame, f"{remaining}",
-                                        (display_frame.shape[1] // 2 - 70, display_frame.shape[0] // 2 + 70),
-                                        cv2.FONT_HERSHEY_DUPLEX, 6.0, (0, 0, 255), 10)
-                            cv2.putText(display_frame, "Hazırlanın...",
-                                        (display_frame.shape[1] // 2 - 150, display_frame.shape[0] // 2 - 100),
-                                        cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 2)
-                        else:
-                            # Geri sayım bitti, fotoğraf çek
-                            print("Görüntü alınıyor ve analiz ediliyor...")
-                            if self.voice_mode:
-                                self.audio_handler.speak_text("Görüntü alınıyor ve analiz ediliyor.")
-
-                            # Anlık görüntü al ve analiz et
-                            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                            snapshot_path = os.path.join(self.results_dir, f"snapshot_{timestamp}.jpg")
-
-                            # Görüntüyü kaydet
-                            cv2.imwrite(snapshot_path, frame)
-
-                            # Analiz et
-                            analysis_result = self.capture_analyzer.analyze_frame(frame)
-
-                            if analysis_result:
-                                # Görselleştir
-                                viz_frame = self.capture_analyzer.visualize_frame(frame, analysis_result)
-
-                                # Analiz görselini kaydet
-                                analyzed_path = os.path.join(self.results_dir, f"analyzed_snapshot_{timestamp}.jpg")
-                                cv2.imwrite(analyzed_path, viz_frame)
-
-                                print(f"Görüntü kaydedildi: {snapshot_path}")
-                                print(f"Analiz edilmiş görüntü: {analyzed_path}")
-
-                                if self.voice_mode:
-                                    self.audio_handler.speak_text("Görüntü alındı ve analiz edildi.")
-
-                                # Sonuçları göster
-                                cv2.imshow("Analiz Sonucu", viz_frame)
-                                cv2.waitKey(0)
-                            else:
-                                print("Görüntüde yüz tespit edilemedi!")
-                                if self.voice_mode:
-                                    self.audio_handler.speak_text("Görüntüde yüz tespit edilemedi.")
-
-                            capture_done = True
-                            break
+                    if state["countdown_start"] is not None:
+                        remaining = max(0, countdown_seconds - int(time() - state["countdown_start"]))
+                        # Geri sayım görüntüsü
+                        cv2.putText(display_frame, f"{remaining}",
+                                    (display_frame.shape[1] // 2 - 70, display_frame.shape[0] // 2 + 70),
+                                    cv2.FONT_HERSHEY_DUPLEX, 6.0, (0, 0, 255), 10)
+                        cv2.putText(display_frame, "Hazırlanın...",
+                                    (display_frame.shape[1] // 2 - 150, display_frame.shape[0] // 2 - 100),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 2)
                     else:
                         # Normal görüntüleme modu - yardım bilgisi ekle
                         cv2.putText(display_frame, "Space/Enter: Fotograf Cek | C: Geri Sayim | Q: Iptal",
                                     (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
-                    # Pencere başlığı
-                    window_title = "Kamera Önizleme - Poz verebilirsiniz"
-                    cv2.imshow(window_title, display_frame)
+                    context.viz_frame = display_frame
 
-                    # Tuş kontrolü
-                    key = cv2.waitKey(1) & 0xFF
+                pipeline.add_hook("visualize", draw_overlay)
+
+                def on_key(context):
+                    # Geri sayım bitti veya boşluk/Enter tuşu - fotoğraf çek
+                    countdown_done = state["countdown_start"] is not None and \
+                        time() - state["countdown_start"] >= countdown_seconds
+                    if countdown_done or context.key == ord(' ') or context.key == 13:
+                        self._capture_snapshot()
+                        return False
 
-                    if key == ord('q'):
+                    if context.key == ord('q'):
                         print("İşlem iptal edildi.")
                         if self.voice_mode:
                             self.audio_handler.speak_text("İşlem iptal edildi.")
-                        capture_done = True
-                    elif key == ord(' ') or key == 13:  # Boşluk veya Enter tuşu - hemen çek
-                        print("Görüntü alınıyor ve analiz ediliyor...")
-                        if self.voice_mode:
-                            self.audio_handler.speak_text("Görüntü alınıyor ve analiz ediliyor.")
-
-                        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-                        snapshot_path = os.path.join(self.results_dir, f"snapshot_{timestamp}.jpg")
-
-                        # Görüntüyü kaydet
-                        cv2.imwrite(snapshot_path, frame)
-
-                        # Analiz et
-                        analysis_result = self.capture_analyzer.analyze_frame(frame)
-
-                        if analysis_result:
-                            viz_frame = self.capture_analyzer.visualize_frame(frame, analysis_result)
-                            analyzed_path = os.path.join(self.results_dir, f"analyzed_snapshot_{timestamp}.jpg")
-                            cv2.imwrite(analyzed_path, viz_frame)
-
-                            print(f"Görüntü kaydedildi: {snapshot_path}")
-                            print(f"Analiz edilmiş görüntü: {analyzed_path}")
-
-                            if self.voice_mode:
-                                self.audio_handler.speak_text("Görüntü alındı ve analiz edildi.")
-
-                            cv2.imshow("Analiz Sonucu", viz_frame)
-                            cv2.waitKey(0)
-                        else:
-                            print("Görüntüde yüz tespit edilemedi!")
-                            if self.voice_mode:
-                                self.audio_handler.speak_text("Görüntüde yüz tespit edilemedi.")
-
-                        capture_done = True
-                    elif key == ord('c'):  # 'c' tuşu - geri sayım başlat
+                        return False
+                    elif context.key == ord('c') and state["countdown_start"] is None:  # 'c' tuşu - geri sayım başlat
                         print("Geri sayım başlıyor... Hazırlanın!")
                         if self.voice_mode:
-                            self.audio_handler.speak_text("3 saniye içinde fotoğraf çekilecek. Hazırlanın!")
-                        countdown_active = True
-                        countdown_start = datetime.now()
+                            self.audio_handler.speak_async("3 saniye içinde fotoğraf çekilecek. Hazırlanın!", category="durum")
+                        state["countdown_start"] = time()
+                    return True
+
+                pipeline.run(on_key=on_key)
 
                 # Temizle
                 cv2.destroyAllWindows()
@@ -627,6 +636,109 @@ class FaceAnalyzeApp:
                 self.audio_handler.speak_text("Ana menüye dönülüyor.")
             return
 
+    def process_video_command(self):
+        """Video dosyası analiz komutunu işler (ekran gösterimi olmadan, gerçek zaman beklemeden)"""
+        print("\n=== VİDEO ANALİZ MODU ===")
+        if self.voice_mode:
+            self.audio_handler.speak_text("Video analizi için dosya yolunu klavyeden girin.")
+
+        video_path = input("Video dosyası yolu: ").strip().strip('"')
+        if not video_path or not os.path.exists(video_path):
+            print("Belirtilen dosya bulunamadı.")
+            if self.voice_mode:
+                self.audio_handler.speak_text("Belirtilen dosya bulunamadı.")
+            return
+
+        # Çıktılar results klasörüne kaydedilir
+        base_name = os.path.splitext(os.path.basename(video_path))[0]
+        output_path = os.path.join(self.results_dir, f"video_analyzed_{base_name}.mp4")
+        records_path = os.path.join(self.results_dir, f"video_analyzed_{base_name}.jsonl")
+
+        print("Video analiz ediliyor, lütfen bekleyin...")
+        if self.voice_mode:
+            self.audio_handler.speak_async("Video analiz ediliyor, lütfen bekleyin.", category="durum")
+
+        try:
+            summary = self.capture_analyzer.analyze_video(video_path, output_path, records_path)
+
+            print("\n=== VİDEO ANALİZ SONUÇLARI ===")
+            print(f"Kare sayısı: {summary['kare_sayisi']}")
+            print(f"Yüz bulunan kare: {summary['yuz_bulunan_kare']}")
+            print(f"Süre: {summary['sure']} sn ({summary['islem_fps']} kare/sn)")
+            print(f"İşaretlenmiş video: {output_path}")
+            print(f"Kare kayıtları: {records_path}")
+
+            if self.voice_mode:
+                self.audio_handler.speak_text("Video analizi tamamlandı.")
+
+        except Exception as e:
+            print(f"Video analizi hatası: {e}")
+            if self.voice_mode:
+                self.audio_handler.speak_text("Video analizi sırasında bir hata oluştu.")
+
+    def process_watch_command(self):
+        """Images klasörünü izleyip yeni eklenen resimleri otomatik analiz eder (Ctrl+C ile durur)"""
+        print("\n=== KLASÖR İZLEME MODU ===")
+        if self.voice_mode:
+            self.audio_handler.speak_text("Images klasörü izleniyor. Durdurmak için kontrol artı C tuşlarına basın.")
+
+        watcher = FolderWatcher(self.images_dir, self.results_dir, catalog=self.catalog, database=self.database,
+                                dedupe_distance=self.dedupe_distance)
+        if self.dedupe_distance is not None:
+            print(f"Neredeyse aynı resimler ({self.dedupe_distance} bit) yeniden analiz edilmeyecek.")
+        stats = watcher.run()
+
+        print("\n=== İZLEME ÖZETİ ===")
+        print(f"Tamamlanan analiz: {stats['islenen']}")
+        if stats["kopya"]:
+            print(f"Benzer resimden alınan sonuç: {stats['kopya']}")
+        print(f"Yüz/vücut bulunamayan: {stats['bulunamayan']}")
+        print(f"Hatalı: {stats['hata']}")
+        if self.voice_mode:
+            self.audio_handler.speak_text(f"İzleme durduruldu. {stats['islenen']} analiz tamamlandı.")
+
+    def _capture_snapshot(self):
+        """Önizleme tamponundan en iyi kareyi seçer, analiz eder, kaydeder ve sonucu gösterir"""
+        print("Görüntü alınıyor ve analiz ediliyor...")
+        if self.voice_mode:
+            self.audio_handler.speak_async("Görüntü alınıyor ve analiz ediliyor.", category="durum")
+
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        snapshot_path = os.path.join(self.results_dir, f"snapshot_{timestamp}.jpg")
+
+        # Son karelerden en net, yüzü en büyük ve gözleri açık olanı seçilip analiz edilir
+        viz_frame, analysis_result = self.capture_analyzer.take_snapshot(use_best_frame=True)
+        if viz_frame is None:
+            return
+
+        if analysis_result:
+            # Analiz görselini ve JSON sonucunu arka planda kaydet
+            analyzed_path = os.path.join(self.results_dir, f"analyzed_snapshot_{timestamp}.jpg")
+            self.capture_analyzer.snapshot_writer.submit(
+                analyzed_path, viz_frame, analysis_result, on_done=self._report_snapshot_error)
+
+            print(f"Analiz edilmiş görüntü: {analyzed_path}")
+
+            if self.voice_mode:
+                self.audio_handler.speak_text("Görüntü alındı ve analiz edildi.")
+
+            # Sonuçları göster
+            cv2.imshow("Analiz Sonucu", viz_frame)
+            cv2.waitKey(0)
+        else:
+            # Yüz bulunamasa da seçilen kare kaydedilir
+            self.capture_analyzer.snapshot_writer.submit(
+                snapshot_path, viz_frame, on_done=self._report_snapshot_error)
+            print(f"Görüntü kaydedildi: {snapshot_path}")
+            print("Görüntüde yüz tespit edilemedi!")
+            if self.voice_mode:
+                self.audio_handler.speak_text("Görüntüde yüz tespit edilemedi.")
+
+    def _report_snapshot_error(self, output_path, error):
+        """Arka planda kaydedilemeyen anlık görüntüleri bildirir"""
+        if error is not None:
+            print(f"Anlık görüntü kaydetme hatası ({output_path}): {error}")
+
     def show_post_analysis_menu(self):
         """
         Analiz sonrası seçenekleri gösterir
@@ -651,7 +763,7 @@ class FaceAnalyzeApp:
 
             if self.voice_mode:
                 print("Seçiminizi söyleyin...")
-                voice_input = self.audio_handler.listen_command()
+                voice_input = self.audio_handler.listen_command(self.audio_handler.command_grammar)
                 print(f"Algılanan komut: {voice_input}")
 
                 if voice_input:
@@ -668,7 +780,7 @@ class FaceAnalyzeApp:
             if choice == "1":
                 print("Başka bir görsel analiz ediliyor...")
                 if self.voice_mode:
-                    self.audio_handler.speak_text("Başka bir görsel analiz ediliyor.")
+                    self.audio_handler.speak_async("Başka bir görsel analiz ediliyor.", category="durum")
                 return "continue"  # Analize devam et
 
             elif choice == "2":
@@ -705,6 +817,10 @@ class FaceAnalyzeApp:
         - vücut analiz: Images klasöründen bir resim seçip vücut analizi yapmanızı sağlar
                       (vücut tipi ve oran tespiti)
         - kamera: Kamera ile canlı analiz yapabilir veya anlık görüntü alabilirsiniz
+        - video: Bir video dosyasını analiz eder, işaretlenmiş videoyu ve kare kayıtlarını
+                 'results' klasörüne kaydeder
+        - izle: Images klasörünü izler, yeni eklenen veya değişen resimleri otomatik
+                analiz edip sonuçları 'results' klasörüne kaydeder (Ctrl+C ile durur)
         - yardım: Bu yardım mesajını gösterir
         - çıkış: Programdan çıkar
 
@@ -714,10 +830,22 @@ class FaceAnalyzeApp:
         print(help_text)
         if self.voice_mode:
             self.audio_handler.speak_text(
-                "Yüz analiz, vücut analiz, kamera kullanımı, yardım ve çıkış komutlarını kullanabilirsiniz. "
+                "Yüz analiz, vücut analiz, kamera kullanımı, video analizi, klasör izleme, yardım ve çıkış komutlarını kullanabilirsiniz. "
                 "Analiz edilecek resimleri images klasörüne koyun, sonuçlar results klasörüne kaydedilecektir.")
 
 
+def parse_args(argv=None):
+    """Uygulama komut satırı seçenekleri"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Yüz ve vücut analizi uygulaması")
+    parser.add_argument("--dedupe-distance", type=int, default=None,
+                        help="'izle' komutunda bu kadar bit yakın (ve pikselce doğrulanan) kopyaların "
+                             "sonucunu yeniden kullan (varsayılan: kapalı)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    app = FaceAnalyzeApp()
+    args = parse_args()
+    app = FaceAnalyzeApp(dedupe_distance=args.dedupe_distance)
     app.run()
\ No newline at end of file
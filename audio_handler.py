@@ -1,52 +1,123 @@
 import speech_recognition as sr
-from gtts import gTTS
-import playsound
 import os
-import time
-import tempfile
+
+from tts_cache import PhraseCache, create_offline_backend
+from speech_recognizer import create_recognizer_backend
+from speech_queue import SpeechQueue, SpeechMessage, PRIORITY_NORMAL
 
 
 class AudioHandler:
     """Sesli komut alma ve sonuçları seslendirme işlemleri için sınıf"""
 
-    def __init__(self):
+    # Uygulamanın tanıdığı komut kelimeleri (dilbilgisi kısıtlamalı tanıma için)
+    COMMAND_VOCABULARY = [
+        "yüz", "vücut", "kamera", "yakala", "video", "izle", "yardım", "çıkış", "kapat", "çık", "iptal",
+        "canlı", "başlat", "anlık", "görüntü", "foto", "ana", "menü", "dön", "geri",
+        "başka", "yeni", "analiz", "evet", "hayır",
+        "bir", "iki", "üç", "dört", "beş", "altı", "yedi", "sekiz", "dokuz", "on",
+    ]
+
+    # Sayı beklenen sorular için kelimeler (birleşik sayılar: "on bir", "yirmi üç")
+    NUMBER_VOCABULARY = [
+        "bir", "iki", "üç", "dört", "beş", "altı", "yedi", "sekiz", "dokuz",
+        "on", "yirmi", "otuz", "kırk", "elli", "altmış", "yetmiş", "seksen", "doksan",
+        "çık", "iptal",
+    ]
+
+    def __init__(self, tts_backend=None, cache_dir=None, recognizer_backend=None,
+                 listen_timeout=5, phrase_time_limit=4, restrict_grammar=True):
         self.recognizer = sr.Recognizer()
-        self.recognizer.energy_threshold = 4000
-        self.temp_dir = tempfile.gettempdir()
+        # Sabit eşik yerine ortam gürültüsüne göre ayarlanan dinamik eşik
+        self.recognizer.dynamic_energy_threshold = True
+        self.recognizer.pause_threshold = 0.6
+        self.recognizer.non_speaking_duration = 0.3
+        self.calibrated = False
+        self.listen_timeout = listen_timeout  # Konuşma başlamazsa bu kadar saniye sonra vazgeç
+        self.phrase_time_limit = phrase_time_limit  # Tek komut en fazla bu kadar saniye kaydedilir
+        # Kısıtlı dilbilgisi yalnızca komut veya sayı beklenen dinlemelerde kullanılır
+        self.command_grammar = self.COMMAND_VOCABULARY if restrict_grammar else None
+        self.number_grammar = self.NUMBER_VOCABULARY if restrict_grammar else None
+        self.recognizer_backend = recognizer_backend or create_recognizer_backend(self.recognizer)
+
+        # Seslendirilen cümlelerin kalıcı önbelleği (proje dizinindeki tts_cache klasörü)
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache")
+        self.phrase_cache = PhraseCache(cache_dir, backend=tts_backend,
+                                        fallback_backend=create_offline_backend())
+
+        # Seslendirme kuyruğu (mesajlar arka planda sırayla çalınır)
+        self.speech_queue = SpeechQueue(self._play)
 
-    def listen_command(self):
-        """Mikrofondan sesli komut dinler ve metne çevirir"""
-        with sr.Microphone() as source:
-            print("Dinleniyor...")
-            audio = self.recognizer.listen(source)
+    def listen_command(self, grammar=None):
+        """
+        Mikrofondan sesli komut dinler ve metne çevirir.
+        Konuşma listen_timeout içinde başlamazsa veya anlaşılamazsa None döndürür.
+        grammar (ör. command_grammar, number_grammar) verilirse destekleyen arka uçlarda yalnızca
+        bu kelimeler tanınır; verilmezse tanıma kısıtlanmaz (serbest metin).
+        """
+        # Kendi sesimizi kaydetmemek için seslendirmenin bitmesini bekle
+        self.wait_until_idle()
+
+        audio = None
+        if self.recognizer_backend.needs_audio:
+            try:
+                with sr.Microphone() as source:
+                    if not self.calibrated:
+                        # Enerji eşiğini bir kez ortam gürültüsüne göre ayarla
+                        self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                        self.calibrated = True
+                    print("Dinleniyor...")
+                    audio = self.recognizer.listen(source, timeout=self.listen_timeout,
+                                                   phrase_time_limit=self.phrase_time_limit)
+            except sr.WaitTimeoutError:
+                print("Konuşma algılanmadı")
+                return None
 
         try:
-            command = self.recognizer.recognize_google(audio, language="tr-TR")
-            print(f"Algılanan komut: {command}")
-            return command.lower()
-        except sr.UnknownValueError:
-            print("Anlaşılamadı")
+            command = self.recognizer_backend.recognize(audio, language="tr-TR",
+                                                        grammar=grammar)
+        except Exception as e:
+            print(f"Konuşma tanıma hatası: {e}")
             return None
-        except sr.RequestError:
-            print("Google servisi bağlantı hatası")
+
+        if not command:
+            print("Anlaşılamadı")
             return None
 
-    def speak_text(self, text, lang="tr"):
-        """Metni seslendirir"""
-        try:
-            # Geçici dosya oluştur
-            tts = gTTS(text=text, lang=lang)
-            temp_file = os.path.join(self.temp_dir, f"temp_audio_{int(time.time())}.mp3")
-            tts.save(temp_file)
+        print(f"Algılanan komut: {command}")
+        return command.lower()
 
-            # Ses dosyasını çal
-            playsound.playsound(temp_file)
+    def _play(self, text, lang):
+        """Metni seslendirir (önbellekte varsa yerel dosyadan hemen çalar)"""
+        import playsound
+        audio_file = self.phrase_cache.get(text, lang)
 
-            # Geçici dosyayı sil
-            try:
-                os.remove(temp_file)
-            except:
-                pass
+        # Ses dosyasını çal
+        playsound.playsound(audio_file)
 
-        except Exception as e:
-            print(f"Seslendirme hatası: {e}")
\ No newline at end of file
+    def speak_text(self, text, lang="tr", block=True, priority=PRIORITY_NORMAL, category=None, max_age=None):
+        """
+        Metni seslendirme kuyruğuna ekler. block=True ise seslendirme bitene kadar bekler.
+        category verilirse aynı kategoride bekleyen eski mesajlar iptal edilir;
+        max_age (saniye) aşılan mesajlar hiç seslendirilmez.
+        """
+        message = self.speech_queue.put(SpeechMessage(text, lang, priority, category, max_age))
+        if block:
+            message.wait()
+        return message
+
+    def speak_async(self, text, lang="tr", priority=PRIORITY_NORMAL, category=None, max_age=None):
+        """Metni beklemeden seslendirir (analizle aynı anda çalınır)"""
+        return self.speak_text(text, lang, False, priority, category, max_age)
+
+    def cancel_speech(self, category=None):
+        """Henüz çalınmaya başlamamış mesajları iptal eder (category verilirse yalnızca o kategori)"""
+        self.speech_queue.cancel(category)
+
+    def wait_until_idle(self, timeout=None):
+        """Kuyruktaki tüm seslendirmeler bitene kadar bekler"""
+        return self.speech_queue.wait_until_idle(timeout)
+
+    def prewarm(self, phrases, lang="tr"):
+        """Sık kullanılan sabit cümleleri arka planda önceden seslendirip önbelleğe alır"""
+        return self.phrase_cache.prewarm(phrases, lang)
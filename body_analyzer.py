@@ -1,10 +1,10 @@
 import cv2
 import numpy as np
-import mediapipe as mp
-from PIL import Image, ImageDraw, ImageFont
 import os
 from datetime import datetime
 
+from frame_io import decode_image
+
 
 class BodyAnalyzer:
     """
@@ -13,12 +13,8 @@ class BodyAnalyzer:
 
     def __init__(self):
         """Vücut analizi için gerekli araçları başlatır."""
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=True,
-            model_complexity=2,
-            enable_segmentation=True,
-            min_detection_confidence=0.5)
+        # MediaPipe Pose modeli (ve mediapipe modülü) ilk analizde yüklenir
+        self._pose = None
 
         # Vücut analiz değerlendirme kriterleri
         self.body_types = {
@@ -27,10 +23,25 @@ class BodyAnalyzer:
             "endomorf": "Yuvarlak hatlı vücut tipi"
         }
 
+        # Toplu sınıflandırmada ölçüm sütunlarının sırası
+        self.measurement_keys = ("height", "shoulder_width", "hip_width", "waist_width", "leg_length")
+
         # Analiz tarihi ve kullanıcı bilgisi
         self.current_date = datetime.now()
         self.current_user = "Admin"
 
+    @property
+    def pose(self):
+        """MediaPipe Pose modelini ilk kullanımda oluşturur"""
+        if self._pose is None:
+            import mediapipe as mp
+            self._pose = mp.solutions.pose.Pose(
+                static_image_mode=True,
+                model_complexity=2,
+                enable_segmentation=True,
+                min_detection_confidence=0.5)
+        return self._pose
+
     def calculate_body_ratios(self, landmarks, image_shape):
         """
         Vücut landmark'larından oran hesaplamaları yapar
@@ -182,14 +193,71 @@ class BodyAnalyzer:
 
         return body_type, body_type_info
 
+    def measurements_to_array(self, measurements_list):
+        """Ölçüm sözlüklerini measurement_keys sırasıyla (N, 5) diziye çevirir; eksik ölçüler NaN"""
+        return np.array([[m.get(key, np.nan) if m else np.nan for key in self.measurement_keys]
+                         for m in measurements_list], dtype=np.float64).reshape(-1, len(self.measurement_keys))
+
+    def determine_body_types(self, measurements):
+        """
+        determine_body_type'ın toplu (vektörel) karşılığı.
+        measurements: measurement_keys sırasında (N, 5) dizi, eksik ölçüler NaN.
+        (vücut tipleri, oranlar) döndürür: tipler object dizisidir (yetersiz ölçümde None),
+        oranlar (N, 3) omuz/kalça, bel/kalça, boy/genişlik (yuvarlanmamış; sonuç sözlüğündeki değerler
+        round(float(x), 2) ile elde edilir, np.round bazı sınır değerlerde farklı yuvarlar).
+        Etiketler aynı ölçümlerle tek tek hesaplananla aynıdır; yalnızca sıfır genişlikte
+        tek örnek sürümü ZeroDivisionError verirken burada oran inf/NaN olur.
+        """
+        values = np.asarray(measurements, dtype=np.float64).reshape(-1, len(self.measurement_keys))
+        present = ~np.isnan(values)
+        height, shoulder, hip, waist, _ = values.T
+        has_height, has_shoulder, has_hip, has_waist, _ = present.T
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shoulder_hip = np.where(has_hip & has_shoulder, shoulder / hip, 0.0)
+            waist_hip = np.where(has_hip & has_waist, waist / hip, 0.0)
+            height_width = np.where(has_height & has_shoulder, height / shoulder, 0.0)
+
+        ecto = np.select([height_width > 3.0, height_width > 2.5, height_width > 2.0], [3, 2, 1], 0)
+        meso = np.select([shoulder_hip > 1.4, shoulder_hip > 1.2, shoulder_hip > 1.0], [3, 2, 1], 0) + \
+            np.where(waist_hip < 0.85, 2, 0)
+        endo = np.select([waist_hip > 0.95, waist_hip > 0.9, waist_hip > 0.85], [3, 2, 1], 0) + \
+            np.where(shoulder_hip < 1.1, 2, 0)
+
+        # max() gibi eşitlikte ilk tip (ektomorf, mezomorf, endomorf sırası) seçilir
+        scores = np.stack([ecto, meso, endo], axis=1)
+        rows = np.arange(len(scores))
+        primary = np.argmax(scores, axis=1)
+        scores[rows, primary] = -1
+        secondary = np.argmax(scores, axis=1)
+
+        names = np.array(["ektomorf", "mezomorf", "endomorf"], dtype=object)
+        combined = names[primary] + "-" + names[secondary]
+        labels = np.where(scores[rows, secondary] < 1, names[primary], combined)
+        labels[present.sum(axis=1) < 4] = None
+
+        return labels, np.stack([shoulder_hip, waist_hip, height_width], axis=1)
+
     def analyze_body(self, image_path):
-        """Görselden vücut analizi yapar."""
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Görsel yüklenemedi: {image_path}")
+        """
+        Görselden vücut analizi yapar.
+        image_path yerine kodlanmış baytlar veya BGR dizi de verilebilir (bkz. frame_io.decode_image).
+        """
+        image = decode_image(image_path)
 
         # RGB'ye çevirme (mediapipe RGB kullanır)
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return self._analyze_body_image(image, image_rgb)
+
+    def analyze_body_rgb(self, image_rgb):
+        """
+        Çözülmüş RGB görüntüden (ör. paketlenmiş veri kümesi görünümü) vücut analizi yapar.
+        Kod çözme ve renk dönüşümü yapılmaz; döndürülen görüntü de RGB'dir.
+        """
+        return self._analyze_body_image(image_rgb, image_rgb)
+
+    def _analyze_body_image(self, image, image_rgb):
+        """Vücut analizinin ortak kısmı"""
         results = self.pose.process(image_rgb)
 
         if not results.pose_landmarks:
@@ -220,6 +288,14 @@ class BodyAnalyzer:
 
         return result, image, results.pose_landmarks
 
+    def analyze_body_bytes(self, data):
+        """Bellekteki kodlanmış görüntüden (bytes/bytearray/memoryview) vücut analizi yapar; diske yazılmaz."""
+        return self.analyze_body(memoryview(data))
+
+    def analyze_body_array(self, image):
+        """Çözülmüş BGR görüntü dizisinden vücut analizi yapar (dizi kopyalanmaz)."""
+        return self.analyze_body(np.asarray(image))
+
     def visualize_results(self, image, landmarks, result):
         """Analiz sonuçlarını görselleştirir."""
         h, w = image.shape[:2]
@@ -229,6 +305,7 @@ class BodyAnalyzer:
 
         # Landmark'ları çiz
         if landmarks:
+            import mediapipe as mp
             mp_drawing = mp.solutions.drawing_utils
             mp_drawing_styles = mp.solutions.drawing_styles
 
@@ -239,13 +316,14 @@ class BodyAnalyzer:
             mp_drawing.draw_landmarks(
                 viz_image_rgb,
                 landmarks,
-                self.mp_pose.POSE_CONNECTIONS,
+                mp.solutions.pose.POSE_CONNECTIONS,
                 landmark_drawing_spec=mp_drawing_styles.get_default_pose_landmarks_style())
 
             # RGB -> BGR dönüşümü
             viz_image = cv2.cvtColor(viz_image_rgb, cv2.COLOR_RGB2BGR)
 
         # OpenCV görüntüsünü PIL görüntüsüne dönüştür
+        from PIL import Image, ImageDraw, ImageFont
         viz_image_rgb = cv2.cvtColor(viz_image, cv2.COLOR_BGR2RGB)
         pil_image = Image.fromarray(viz_image_rgb)
         draw = ImageDraw.Draw(pil_image)
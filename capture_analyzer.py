@@ -1,30 +1,36 @@
 import cv2
 import numpy as np
-import mediapipe as mp
-from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
+import argparse
 import os
+import json
 import threading
-from time import time
+from time import time, perf_counter
+
+from frame_io import CameraSource, VideoFileSource, SyntheticSource, WindowSink, VideoFileSink
+from snapshot_writer import SnapshotWriter
+from frame_buffer import FrameRingBuffer, BufferPool
+from pipeline import AnalysisPipeline
 
 
 class CaptureAnalyzer:
     """Kamera görüntüsünden gerçek zamanlı yüz analizi yapan sınıf"""
 
-    def __init__(self, face_analyzer=None):
+    def __init__(self, face_analyzer=None, static_image_mode=False):
         """Kamera yakalama ve analiz sistemi için araçları başlatır."""
         # Face analyzer bağlantısı
         self.face_analyzer = face_analyzer
 
-        # MediaPipe yüz mesh modeli
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5)
+        # MediaPipe yüz mesh modeli (ilk analizde yüklenir; yalnızca görselleştirme
+        # yapan örnekler modeli hiç yüklemez)
+        self.static_image_mode = static_image_mode
+        self._face_mesh = None
+        # Model ve RGB tamponu canlı döngü ile anlık görüntü thread'i arasında paylaşılır
+        self.model_lock = threading.Lock()
 
-        # Kamera ayarları
+        # Kare kaynağı ve hedefi (varsayılan: kamera ve OpenCV penceresi)
         self.camera = None
+        self.sink = None
         self.camera_id = 0
         self.frame_width = 640
         self.frame_height = 480
@@ -34,20 +40,52 @@ class CaptureAnalyzer:
         self.running = False
         self.show_landmarks = True
         self.show_results = True
+        self.show_masks = False  # Maskeleri varsayılan olarak gösterme
         self.analysis_interval = 0.5  # Analiz sıklığı (saniye)
         self.last_analysis_time = time()
         self.current_results = None
 
-        # Font ayarları
+        # Son karelerin tamponu (anlık görüntüde en iyi kareyi seçmek için)
+        self.frame_buffer = FrameRingBuffer(capacity=15)
+        self.snapshot_candidates = 3
+
+        # Canlı döngüde tekrar kullanılan kare tamponları. Yalnızca pipeline içinde
+        # (reuse_buffer=True) kullanılır; visualize_frame ve take_snapshot dışarıya yeni dizi döndürür.
+        self.buffers = BufferPool()
+        self.reuse_buffers = True
+        # HUD yamalarının ara tamponları thread'ler arasında paylaşılır
+        self.render_lock = threading.Lock()
+        self._tesselation = None
+
+        # Anlık görüntüleri arka planda kaydeden yazıcı
+        self.snapshot_writer = SnapshotWriter()
+
+        # HUD önbelleği (yalnızca gösterilen etiketler değişince yeniden çizilir)
+        self._hud_cache_key = None
+        self._hud_patches = []
+
+        # Font ayarları (PIL ve font dosyası ilk sonuç paneli çizilirken yüklenir)
         self.font = None
-        self.load_font()
 
         # Analiz tarihi ve kullanıcı bilgisi
         self.current_date = datetime.now()
         self.current_user = "Admin"
 
+    @property
+    def face_mesh(self):
+        """MediaPipe FaceMesh modelini ilk kullanımda oluşturur"""
+        if self._face_mesh is None:
+            import mediapipe as mp
+            self._face_mesh = mp.solutions.face_mesh.FaceMesh(
+                static_image_mode=self.static_image_mode,
+                max_num_faces=1,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5)
+        return self._face_mesh
+
     def load_font(self):
         """Türkçe karakter desteği için font yükler"""
+        from PIL import ImageFont
         try:
             possible_fonts = [
                 "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
@@ -72,50 +110,81 @@ class CaptureAnalyzer:
 
     def initialize_camera(self, camera_id=0, width=640, height=480, fps=30):
         """Kamerayı başlatır ve ayarları yapılandırır"""
-        self.camera_id = camera_id
-        self.frame_width = width
-        self.frame_height = height
-        self.fps = fps
+        # Dosya yolu verilirse video dosyasını aç
+        if isinstance(camera_id, str):
+            return self.initialize_video(camera_id)
 
-        # Kamera nesnesi oluştur ve ayarla
-        self.camera = cv2.VideoCapture(camera_id)
+        self.camera_id = camera_id
+        self.set_source(CameraSource(camera_id, width, height, fps))
 
-        if not self.camera.isOpened():
-            raise ValueError(f"Kamera {camera_id} açılamadı")
+        print(f"Kamera başlatıldı: {self.frame_width}x{self.frame_height} @ {self.fps}fps")
 
-        # Kamera çözünürlüğü ve FPS ayarları
-        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-        self.camera.set(cv2.CAP_PROP_FPS, fps)
+        return self.camera.isOpened()
 
-        # Gerçek ayarları kontrol et
-        actual_width = self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)
-        actual_height = self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)
-        actual_fps = self.camera.get(cv2.CAP_PROP_FPS)
+    def initialize_video(self, video_path):
+        """Video dosyasını açar ve kare boyutu/FPS ayarlarını dosyadan okur"""
+        self.camera_id = video_path
+        self.set_source(VideoFileSource(video_path))
 
-        print(f"Kamera başlatıldı: {actual_width}x{actual_height} @ {actual_fps}fps")
+        print(f"Video açıldı: {self.frame_width}x{self.frame_height} @ {self.fps}fps")
 
         return self.camera.isOpened()
 
-    def analyze_frame(self, frame):
-        """Bir kare üzerinde yüz analizi yapar"""
-        if self.face_analyzer is None:
-            return None
+    def set_source(self, source):
+        """
+        Kare kaynağını ayarlar (CameraSource, VideoFileSource, ImageSequenceSource,
+        SyntheticSource veya read/isOpened/release sunan herhangi bir nesne)
+        """
+        if self.camera is not None and self.camera is not source:
+            self.camera.release()
+
+        self.camera = source
+        # Önceki kaynağın kareleri anlık görüntü için seçilmesin
+        self.frame_buffer.clear()
+        self.frame_width = getattr(source, "width", self.frame_width)
+        self.frame_height = getattr(source, "height", self.frame_height)
+        self.fps = getattr(source, "fps", self.fps)
+
+    def set_sink(self, sink):
+        """Kare hedefini ayarlar (WindowSink, VideoFileSink, NullSink, MemorySink)"""
+        self.sink = sink
+
+    def to_rgb(self, frame):
+        """Kareyi önceden ayrılmış RGB tamponuna dönüştürür (kare başına tek dönüşüm)"""
+        if not self.reuse_buffers:
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        rgb_frame = self.buffers.get("rgb", frame.shape, frame.dtype)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        return rgb_frame
 
-        # RGB'ye dönüştür (MediaPipe RGB formatı kullanır)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def detect_landmarks(self, frame):
+        """Karedeki ilk yüzün landmark'larını döndürür (yüz yoksa None)"""
+        with self.model_lock:
+            # RGB'ye dönüştür (MediaPipe RGB formatı kullanır)
+            rgb_frame = self.to_rgb(frame)
 
-        # MediaPipe ile yüz işaretleri tespit et
-        results = self.face_mesh.process(rgb_frame)
+            # MediaPipe ile yüz işaretleri tespit et
+            results = self.face_mesh.process(rgb_frame)
 
         if not results.multi_face_landmarks:
             return None
 
         # İlk yüzü al
-        face_landmarks = results.multi_face_landmarks[0]
+        return results.multi_face_landmarks[0]
 
-        # Yüz analizi için mask oluşturma işlemi
-        h, w = frame.shape[:2]
+    def analyze_frame(self, frame, face_landmarks=None):
+        """Bir kare üzerinde yüz analizi yapar. Landmark'lar verilirse yüz tespiti atlanır."""
+        if self.face_analyzer is None:
+            return None
+
+        if face_landmarks is None:
+            face_landmarks = self.detect_landmarks(frame)
+            if face_landmarks is None:
+                return None
+
+        # Landmark'ları bir kez diziye çevir (sonuçta protobuf yerine float32 dizi saklanır)
+        points = self.face_analyzer.landmarks_to_array(face_landmarks)
 
         # Yüz bölgesi indeksleri (yanak ve alın)
         skin_indices = [
@@ -129,16 +198,17 @@ class CaptureAnalyzer:
         right_eye_indices = [33, 133, 159, 145, 153, 154, 155, 133]
         left_eye_indices = [362, 263, 386, 374, 380, 381, 382, 362]
 
-        # Maskeleri oluştur
-        skin_mask = self.face_analyzer.create_mask_from_landmarks(frame, face_landmarks, skin_indices)
-        right_eye_mask = self.face_analyzer.create_mask_from_landmarks(frame, face_landmarks, right_eye_indices)
-        left_eye_mask = self.face_analyzer.create_mask_from_landmarks(frame, face_landmarks, left_eye_indices)
+        # Bölge çokgenleri (maskeler yalnızca çizim gerektiğinde oluşturulur)
+        skin_polygon = self.face_analyzer.landmark_points(frame.shape, points, skin_indices)
+        right_eye_polygon = self.face_analyzer.landmark_points(frame.shape, points, right_eye_indices)
+        left_eye_polygon = self.face_analyzer.landmark_points(frame.shape, points, left_eye_indices)
 
         # Renkleri analiz et
         try:
-            skin_color = self.face_analyzer.get_average_color(frame, skin_mask)
-            right_eye_color = self.face_analyzer.get_average_color(frame, right_eye_mask)
-            left_eye_color = self.face_analyzer.get_average_color(frame, left_eye_mask)
+            # Ortalama veya piksel dağılımı, FaceAnalyzer'ın renk yöntemine göre
+            skin_color = self.face_analyzer.region_color(frame, skin_polygon, "skin")
+            right_eye_color = self.face_analyzer.region_color(frame, right_eye_polygon, "eye")
+            left_eye_color = self.face_analyzer.region_color(frame, left_eye_polygon, "eye")
 
             # Ortalama göz rengi
             eye_color = np.array(((right_eye_color + left_eye_color) / 2), dtype=np.int32)
@@ -148,31 +218,29 @@ class CaptureAnalyzer:
             eye_color_name = self.face_analyzer.get_color_category(eye_color, "eye")
 
             # Yüz şeklini analiz et
-            face_shape_data = self.face_analyzer.analyze_face_shape(face_landmarks, frame.shape)
+            face_shape_data = self.face_analyzer.analyze_face_shape(points, frame.shape)
 
             # Analiz sonuçları
             result = {
                 "ten_rengi": {
                     "rgb": skin_color.tolist(),
-                    "hex": rgb2hex(
-                        skin_color / 255) if 'rgb2hex' in globals() else f"#{skin_color[0]:02x}{skin_color[1]:02x}{skin_color[2]:02x}",
+                    "hex": self.face_analyzer.rgb_to_hex(skin_color),
                     "tahmini_renk": skin_color_name
                 },
                 "goz_rengi": {
                     "rgb": eye_color.tolist(),
-                    "hex": rgb2hex(
-                        eye_color / 255) if 'rgb2hex' in globals() else f"#{eye_color[0]:02x}{eye_color[1]:02x}{eye_color[2]:02x}",
+                    "hex": self.face_analyzer.rgb_to_hex(eye_color),
                     "tahmini_renk": eye_color_name
                 },
                 "yuz_sekli": {
                     "sekil": face_shape_data["shape"],
                     "oran": round(face_shape_data["ratio"], 2)
                 },
-                "landmarks": face_landmarks,
-                "masks": {
-                    "skin": skin_mask,
-                    "right_eye": right_eye_mask,
-                    "left_eye": left_eye_mask
+                "landmarks": points.astype(np.float32),
+                "polygons": {
+                    "skin": skin_polygon,
+                    "right_eye": right_eye_polygon,
+                    "left_eye": left_eye_polygon
                 }
             }
 
@@ -182,112 +250,168 @@ class CaptureAnalyzer:
             print(f"Kare analiz hatası: {e}")
             return None
 
-    def visualize_frame(self, frame, analysis_result):
-        """Analiz sonuçlarını kare üzerine görselleştirir"""
+    def visualize_frame(self, frame, analysis_result, reuse_buffer=False):
+        """
+        Analiz sonuçlarını kare üzerine görselleştirir ve yeni bir kare döndürür.
+        reuse_buffer açıksa (canlı döngü) her çağrıda aynı önceden ayrılmış tampon döndürülür.
+        """
         if frame is None or analysis_result is None:
             return frame
 
         h, w = frame.shape[:2]
-        viz_frame = frame.copy()
+        if reuse_buffer and self.reuse_buffers:
+            viz_frame = self.buffers.get("viz", frame.shape, frame.dtype)
+            np.copyto(viz_frame, frame)
+        else:
+            viz_frame = frame.copy()
 
         # Landmark'ları göster
         if self.show_landmarks and "landmarks" in analysis_result:
-            landmarks = analysis_result["landmarks"]
-            # MediaPipe Drawing kullanarak landmark'ları çiz
-            mp_drawing = mp.solutions.drawing_utils
-            drawing_spec = mp_drawing.DrawingSpec(thickness=1, circle_radius=1, color=(0, 255, 0))
-
-            # RGB'ye dönüştür, çiz ve tekrar BGR'ye dönüştür
-            frame_rgb = cv2.cvtColor(viz_frame, cv2.COLOR_BGR2RGB)
-            mp_drawing.draw_landmarks(
-                image=frame_rgb,
-                landmark_list=landmarks,
-                connections=self.mp_face_mesh.FACEMESH_TESSELATION,
-                landmark_drawing_spec=drawing_spec,
-                connection_drawing_spec=drawing_spec)
-            viz_frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-
-        # Maskeleri göster (tercihe bağlı)
-        if "masks" in analysis_result and False:  # Maskeleri varsayılan olarak gösterme
-            masks = analysis_result["masks"]
-
-            # Ten rengi maskesi (kırmızı)
-            if "skin" in masks and masks["skin"] is not None:
-                viz_frame[masks["skin"] > 0] = viz_frame[masks["skin"] > 0] * 0.7 + np.array([0, 0, 255],
-                                                                                             dtype=np.uint8) * 0.3
-
-            # Göz maskeleri (yeşil ve mavi)
-            if "right_eye" in masks and masks["right_eye"] is not None:
-                viz_frame[masks["right_eye"] > 0] = viz_frame[masks["right_eye"] > 0] * 0.7 + np.array([0, 255, 0],
-                                                                                                       dtype=np.uint8) * 0.3
-
-            if "left_eye" in masks and masks["left_eye"] is not None:
-                viz_frame[masks["left_eye"] > 0] = viz_frame[masks["left_eye"] > 0] * 0.7 + np.array([255, 0, 0],
-                                                                                                     dtype=np.uint8) * 0.3
-
-        # Sonuçları göster
-        if self.show_results:
-            # OpenCV'den PIL'e dönüştür (Türkçe karakter desteği için)
-            viz_frame_rgb = cv2.cvtColor(viz_frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(viz_frame_rgb)
-            draw = ImageDraw.Draw(pil_image)
+            self.draw_landmarks(viz_frame, analysis_result["landmarks"])
 
-            # Ten ve göz rengi değerlerini al
-            ten_renk = analysis_result['ten_rengi']['tahmini_renk']
-            goz_renk = analysis_result['goz_rengi']['tahmini_renk']
-            yuz_sekli = analysis_result['yuz_sekli']['sekil']
+        # Maskeleri göster (tercihe bağlı) - maskeler yalnızca burada oluşturulur
+        if self.show_masks and "polygons" in analysis_result:
+            # Ten (kırmızı), sağ göz (yeşil), sol göz (mavi)
+            for name, color in (("skin", (0, 0, 255)), ("right_eye", (0, 255, 0)), ("left_eye", (255, 0, 0))):
+                mask = self.rasterize_mask(analysis_result, name, frame.shape)
+                if mask is not None:
+                    viz_frame[mask > 0] = viz_frame[mask > 0] * 0.7 + np.array(color, dtype=np.uint8) * 0.3
 
-            # HEX değerleri
-            ten_hex = analysis_result['ten_rengi']['hex']
-            goz_hex = analysis_result['goz_rengi']['hex']
+        # Sonuçları göster - önbellekteki HUD yamalarını kareye karıştır
+        if self.show_results:
+            with self.render_lock:
+                for x, y, gain, offset, scratch, patch in self._get_hud_patches(analysis_result, w, h):
+                    roi = viz_frame[y:y + gain.shape[0], x:x + gain.shape[1]]
+                    cv2.multiply(roi, gain, dst=scratch, dtype=cv2.CV_32F)
+                    cv2.add(scratch, offset, dst=scratch)
+                    cv2.convertScaleAbs(scratch, dst=patch)
+                    np.copyto(roi, patch)
 
-            # HEX -> RGB dönüşümü
-            ten_hex_rgb = self.hex_to_rgb(ten_hex)
-            goz_hex_rgb = self.hex_to_rgb(goz_hex)
+        return viz_frame
 
-            # Metin renkleri
-            ten_text_color = ten_hex_rgb
-            goz_text_color = goz_hex_rgb
-            black_color = (0, 0, 0)  # Siyah
-            white_color = (255, 255, 255)  # Beyaz
+    def draw_landmarks(self, image, landmarks):
+        """
+        Yüz mesh'ini float32 landmark dizisinden çizer (MediaPipe drawing_utils ile aynı görünüm:
+        yeşil bağlantılar, beyaz çerçeveli yeşil noktalar)
+        """
+        if self._tesselation is None:
+            import mediapipe as mp
+            self._tesselation = np.array(sorted(mp.solutions.face_mesh.FACEMESH_TESSELATION), dtype=np.int32)
+
+        h, w = image.shape[:2]
+        coords = landmarks[:, :2]
+        visible = np.all((coords >= 0) & (coords <= 1), axis=1)
+        pixels = np.minimum(np.floor(coords * (w, h)), (w - 1, h - 1)).astype(np.int32)
+
+        # Bağlantılar - iki ucu da görünür olanlar tek çağrıda çizilir
+        connections = self._tesselation[visible[self._tesselation].all(axis=1)]
+        if len(connections):
+            cv2.polylines(image, list(pixels[connections]), False, (0, 255, 0), 1)
+
+        # Noktalar
+        for x, y in pixels[visible]:
+            cv2.circle(image, (int(x), int(y)), 2, (255, 255, 255), 1)
+            cv2.circle(image, (int(x), int(y)), 1, (0, 255, 0), 1)
+
+    def rasterize_mask(self, analysis_result, name, image_shape):
+        """Sonuçtaki bölge çokgeninden tam boyutlu maske oluşturur (yalnızca çizim için)"""
+        polygon = analysis_result.get("polygons", {}).get(name)
+        if polygon is None:
+            return None
 
+        mask = np.zeros(image_shape[:2], dtype=np.uint8)
+        cv2.fillPoly(mask, [polygon], 255)
+        return mask
+
+    def _hud_key(self, analysis_result, w, h):
+        """HUD üzerinde görünen değerlerden önbellek anahtarı üretir"""
+        return (analysis_result['ten_rengi']['tahmini_renk'],
+                analysis_result['goz_rengi']['tahmini_renk'],
+                analysis_result['yuz_sekli']['sekil'],
+                analysis_result['ten_rengi']['hex'],
+                analysis_result['goz_rengi']['hex'],
+                w, h)
+
+    def _get_hud_patches(self, analysis_result, w, h):
+        """
+        Sonuç panelini yalnızca gösterilen etiketler değiştiğinde yeniden çizer.
+        Her yama (x, y, gain, offset, ara tamponlar) şeklindedir; kareye roi * gain + offset olarak uygulanır.
+        """
+        key = self._hud_key(analysis_result, w, h)
+        if key != self._hud_cache_key:
+            self._hud_patches = self._render_hud_patches(analysis_result, w, h)
+            self._hud_cache_key = key
+        return self._hud_patches
+
+    def _render_hud_patches(self, analysis_result, w, h):
+        """Sonuç panelini ve alt bilgiyi küçük yamalar halinde çizer"""
+        from PIL import Image, ImageDraw
+        if self.font is None:
+            self.load_font()
+        ten_renk, goz_renk, yuz_sekli, ten_hex, goz_hex = self._hud_key(analysis_result, w, h)[:5]
+
+        # Metin renkleri
+        ten_text_color = self.hex_to_rgb(ten_hex)
+        goz_text_color = self.hex_to_rgb(goz_hex)
+        black_color = (0, 0, 0)  # Siyah
+        white_color = (255, 255, 255)  # Beyaz
+
+        margin = 15
+
+        def draw_panel(pil_image, ox, oy):
             # Arka plan için saydam dikdörtgen
             overlay = Image.new('RGBA', pil_image.size, (0, 0, 0, 0))
             draw_overlay = ImageDraw.Draw(overlay)
-            draw_overlay.rectangle([(10, 10), (220, 100)], fill=(255, 255, 255, 180))
+            draw_overlay.rectangle([(10 - ox, 10 - oy), (220 - ox, 100 - oy)], fill=(255, 255, 255, 180))
             pil_image = Image.alpha_composite(pil_image.convert('RGBA'), overlay).convert('RGB')
             draw = ImageDraw.Draw(pil_image)
 
             # Bilgileri sol üst köşede göster
-            margin = 15
-            y_pos = margin
-
-            # Başlık
-            draw.text((margin, y_pos), "YÜZ ANALİZ SONUÇLARI", font=self.font, fill=black_color)
+            y_pos = margin - oy
+            draw.text((margin - ox, y_pos), "YÜZ ANALİZ SONUÇLARI", font=self.font, fill=black_color)
             y_pos += 20
-
-            # Ten rengi
-            draw.text((margin, y_pos), f"Ten: {ten_renk}", font=self.font, fill=ten_text_color)
+            draw.text((margin - ox, y_pos), f"Ten: {ten_renk}", font=self.font, fill=ten_text_color)
             y_pos += 20
-
-            # Göz rengi
-            draw.text((margin, y_pos), f"Göz: {goz_renk}", font=self.font, fill=goz_text_color)
+            draw.text((margin - ox, y_pos), f"Göz: {goz_renk}", font=self.font, fill=goz_text_color)
             y_pos += 20
+            draw.text((margin - ox, y_pos), f"Yüz Şekli: {yuz_sekli}", font=self.font, fill=black_color)
+            return pil_image
 
-            # Yüz şekli
-            draw.text((margin, y_pos), f"Yüz Şekli: {yuz_sekli}", font=self.font, fill=black_color)
+        # Alt bilgi
+        info_text = "Canlı Analiz"
+        probe = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+        info_width = int(probe.textlength(info_text, font=self.font) if hasattr(probe, "textlength") else \
+            self.font.getsize(info_text)[0])
 
-            # Alt bilgi - tarih ve kullanıcı
-            formatted_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            info_text = "Canlı Analiz"
-            info_width = draw.textlength(info_text, font=self.font) if hasattr(draw, "textlength") else \
-            self.font.getsize(info_text)[0]
-            draw.text((w - info_width - 15, h - 30), info_text, font=self.font, fill=white_color)
+        def draw_footer(pil_image, ox, oy):
+            draw = ImageDraw.Draw(pil_image)
+            draw.text((w - info_width - 15 - ox, h - 30 - oy), info_text, font=self.font, fill=white_color)
+            return pil_image
 
-            # PIL'den OpenCV'ye dönüştür
-            viz_frame = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        regions = [
+            (10, 10, 221, 101, draw_panel),
+            (w - info_width - 15, h - 30, w - 10, h - 8, draw_footer),
+        ]
 
-        return viz_frame
+        patches = []
+        for x0, y0, x1, y1, draw_fn in regions:
+            x0, y0, x1, y1 = max(0, x0), max(0, y0), min(w, x1), min(h, y1)
+            if x1 <= x0 or y1 <= y0:
+                continue
+
+            # Yamayı siyah ve beyaz zemine çizerek kareden bağımsız karışım katsayılarını çıkar
+            size = (x1 - x0, y1 - y0)
+            on_black = draw_fn(Image.new('RGB', size, (0, 0, 0)), x0, y0)
+            on_white = draw_fn(Image.new('RGB', size, (255, 255, 255)), x0, y0)
+            offset = cv2.cvtColor(np.array(on_black), cv2.COLOR_RGB2BGR).astype(np.float32)
+            white = cv2.cvtColor(np.array(on_white), cv2.COLOR_RGB2BGR).astype(np.float32)
+            gain = (white - offset) / 255.0
+            # Karıştırma sırasında kullanılacak ara tamponlar
+            scratch = np.empty_like(gain)
+            patch = np.empty(gain.shape, dtype=np.uint8)
+            patches.append((x0, y0, gain, offset, scratch, patch))
+
+        return patches
 
     def hex_to_rgb(self, hex_color):
         """HEX renk kodunu RGB'ye çevirir"""
@@ -309,77 +433,244 @@ class CaptureAnalyzer:
 
     def _capture_thread(self):
         """Kamera görüntülerini yakalar ve analiz eder (ayrı thread'de çalışır)"""
+        self.run_capture()
+
+    def create_pipeline(self, source=None, sink=None, **options):
+        """Bu analizci için kaynak -> analiz -> görselleştirme -> hedef pipeline'ı oluşturur"""
+        return AnalysisPipeline(self, source if source is not None else self.camera, sink, **options)
+
+    def run_capture(self, max_frames=None):
+        """
+        Kaynaktan kare okur, analiz eder ve hedefe yazar.
+        Analiz zamanlaması kaynağın kare zamanına göre yapılır; dosya ve sentetik
+        kaynaklarda bu sayede çalışma kameradan ve ekrandan bağımsız, tekrarlanabilir olur.
+        """
+        if self.sink is None:
+            self.sink = WindowSink("Yüz Analizi")
+
+        self.running = True
+        pipeline = self.create_pipeline(sink=self.sink)
+
         try:
-            while self.running:
-                # Kare yakala
-                ret, frame = self.camera.read()
-                if not ret:
-                    print("Kare yakalama hatası!")
-                    break
+            # 'q' tuşuna basılırsa veya stop_capture çağrılırsa çık
+            return pipeline.run(max_frames, on_key=lambda context: self.running and context.key != ord('q'))
+        finally:
+            self.stop_capture()
 
-                # Analiz zamanını kontrol et
-                current_time = time()
-                if current_time - self.last_analysis_time >= self.analysis_interval:
-                    # Kareyi analiz et
-                    analysis_result = self.analyze_frame(frame)
-                    if analysis_result:
-                        self.current_results = analysis_result
-                    self.last_analysis_time = current_time
+    def result_to_record(self, analysis_result):
+        """Analiz sonucunu JSON'a yazılabilir hale getirir (landmark ve maskeler hariç)"""
+        if analysis_result is None:
+            return None
 
-                # Sonuçları görselleştir
-                if self.current_results:
-                    frame = self.visualize_frame(frame, self.current_results)
+        return {key: value for key, value in analysis_result.items() if key not in ("landmarks", "polygons")}
+
+    def process_video(self, video_path, analyze_every=1):
+        """
+        Video dosyasını gerçek zaman beklemesi olmadan kare kare işler.
+        Her kare için (kare_no, görselleştirilmiş kare, kare kaydı) üretir.
+        """
+        self.initialize_video(video_path)
+        return self.process_source(analyze_every)
+
+    def process_source(self, analyze_every=1, max_frames=None, reuse_buffers=False):
+        """
+        Mevcut kaynaktaki kareleri bekleme yapmadan işler.
+        Her kare için (kare_no, görselleştirilmiş kare, kare kaydı) üretir.
+        reuse_buffers açıksa görselleştirilmiş kare bir sonraki karede üzerine yazılır.
+        """
+        self.current_results = None
+        pipeline = self.create_pipeline(analyze_every=analyze_every, keep_last_result=False,
+                                        use_frame_buffer=False, reuse_buffers=reuse_buffers)
 
-                # Göster
-                cv2.imshow("Yüz Analizi", frame)
+        try:
+            for context in pipeline.frames(max_frames):
+                record = {
+                    "kare_no": context.frame_index,
+                    "zaman": round(context.frame_index / self.fps, 3),
+                    "analiz_edildi": context.analyzed,
+                    "sonuc": self.result_to_record(context.result)
+                }
 
-                # 'q' tuşuna basılırsa çık
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
+                yield context.frame_index, context.viz_frame, record
+        finally:
+            self.camera.release()
+
+    def analyze_video(self, video_path, output_path=None, records_path=None, analyze_every=1):
+        """
+        Video dosyasını analiz eder; isteğe bağlı olarak işaretlenmiş videoyu
+        ve kare kayıtlarını (JSON Lines) kaydeder. Özet bilgileri döndürür.
+        """
+        self.initialize_video(video_path)
+        sink = VideoFileSink(output_path, self.fps) if output_path else None
+        records_file = open(records_path, "w", encoding="utf-8") if records_path else None
+
+        frame_count = 0
+        face_count = 0
+        start_time = time()
+
+        try:
+            for frame_index, viz_frame, record in self.process_source(analyze_every, reuse_buffers=True):
+                if sink is not None:
+                    sink.write(viz_frame)
+
+                if records_file is not None:
+                    records_file.write(json.dumps(record, ensure_ascii=False) + "\n")
 
+                frame_count += 1
+                if record["sonuc"] is not None:
+                    face_count += 1
         finally:
-            self.stop_capture()
+            if sink is not None:
+                sink.close()
+            if records_file is not None:
+                records_file.close()
+
+        elapsed = time() - start_time
+        summary = {
+            "kare_sayisi": frame_count,
+            "yuz_bulunan_kare": face_count,
+            "sure": round(elapsed, 2),
+            "islem_fps": round(frame_count / elapsed, 1) if elapsed > 0 else 0,
+            "video_fps": self.fps,
+            "cikti_video": output_path,
+            "kayit_dosyasi": records_path
+        }
+
+        print(f"Video analizi tamamlandı: {frame_count} kare, {summary['islem_fps']} kare/sn")
+
+        return summary
 
     def stop_capture(self):
         """Kamera yakalamayı durdurur"""
         self.running = False
 
-        # Kamera nesnesini kapat
+        # Kaynağı kapat
         if self.camera is not None and self.camera.isOpened():
             self.camera.release()
 
-        # Tüm OpenCV pencerelerini kapat
-        cv2.destroyAllWindows()
-
-    def take_snapshot(self):
-        """Mevcut kamera görüntüsünün anlık görüntüsünü alır ve analiz eder"""
+        # Hedefi kapat (pencere, video dosyası vb.)
+        if self.sink is not None:
+            self.sink.close()
+        else:
+            cv2.destroyAllWindows()
+
+    def take_snapshot(self, use_best_frame=True):
+        """
+        Mevcut kamera görüntüsünün anlık görüntüsünü alır ve analiz eder.
+        use_best_frame açıksa son karelerden en net, yüzü en büyük ve gözleri açık olan seçilir.
+        """
         if self.camera is None or not self.camera.isOpened():
             print("Kamera aktif değil!")
             return None, None
 
-        # Kare yakala
-        ret, frame = self.camera.read()
-        if not ret:
-            print("Kare yakalama hatası!")
-            return None, None
-
-        # Analiz et
-        analysis_result = self.analyze_frame(frame)
-        if analysis_result:
-            # Görselleştir
-            viz_frame = self.visualize_frame(frame, analysis_result)
-            return viz_frame, analysis_result
+        face_landmarks = None
+        if use_best_frame:
+            # Tampon canlı döngü veya önizleme tarafından doldurulmuyorsa kameradan doldur
+            if not self.running and not len(self.frame_buffer):
+                for _ in range(self.frame_buffer.capacity):
+                    ret, frame = self.camera.read()
+                    if not ret:
+                        break
+                    self.frame_buffer.push(frame)
+
+            frame, face_landmarks, _ = self.frame_buffer.select_best(
+                self.detect_landmarks, candidates=self.snapshot_candidates)
+            if frame is None:
+                print("Kare yakalama hatası!")
+                return None, None
+        else:
+            # Kare yakala
+            ret, frame = self.camera.read()
+            if not ret:
+                print("Kare yakalama hatası!")
+                return None, None
+
+        # Analiz et ve görselleştir (seçim sırasında bulunan landmark'lar yeniden kullanılır).
+        # Canlı döngünün tamponları kullanılmaz; dönen kare çağırana aittir.
+        pipeline = self.create_pipeline(use_frame_buffer=False, reuse_buffers=False)
+        context = pipeline.process_frame(frame, force_analysis=True, face_landmarks=face_landmarks)
+        if context.result:
+            return context.viz_frame, context.result
 
         return frame, None
 
-    def save_snapshot(self, output_path="snapshot.jpg"):
-        """Anlık görüntü alır, analiz eder ve kaydeder"""
+    def save_snapshot(self, output_path="snapshot.jpg", on_done=None):
+        """
+        Anlık görüntü alır, analiz eder ve arka planda kaydeder.
+        Analiz sonucu aynı adla .json olarak yazılır; yazma tamamlanınca on_done(path, error) çağrılır.
+        """
         viz_frame, analysis_result = self.take_snapshot()
 
         if viz_frame is not None:
-            # Dosyayı kaydet
-            cv2.imwrite(output_path, viz_frame)
-            print(f"Anlık görüntü kaydedildi: {output_path}")
-            return output_path, analysis_result
+            if on_done is None:
+                on_done = self._report_snapshot
+            # Dosyayı arka planda kaydet (görüntü döngüsünü bekletmez)
+            if self.snapshot_writer.submit(output_path, viz_frame, analysis_result, on_done=on_done):
+                return output_path, analysis_result
 
-        return None, None
\ No newline at end of file
+        return None, None
+
+    def _report_snapshot(self, output_path, error):
+        """Arka plan yazma sonucunu bildirir"""
+        if error is None:
+            print(f"Anlık görüntü kaydedildi: {output_path}")
+        else:
+            print(f"Anlık görüntü kaydetme hatası ({output_path}): {error}")
+
+
+def measure_buffer_allocations(num_frames=300, width=640, height=480):
+    """
+    Canlı döngünün kare başına işlerini (RGB dönüşümü ve görselleştirme) sentetik karelerle çalıştırır.
+    İlk kareden sonra BufferPool yeni tampon ayırırsa ValueError verir; ölçüm sözlüğünü döndürür.
+    """
+    analyzer = CaptureAnalyzer()
+    analyzer.show_landmarks = False  # Landmark çizimi MediaPipe gerektirir; tamponları etkilemez
+    source = SyntheticSource(width, height, num_frames=num_frames + 1)
+    result = {
+        "ten_rengi": {"rgb": [200, 160, 130], "hex": "#c8a082", "tahmini_renk": "orta"},
+        "goz_rengi": {"rgb": [90, 60, 40], "hex": "#5a3c28", "tahmini_renk": "kahverengi"},
+        "yuz_sekli": {"sekil": "oval", "oran": 0.8},
+    }
+
+    def step(frame):
+        analyzer.to_rgb(frame)
+        return analyzer.visualize_frame(frame, result, reuse_buffer=True)
+
+    # İlk kare tamponları ayırır ve HUD'u çizer
+    _, frame = source.read()
+    step(frame)
+    first_allocations = analyzer.buffers.allocations
+
+    count = 0
+    start = perf_counter()
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        step(frame)
+        count += 1
+    elapsed = perf_counter() - start
+
+    stats = {
+        "kare": count,
+        "ilk_kare_ayirma": first_allocations,
+        "sonraki_ayirma": analyzer.buffers.allocations - first_allocations,
+        "tampon_bayt": analyzer.buffers.nbytes(),
+        "kare_ms": round(elapsed * 1000 / count, 3) if count else None,
+    }
+    if stats["sonraki_ayirma"]:
+        raise ValueError(f"Canlı döngü kare başına tampon ayırıyor: {stats['sonraki_ayirma']} ek ayırma")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Canlı döngünün kare başına bellek ayırmadığını doğrular")
+    parser.add_argument("--kare", type=int, default=300, help="İşlenecek sentetik kare sayısı")
+    parser.add_argument("--genislik", type=int, default=640, help="Kare genişliği")
+    parser.add_argument("--yukseklik", type=int, default=480, help="Kare yüksekliği")
+    args = parser.parse_args()
+
+    stats = measure_buffer_allocations(args.kare, args.genislik, args.yukseklik)
+    print(f"{stats['kare']} kare: ilk karede {stats['ilk_kare_ayirma']} tampon, "
+          f"sonraki karelerde {stats['sonraki_ayirma']} ek ayırma")
+    print(f"Tampon belleği: {stats['tampon_bayt'] / 1024:.0f} KB, kare başına {stats['kare_ms']} ms")
@@ -0,0 +1,135 @@
+import argparse
+import json
+
+import numpy as np
+
+from results_db import ResultsDatabase, default_database_path
+
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def label_distribution(labels):
+    """Etiketlerin sayı ve oranları, en sıktan en seyreğe: [(etiket, sayı, oran), ...]"""
+    if labels.size == 0:
+        return []
+    values, counts = np.unique(labels, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    shares = counts / labels.size
+    return [(str(values[i]), int(counts[i]), round(float(shares[i]), 4)) for i in order]
+
+
+def numeric_summary(values, bins=10):
+    """Sayısal sütun için özet istatistikler, yüzdelikler ve histogram (NaN değerler atlanır)"""
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"sayi": 0}
+
+    counts, edges = np.histogram(values, bins=bins)
+    percentiles = np.percentile(values, PERCENTILES)
+    return {
+        "sayi": int(values.size),
+        "ortalama": round(float(values.mean()), 4),
+        "std": round(float(values.std()), 4),
+        "min": round(float(values.min()), 4),
+        "max": round(float(values.max()), 4),
+        "yuzdelikler": {f"p{p}": round(float(v), 4) for p, v in zip(PERCENTILES, percentiles)},
+        "histogram": {"sinirlar": np.round(edges, 4).tolist(), "sayilar": counts.tolist()},
+    }
+
+
+def crosstab(rows, columns):
+    """
+    İki etiket dizisinin çapraz tablosu. Tek bir bincount ile hesaplanır:
+    (satır etiketleri, sütun etiketleri, sayı matrisi) döndürür.
+    """
+    row_labels, row_index = np.unique(rows, return_inverse=True)
+    column_labels, column_index = np.unique(columns, return_inverse=True)
+    table = np.bincount(row_index * column_labels.size + column_index,
+                        minlength=row_labels.size * column_labels.size)
+    return row_labels.tolist(), column_labels.tolist(), table.reshape(row_labels.size, column_labels.size)
+
+
+def build_report(database, bins=10):
+    """Veritabanındaki son analizlerden veri kümesi raporunu oluşturur"""
+    face = database.load_columns("yuz", ["ten_rengi", "goz_rengi", "yuz_sekli", "yuz_orani"])
+    body = database.load_columns("vucut", ["vucut_tipi", "omuz_kalca_orani", "bel_kalca_orani",
+                                           "boy_genislik_orani"])
+
+    report = {
+        "yuz": {
+            "kayit_sayisi": int(face["yuz_orani"].size),
+            "ten_rengi": label_distribution(face["ten_rengi"]),
+            "goz_rengi": label_distribution(face["goz_rengi"]),
+            "yuz_sekli": label_distribution(face["yuz_sekli"]),
+            "yuz_orani": numeric_summary(face["yuz_orani"], bins),
+        },
+        "vucut": {
+            "kayit_sayisi": int(body["omuz_kalca_orani"].size),
+            "vucut_tipi": label_distribution(body["vucut_tipi"]),
+            "omuz_kalca_orani": numeric_summary(body["omuz_kalca_orani"], bins),
+            "bel_kalca_orani": numeric_summary(body["bel_kalca_orani"], bins),
+            "boy_genislik_orani": numeric_summary(body["boy_genislik_orani"], bins),
+        },
+        "capraz_tablolar": {},
+    }
+
+    if face["yuz_orani"].size:
+        for rows, columns in (("ten_rengi", "goz_rengi"), ("yuz_sekli", "goz_rengi")):
+            row_labels, column_labels, table = crosstab(face[rows], face[columns])
+            report["capraz_tablolar"][f"{rows}/{columns}"] = {
+                "satirlar": row_labels, "sutunlar": column_labels, "sayilar": table.tolist()}
+
+    return report
+
+
+def print_report(report, width=30):
+    """Raporu metin olarak yazdırır (dağılımlar için basit çubuk grafikler)"""
+    for kind, title in (("yuz", "YÜZ ANALİZLERİ"), ("vucut", "VÜCUT ANALİZLERİ")):
+        section = report[kind]
+        print(f"\n=== {title} ({section['kayit_sayisi']} kayıt) ===")
+        for key, value in section.items():
+            if key == "kayit_sayisi":
+                continue
+            print(f"\n{key}:")
+            if isinstance(value, list) and not value:
+                print("  veri yok")
+            elif isinstance(value, list):
+                for label, count, share in value:
+                    print(f"  {label:<18} {count:>7}  {share * 100:5.1f}%  {'#' * round(share * width)}")
+            elif value.get("sayi"):
+                percentiles = ", ".join(f"{k}={v}" for k, v in value["yuzdelikler"].items())
+                print(f"  ortalama={value['ortalama']} std={value['std']} min={value['min']} max={value['max']}")
+                print(f"  {percentiles}")
+                counts = value["histogram"]["sayilar"]
+                edges = value["histogram"]["sinirlar"]
+                peak = max(counts) or 1
+                for i, count in enumerate(counts):
+                    print(f"  [{edges[i]:7.3f}, {edges[i + 1]:7.3f})  {count:>7}  {'#' * round(count / peak * width)}")
+            else:
+                print("  veri yok")
+
+    for name, table in report["capraz_tablolar"].items():
+        print(f"\n=== ÇAPRAZ TABLO: {name} ===")
+        columns = table["sutunlar"]
+        print(" " * 18 + "".join(f"{column[:12]:>13}" for column in columns))
+        for label, counts in zip(table["satirlar"], table["sayilar"]):
+            print(f"{label[:17]:<18}" + "".join(f"{count:>13}" for count in counts))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analiz sonuçlarından veri kümesi dağılım raporu üretir")
+    parser.add_argument("--db", default=default_database_path(), help="Veritabanı dosyası")
+    parser.add_argument("--bins", type=int, default=10, help="Histogram aralık sayısı")
+    parser.add_argument("--json", help="Raporu ayrıca bu JSON dosyasına yaz")
+    args = parser.parse_args()
+
+    database = ResultsDatabase(args.db)
+    report = build_report(database, args.bins)
+    database.close()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nRapor kaydedildi: {args.json}")
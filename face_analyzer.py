@@ -1,21 +1,43 @@
 import cv2
 import numpy as np
-import mediapipe as mp
-from matplotlib.colors import rgb2hex
 import os
-from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
 import colorsys
+import threading
+
+from frame_io import decode_image
 
 
 class FaceAnalyzer:
-    def __init__(self):
-        """Yüz analizi için gerekli araçları başlatır."""
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            static_image_mode=True,
-            max_num_faces=1,
-            min_detection_confidence=0.5)
+    # Renk tablolarındaki değerler bu listelerdeki etiket indeksleridir
+    color_table_labels = {
+        "skin": ("açık", "orta", "koyu"),
+        "eye": ("siyah", "gri", "mavi-gri", "açık-mavi", "mavi", "açık-yeşil", "yeşil",
+                "kehribar", "açık-kahverengi", "koyu-kahverengi", "kahverengi"),
+    }
+
+    # Süreç içinde paylaşılan renk tabloları (bir kez oluşturulur)
+    _color_tables = {}
+    _color_tables_lock = threading.Lock()
+
+    # Bölge rengi yöntemleri: bölgenin ortalaması veya piksel dağılımındaki baskın renk
+    color_methods = ("ortalama", "dagilim")
+
+    def __init__(self, color_table=False, color_method="ortalama", max_color_samples=2048):
+        """
+        Yüz analizi için gerekli araçları başlatır.
+        color_table True ise renk sınıflandırma tabloları burada hazırlanır (toplu işler için;
+        ilk oluşturma yaklaşık bir saniye sürer, sonraki analizörler aynı tabloyu kullanır).
+        color_method "dagilim" ise ten ve göz rengi bölge ortalaması yerine bölgedeki
+        en fazla max_color_samples pikselin baskın renginden bulunur (bkz. estimate_region_color).
+        """
+        if color_method not in self.color_methods:
+            raise ValueError(f"Bilinmeyen renk yöntemi: {color_method}")
+        self.color_method = color_method
+        self.max_color_samples = max_color_samples
+
+        # MediaPipe modeli (ve mediapipe modülü) ilk analizde yüklenir
+        self._face_mesh = None
 
         # Genişletilmiş renk sözlüğü
         self.color_names = {
@@ -59,17 +81,123 @@ class FaceAnalyzer:
         self.current_date = datetime.now()
         self.current_user = "admin"
 
+        if color_table:
+            for color_type in self.color_table_labels:
+                self.color_table(color_type)
+
+    @property
+    def face_mesh(self):
+        """MediaPipe FaceMesh modelini ilk kullanımda oluşturur"""
+        if self._face_mesh is None:
+            import mediapipe as mp
+            self._face_mesh = mp.solutions.face_mesh.FaceMesh(
+                static_image_mode=True,
+                max_num_faces=1,
+                min_detection_confidence=0.5)
+        return self._face_mesh
+
+    def rgb_to_hex(self, rgb):
+        """RGB değerini (0-255) '#rrggbb' biçimine çevirir"""
+        r, g, b = np.clip(np.rint(np.asarray(rgb, dtype=np.float64)), 0, 255).astype(np.int32)[:3]
+        return f"#{r:02x}{g:02x}{b:02x}"
+
     def rgb_to_hsv(self, rgb):
         """RGB değerini HSV'ye çevirir"""
         r, g, b = rgb[0] / 255.0, rgb[1] / 255.0, rgb[2] / 255.0
         h, s, v = colorsys.rgb_to_hsv(r, g, b)
         return h * 360, s * 100, v * 100
 
+    def _build_color_table(self, color_type):
+        """
+        get_color_category kurallarını tüm tamsayı RGB değerleri için bir kez uygular.
+        Göz tablosu (256, 256, 256) boyutundadır; ten rengi yalnızca parlaklığa (en büyük kanal)
+        bağlı olduğundan ten tablosu 256 elemanlıdır. HSV colorsys ile aynı adımlarla hesaplanır.
+        """
+        values = np.arange(256, dtype=np.float64) / 255.0
+        if color_type == "skin":
+            v = values * 100
+            return np.select([v > 75, v > 50], [0, 1], 2).astype(np.uint8)
+
+        table = np.empty((256, 256, 256), dtype=np.uint8)
+        g, b = values[None, :, None], values[None, None, :]
+        step = 16  # Ara diziler küçük kalsın diye kırmızı kanal dilimler halinde işlenir
+        for start in range(0, 256, step):
+            r = values[start:start + step, None, None]
+            maxc = np.maximum(np.maximum(r, g), b)
+            rangec = maxc - np.minimum(np.minimum(r, g), b)
+            gray = rangec == 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rc, gc, bc = (maxc - r) / rangec, (maxc - g) / rangec, (maxc - b) / rangec
+                h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+                h = np.where(gray, 0.0, np.mod(h / 6.0, 1.0)) * 360
+                s = np.where(gray, 0.0, rangec / maxc) * 100
+            v = maxc * 100
+
+            # Koşullar get_color_category'deki if/elif sırasıyla
+            blue = (h >= 160) & (h <= 240)
+            green = (h >= 80) & (h <= 160)
+            brown = (h >= 0) & (h <= 60)
+            conditions = [
+                (s < 15) & (v < 30),
+                s < 15,
+                blue & (s < 30) & (v < 60),
+                blue & (v > 70),
+                blue,
+                green & (v > 70),
+                green,
+                brown & (s > 60) & (v > 60),
+                brown & (v > 60),
+                brown & (v < 30),
+            ]
+            table[start:start + step] = np.select(conditions, np.arange(len(conditions)), len(conditions))
+
+        return table
+
+    def color_table(self, color_type):
+        """Renk sınıflandırma tablosunu döndürür, yoksa oluşturur (süreç başına bir kez)"""
+        table = self._color_tables.get(color_type)
+        if table is None:
+            with self._color_tables_lock:
+                table = self._color_tables.get(color_type)
+                if table is None:
+                    table = self._build_color_table(color_type)
+                    table.flags.writeable = False
+                    self._color_tables[color_type] = table
+        return table
+
+    def classify_colors(self, rgb, color_type="eye", as_index=False):
+        """
+        (..., 3) tamsayı RGB dizisindeki her rengi tek bir tablo okumasıyla sınıflandırır
+        (ör. bir bölgedeki tüm pikseller). Etiketler get_color_category ile aynıdır.
+        as_index True ise color_table_labels indeksleri (uint8) döner.
+        """
+        rgb = np.asarray(rgb)
+        if rgb.dtype != np.uint8:
+            if rgb.dtype.kind not in "iu" or rgb.min(initial=0) < 0 or rgb.max(initial=0) > 255:
+                raise ValueError("Renk tablosu 0-255 aralığında tamsayı RGB bekler")
+            rgb = rgb.astype(np.uint8)
+
+        table = self.color_table(color_type)
+        if color_type == "skin":
+            indices = table[rgb.max(axis=-1)]
+        else:
+            indices = table[rgb[..., 0], rgb[..., 1], rgb[..., 2]]
+        if as_index:
+            return indices
+        return np.array(self.color_table_labels[color_type], dtype=object)[indices]
+
     def get_color_category(self, rgb_array, color_type="eye"):
         """
         RGB değerini HSV'ye çevirip renk kategorisini belirler
         HSV ile renk tonu (hue) daha doğru tespit edilir
         """
+        # Tablo hazırsa tamsayı RGB için doğrudan tablodan oku
+        if color_type in self._color_tables:
+            rgb = np.asarray(rgb_array)
+            if rgb.shape == (3,) and rgb.dtype.kind in "iu" and 0 <= rgb.min() and rgb.max() <= 255:
+                return self.color_table_labels[color_type][
+                    int(self.classify_colors(rgb, color_type, as_index=True))]
+
         h, s, v = self.rgb_to_hsv(rgb_array)
 
         # Ten rengi için basit kümeleme
@@ -126,9 +254,6 @@ class FaceAnalyzer:
 
     def find_closest_color_name(self, rgb, color_type="eye"):
         """RGB değerine en yakın renk adını bulur"""
-        min_distance = float('inf')
-        closest_color = None
-
         # Ten rengi ve göz rengi için farklı renk grupları
         if color_type == "skin":
             colors = ["açık", "orta", "koyu"]
@@ -137,14 +262,10 @@ class FaceAnalyzer:
                       "kahverengi", "açık-kahverengi", "koyu-kahverengi", "kehribar",
                       "gri", "siyah"]
 
-        for name in colors:
-            sample = self.color_names[name]
-            distance = np.sqrt(np.sum((rgb - sample) ** 2))
-            if distance < min_distance:
-                min_distance = distance
-                closest_color = name
-
-        return closest_color
+        # Tüm referans renklere uzaklık tek işlemde; eşitlikte ilk renk seçilir
+        samples = np.array([self.color_names[name] for name in colors])
+        distances = np.sqrt(np.sum((np.asarray(rgb) - samples) ** 2, axis=1))
+        return colors[int(np.argmin(distances))]
 
     def get_average_color(self, image, mask=None):
         """Belirtilen bölgenin ortalama rengini döndürür."""
@@ -159,63 +280,170 @@ class FaceAnalyzer:
         rgb_color = np.array(mean_color[::-1], dtype=np.int32)
         return rgb_color
 
+    def landmarks_to_array(self, landmarks):
+        """
+        Landmark listesini (N, 3) normalize koordinat dizisine çevirir.
+        Zaten dizi ise olduğu gibi kullanılır. Hesaplamalar float64 ile yapılır.
+        """
+        if hasattr(landmarks, "landmark"):
+            return np.array([(lm.x, lm.y, lm.z) for lm in landmarks.landmark], dtype=np.float64)
+        return np.asarray(landmarks, dtype=np.float64)
+
+    def landmark_points(self, image_shape, landmarks, indices):
+        """Landmark indekslerinin piksel koordinatlarını (int32) döndürür."""
+        h, w = image_shape[:2]
+        points = self.landmarks_to_array(landmarks)[indices, :2] * (w, h)
+        return points.astype(np.int32)
+
     def create_mask_from_landmarks(self, image, landmarks, indices):
         """Landmark indekslerine göre bir maske oluşturur."""
         h, w = image.shape[:2]
-        points = []
-
-        for idx in indices:
-            landmark = landmarks.landmark[idx]
-            x, y = int(landmark.x * w), int(landmark.y * h)
-            points.append((x, y))
+        points_array = self.landmark_points(image.shape, landmarks, indices)
 
         mask = np.zeros((h, w), dtype=np.uint8)
-        points_array = np.array(points, np.int32)
         cv2.fillPoly(mask, [points_array], 255)
         return mask
 
+    def get_polygon_color(self, image, points):
+        """
+        Çokgen bölgenin ortalama rengini döndürür (RGB).
+        Tam boyutlu maske yerine yalnızca çokgenin sınır kutusu kadar maske kullanılır.
+        """
+        h, w = image.shape[:2]
+        x, y, box_w, box_h = cv2.boundingRect(points)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(w, x + box_w), min(h, y + box_h)
+        if x1 <= x0 or y1 <= y0:
+            return np.zeros(3, dtype=np.int32)
+
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cv2.fillPoly(mask, [(points - (x0, y0)).astype(np.int32)], 255)
+        return self.get_average_color(image[y0:y1, x0:x1], mask)
+
+    def sample_region_pixels(self, image, points, max_samples=None, max_area=128 * 128):
+        """
+        Çokgen bölgeden en fazla max_samples pikseli rastgele (sabit tohumla) seçer.
+        Sınır kutusu max_area'dan büyükse önce en yakın komşu ile küçültülür; böylece maliyet
+        görüntü çözünürlüğünden bağımsızdır. Pikseller görüntünün kanal sırasıyla (n, 3) döner.
+        """
+        max_samples = max_samples or self.max_color_samples
+        h, w = image.shape[:2]
+        x, y, box_w, box_h = cv2.boundingRect(points)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(w, x + box_w), min(h, y + box_h)
+        if x1 <= x0 or y1 <= y0:
+            return np.empty((0, 3), dtype=np.uint8)
+
+        crop = image[y0:y1, x0:x1]
+        polygon = (points - (x0, y0)).astype(np.float64)
+        area = crop.shape[0] * crop.shape[1]
+        if area > max_area:
+            # Ara değerleme yapılmaz: seçilen pikseller görüntüdeki gerçek renklerdir
+            scale = (max_area / area) ** 0.5
+            size = (max(1, int(crop.shape[1] * scale)), max(1, int(crop.shape[0] * scale)))
+            crop = cv2.resize(crop, size, interpolation=cv2.INTER_NEAREST)
+            polygon *= scale
+
+        mask = np.zeros(crop.shape[:2], dtype=np.uint8)
+        cv2.fillPoly(mask, [np.round(polygon).astype(np.int32)], 255)
+        pixels = crop[mask > 0][:, :3]
+        if len(pixels) > max_samples:
+            pixels = pixels[np.random.default_rng(0).choice(len(pixels), max_samples, replace=False)]
+        return pixels
+
+    def _kmeans(self, samples, k, iterations=10):
+        """
+        Küçük örnek kümesi için k-ortalamalar. Merkezler parlaklık (ilk sütun) yüzdeliklerinden
+        başlatılır, bu yüzden sonuç her çalıştırmada aynıdır. Küme etiketlerini döndürür.
+        """
+        order = np.argsort(samples[:, 0], kind="stable")
+        centers = samples[order[((np.arange(k) + 0.5) / k * len(samples)).astype(int)]].copy()
+        labels = np.zeros(len(samples), dtype=np.intp)
+        for iteration in range(iterations):
+            distances = ((samples[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+            new_labels = distances.argmin(axis=1)
+            if iteration > 0 and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            for i in range(k):
+                members = samples[labels == i]
+                if len(members):
+                    centers[i] = members.mean(axis=0)
+        return labels
+
+    def estimate_region_color(self, image, points, region="skin", rgb_input=False):
+        """
+        Bölgenin baskın rengini (RGB) piksel dağılımından tahmin eder.
+        Sınırlı sayıda örnek piksel Lab uzayında kümelenir, en kalabalık kümenin medyan rengi döner.
+        Göz bölgesinde göz akı (çok açık, renksiz) ile göz bebeği/kirpik (çok koyu) pikselleri
+        önce ayıklanır; böylece sonuç griye kaymaz. Örnek az ise ortalamaya dönülür.
+        """
+        pixels = self.sample_region_pixels(image, points)
+        if len(pixels) < 16:
+            color = self.get_polygon_color(image, points)
+            return color[::-1].copy() if rgb_input else color
+
+        lab = cv2.cvtColor(pixels.reshape(-1, 1, 3), cv2.COLOR_RGB2Lab if rgb_input else cv2.COLOR_BGR2Lab)
+        lab = lab.reshape(-1, 3).astype(np.float32)
+
+        if region == "eye":
+            # Göz akı: çok açık ve renksiz (OpenCV 8 bit Lab: L 0-255, a/b 128 merkezli)
+            chroma = np.hypot(lab[:, 1] - 128, lab[:, 2] - 128)
+            keep = ~((lab[:, 0] > 190) & (chroma < 12))
+            if keep.sum() >= 16:
+                pixels, lab = pixels[keep], lab[keep]
+
+        k = 3 if region == "eye" else 2
+        labels = self._kmeans(lab, k)
+        counts = np.bincount(labels, minlength=k)
+
+        if region == "eye":
+            # Göz bebeği/kirpik: örnekteki diğer kümelerden belirgin biçimde koyu, küçük küme.
+            # Sabit bir parlaklık eşiği kullanılmaz; koyu kahverengi ve siyah irisler de koyudur.
+            lightness = np.array([lab[labels == i, 0].mean() if counts[i] else np.inf for i in range(k)])
+            darkest, next_darkest = np.argsort(lightness)[:2]
+            if counts[darkest] < 0.35 * len(lab) and lightness[next_darkest] - lightness[darkest] > 20:
+                counts[darkest] = 0
+
+        dominant = counts.argmax()
+        color = np.median(pixels[labels == dominant], axis=0).astype(np.int32)
+        return color if rgb_input else color[::-1].copy()
+
+    def region_color(self, image, points, region="skin", rgb_input=False):
+        """Çokgen bölgenin rengini (RGB) seçili renk yöntemine göre döndürür"""
+        if self.color_method == "dagilim":
+            return self.estimate_region_color(image, points, region, rgb_input)
+        color = self.get_polygon_color(image, points)
+        return color[::-1].copy() if rgb_input else color
+
     def analyze_face_shape(self, landmarks, image_shape):
         """Yüz şeklini analiz eder"""
         h, w = image_shape[:2]
+        points = self.landmarks_to_array(landmarks)
 
         # Önemli yüz noktalarını topla
         face_points = {}
         for region, indices in self.face_shape_landmarks.items():
-            points = []
-            for idx in indices:
-                landmark = landmarks.landmark[idx]
-                x, y = int(landmark.x * w), int(landmark.y * h)
-                points.append((x, y))
-            face_points[region] = np.array(points)
+            face_points[region] = self.landmark_points(image_shape, points, indices)
 
         # Yüz oranlarını hesapla
         face_width = 0
         face_height = 0
 
         # Yüz genişliği (kulaklar arası)
-        left_ear = landmarks.landmark[234]
-        right_ear = landmarks.landmark[454]
-        face_width = int(abs(right_ear.x - left_ear.x) * w)
+        face_width = int(abs(points[454, 0] - points[234, 0]) * w)
 
         # Yüz uzunluğu (alın üstünden çene ucuna)
-        forehead_top = landmarks.landmark[10]
-        chin_bottom = landmarks.landmark[152]
-        face_height = int(abs(chin_bottom.y - forehead_top.y) * h)
+        face_height = int(abs(points[152, 1] - points[10, 1]) * h)
 
         # Çene genişliği
-        left_jaw = landmarks.landmark[93]
-        right_jaw = landmarks.landmark[323]
-        jaw_width = int(abs(right_jaw.x - left_jaw.x) * w)
+        jaw_width = int(abs(points[323, 0] - points[93, 0]) * w)
 
         # Alın genişliği
-        left_forehead = landmarks.landmark[103]
-        right_forehead = landmarks.landmark[332]
-        forehead_width = int(abs(right_forehead.x - left_forehead.x) * w)
+        forehead_width = int(abs(points[332, 0] - points[103, 0]) * w)
 
         # Çene açısı
-        left_cheekbone = landmarks.landmark[123]
-        right_cheekbone = landmarks.landmark[352]
-        cheekbone_width = int(abs(right_cheekbone.x - left_cheekbone.x) * w)
+        cheekbone_width = int(abs(points[352, 0] - points[123, 0]) * w)
 
         # En/boy oranı
         ratio = face_width / face_height if face_height > 0 else 0
@@ -264,14 +492,70 @@ class FaceAnalyzer:
 
         return face_shape_data
 
+    def analyze_face_shapes(self, landmarks, image_shapes):
+        """
+        analyze_face_shape'in toplu (vektörel) karşılığı.
+        landmarks: (N, 468, 2|3) normalize koordinatlar; image_shapes: tek (h, w) veya (N, 2) dizi.
+        (şekiller, oranlar) döndürür; aynı girdide etiketler ve oranlar tek tek hesaplananla aynıdır.
+        """
+        points = np.asarray(landmarks, dtype=np.float64)
+        shapes = np.asarray(image_shapes)
+        if shapes.ndim == 1:
+            h, w = shapes[0], shapes[1]
+        else:
+            h, w = shapes[:, 0], shapes[:, 1]
+
+        # Tek örnekteki int(abs(...) * w) kesmesiyle aynı: değerler negatif olmadığı için aşağı yuvarlama
+        def width(a, b, size, axis=0):
+            return np.floor(np.abs(points[:, a, axis] - points[:, b, axis]) * size).astype(np.int64)
+
+        face_width = width(454, 234, w)
+        face_height = width(152, 10, h, axis=1)
+        jaw_width = width(323, 93, w)
+        forehead_width = width(332, 103, w)
+        cheekbone_width = width(352, 123, w)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(face_height > 0, face_width / face_height, 0.0)
+
+        soft = (jaw_width < cheekbone_width) & (forehead_width > jaw_width)
+        near_square = (ratio >= 0.9) & (ratio < 1)
+        long = ratio < 0.8
+        wide_cheek = (cheekbone_width > forehead_width) & (cheekbone_width > jaw_width)
+
+        # Koşullar tek örnekteki if/elif sırasıyla; hiçbiri tutmazsa "oval"
+        conditions = [
+            (ratio > 0.8) & (ratio < 0.9) & soft,
+            near_square & soft,
+            near_square & ~soft & (jaw_width >= cheekbone_width * 0.9),
+            long & (forehead_width > jaw_width) & wide_cheek,
+            long & (forehead_width > jaw_width) & ~wide_cheek,
+            long & (forehead_width <= jaw_width) & (forehead_width > jaw_width * 1.2),
+        ]
+        labels = np.select(conditions, ["oval", "yuvarlak", "kare", "elmas", "dikdörtgen", "kalp"],
+                           default="oval")
+        return labels, ratio
+
     def analyze_face(self, image_path):
-        """Görselden yüz analizi yaparak ten, göz rengi ve yüz şeklini belirler."""
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Görsel yüklenemedi: {image_path}")
+        """
+        Görselden yüz analizi yaparak ten, göz rengi ve yüz şeklini belirler.
+        image_path yerine kodlanmış baytlar veya BGR dizi de verilebilir (bkz. frame_io.decode_image).
+        """
+        image = decode_image(image_path)
 
         # RGB'ye çevirme (mediapipe RGB kullanır)
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return self._analyze_face_image(image, image_rgb)
+
+    def analyze_face_rgb(self, image_rgb):
+        """
+        Çözülmüş RGB görüntüden (ör. paketlenmiş veri kümesi görünümü) yüz analizi yapar.
+        Kod çözme ve renk dönüşümü yapılmaz; döndürülen görüntü de RGB'dir.
+        """
+        return self._analyze_face_image(image_rgb, image_rgb, rgb_input=True)
+
+    def _analyze_face_image(self, image, image_rgb, rgb_input=False):
+        """Yüz analizinin ortak kısmı. image renk ölçümü için kullanılır (rgb_input False ise BGR)."""
         results = self.face_mesh.process(image_rgb)
 
         if not results.multi_face_landmarks:
@@ -302,16 +586,19 @@ class FaceAnalyzer:
 
         # Renkleri analiz et
         try:
-            skin_color = self.get_average_color(image, skin_mask)
-            right_eye_color = self.get_average_color(image, right_eye_mask)
-            left_eye_color = self.get_average_color(image, left_eye_mask)
+            # Seçili renk yöntemine göre (ortalama veya piksel dağılımı), RGB olarak
+            skin_color, right_eye_color, left_eye_color = (
+                self.region_color(image, self.landmark_points(image.shape, face_landmarks, indices),
+                                  region, rgb_input)
+                for indices, region in ((skin_indices, "skin"), (right_eye_indices, "eye"),
+                                        (left_eye_indices, "eye")))
 
             # Ortalama göz rengi - float hesaplamalarını int'e dönüştür
             eye_color = np.array(((right_eye_color + left_eye_color) / 2), dtype=np.int32)
 
             # HEX değerlerini hesapla
-            skin_hex = rgb2hex(skin_color / 255)
-            eye_hex = rgb2hex(eye_color / 255)
+            skin_hex = self.rgb_to_hex(skin_color)
+            eye_hex = self.rgb_to_hex(eye_color)
 
             # HSV tabanlı geliştirilmiş renk sınıflandırması
             skin_color_name = self.get_color_category(skin_color, "skin")
@@ -358,6 +645,14 @@ class FaceAnalyzer:
             }
             return default_result, image, skin_mask, right_eye_mask, left_eye_mask
 
+    def analyze_face_bytes(self, data):
+        """Bellekteki kodlanmış görüntüden (bytes/bytearray/memoryview) yüz analizi yapar; diske yazılmaz."""
+        return self.analyze_face(memoryview(data))
+
+    def analyze_face_array(self, image):
+        """Çözülmüş BGR görüntü dizisinden yüz analizi yapar (dizi kopyalanmaz)."""
+        return self.analyze_face(np.asarray(image))
+
     def visualize_results(self, image, skin_mask, right_eye_mask, left_eye_mask, result):
         """Analiz sonuçlarını görselleştirir ve Türkçe karakter desteği ile metin ekler."""
         h, w = image.shape[:2]
@@ -380,6 +675,7 @@ class FaceAnalyzer:
                                                                                          dtype=np.uint8) * 0.3
 
         # OpenCV görüntüsünü PIL görüntüsüne dönüştür (Türkçe karakter desteği için)
+        from PIL import Image, ImageDraw, ImageFont
         pil_image = Image.fromarray(cv2.cvtColor(viz_image, cv2.COLOR_BGR2RGB))
         draw = ImageDraw.Draw(pil_image)
 
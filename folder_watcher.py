@@ -0,0 +1,387 @@
+import json
+import os
+import queue
+import threading
+from time import time, sleep, perf_counter
+
+import cv2
+
+from face_analyzer import FaceAnalyzer
+from body_analyzer import BodyAnalyzer
+from image_catalog import ImageCatalog
+from frame_io import decode_image
+from perceptual_hash import BKTree, dhash, pixel_difference
+from analysis_results import compact_result
+
+
+class FolderWatcher:
+    """
+    Resim klasörünü sürekli izleyip yeni veya değişen dosyaları analiz eden sınıf.
+    Klasör katalog üzerinden periyodik olarak taranır (yalnızca değişen dosyalar okunur);
+    yazılması bitmemiş dosyalar settle_time boyunca değişmeyene kadar bekletilir.
+    Analizler sabit boyutlu bir işçi havuzunda yapılır, her işçi kendi modellerini yükler.
+    Katalogda analiz durumu kayıtlı dosyalar (içerik değişmedikçe) tekrar işlenmez.
+    database verilirse sonuçlar her taramada tek bir işlemle veritabanına eklenir.
+    dedupe_distance verilirse (varsayılan kapalı) algısal özeti daha önce analiz edilmiş bir dosyaya
+    o kadar bit yakın olan ve küçültülmüş piksel farkı dedupe_max_pixel_diff'i aşmayan dosyalar
+    (yeniden kodlamalar, ölçeklenmiş kopyalar) analiz edilmez, o dosyanın sonucu yeniden kullanılır.
+    Yalnızca özete güvenilmez: aynı kadraj ve arka planla çekilmiş farklı kişiler de yakın özet verebilir.
+    """
+
+    # Sonuç dosyası ön ekleri (results klasöründe)
+    result_prefixes = {"yuz": "face_analyzed_", "vucut": "body_analyzed_"}
+
+    def __init__(self, images_dir, results_dir, catalog=None, kinds=("yuz", "vucut"),
+                 num_workers=2, poll_interval=2.0, settle_time=1.0, save_visualization=True, database=None,
+                 dedupe_distance=None, dedupe_max_pixel_diff=3.0):
+        self.images_dir = images_dir
+        self.results_dir = results_dir
+        self.catalog = catalog or ImageCatalog(images_dir)
+        self.kinds = kinds
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.save_visualization = save_visualization
+        self.database = database
+        self.records = []  # Veritabanına yazılmayı bekleyen sonuçlar (FaceResult/BodyResult)
+        self.dedupe_distance = dedupe_distance
+        self.dedupe_max_pixel_diff = dedupe_max_pixel_diff
+        # Analiz türü başına, sonucu olan dosyaların algısal özet ağacı
+        self.duplicate_index = {kind: BKTree() for kind in kinds}
+        self.indexed = {}  # Ağaçlara eklenmiş (tür, dosya) -> özet (dosya değişince çıkarmak için)
+
+        self.jobs = queue.Queue()
+        self.queued = set()  # Kuyrukta veya işlenmekte olan dosyalar
+        self.waiting = set()  # Yazılması henüz bitmemiş olabilecek dosyalar
+        self.lock = threading.Lock()
+        self.running = False
+        self._threads = []
+
+        self.stats = {"islenen": 0, "kopya": 0, "bulunamayan": 0, "hata": 0}
+
+        if not os.path.exists(self.results_dir):
+            os.makedirs(self.results_dir)
+
+    def _pending_kinds(self, entry):
+        return [kind for kind in self.kinds if kind not in entry["analiz"]]
+
+    def _enqueue(self, names, now):
+        """Analizi eksik ve yazılması bitmiş dosyaları kuyruğa ekler"""
+        for name in names:
+            entry = self.catalog.get(name)
+            if entry is None:
+                self.waiting.discard(name)
+                continue
+
+            # Değişiklik zamanı çok yeniyse dosya hâlâ yazılıyor olabilir
+            if now - entry["zaman"] / 1e9 < self.settle_time:
+                self.waiting.add(name)
+                continue
+            self.waiting.discard(name)
+
+            if not self._pending_kinds(entry):
+                continue
+
+            with self.lock:
+                if name in self.queued:
+                    continue
+                self.queued.add(name)
+            self.jobs.put(name)
+
+    def scan(self, initial=False):
+        """
+        Klasörü bir kez tarar ve yeni işleri kuyruğa ekler.
+        initial=True ise katalogda analizi eksik kalmış tüm dosyalar da eklenir.
+        """
+        # İlk taramada klasör baştan listelenir; sonrakilerde katalog yalnızca değişen dosyalara bakar
+        added, changed, removed = self.catalog.refresh(full=initial)
+        # Değişen veya silinen dosyaların eski özetleri kopya eşleşmesinde kullanılmasın
+        self._unindex(set(changed) | set(removed))
+        candidates = set(added) | set(changed) | self.waiting
+        if initial:
+            for kind in self.kinds:
+                candidates.update(self.catalog.pending(kind))
+
+        self._enqueue(sorted(candidates), time())
+
+        # İşçilerin işaretlediği analiz durumlarını ve sonuçlarını toplu olarak kaydet
+        self.catalog.save()
+        self.flush_records()
+        return len(candidates)
+
+    def flush_records(self):
+        """Biriken sonuçları tek işlemde veritabanına yazar"""
+        if self.database is None:
+            return
+        with self.lock:
+            records, self.records = self.records, []
+        try:
+            self.database.add_results(records)
+        except Exception as e:
+            print(f"Veritabanı yazma hatası: {e}")
+
+    def _write_result(self, output_path, viz_image, result):
+        """
+        Görselleştirmeyi ve analiz sonucunu (aynı adlı .json) yazar.
+        JSON geçici dosyaya yazılıp yerine taşınır; yarım dosya hiçbir zaman görünmez.
+        """
+        if viz_image is not None:
+            cv2.imwrite(output_path, viz_image)
+        json_path = os.path.splitext(output_path)[0] + ".json"
+        temp_path = f"{json_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, json_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _analyze(self, name, kind, face_analyzer, body_analyzer, source_hash=None):
+        """Tek dosya için bir analiz türünü çalıştırır ve durumunu döndürür"""
+        image_path = self.catalog.path(name)
+        start = perf_counter()
+
+        if kind == "yuz":
+            result, image, skin_mask, right_eye_mask, left_eye_mask = face_analyzer.analyze_face(image_path)
+            duration_ms = (perf_counter() - start) * 1000
+            if not result:
+                return "bulunamadi"
+            viz_image = face_analyzer.visualize_results(
+                image, skin_mask, right_eye_mask, left_eye_mask, result) if self.save_visualization else None
+            output_path = os.path.join(self.results_dir, self.result_prefixes[kind] + name)
+        else:
+            result, image, pose_landmarks = body_analyzer.analyze_body(image_path)
+            duration_ms = (perf_counter() - start) * 1000
+            if not result:
+                return "bulunamadi"
+            viz_image = body_analyzer.visualize_results(
+                image, pose_landmarks, result) if self.save_visualization else None
+            output_path = os.path.join(self.results_dir, self.result_prefixes[kind] + name)
+
+        # Veritabanı kaydı sonuç dosyası yazıldıktan sonra eklenir (kayıt hiçbir zaman eksik dosyayı göstermez)
+        self._write_result(output_path, viz_image, result)
+        if self.database is not None:
+            with self.lock:
+                self.records.append((kind, image_path, compact_result(kind, result), source_hash, duration_ms))
+        return "tamam"
+
+    def _perceptual_hash(self, name, entry):
+        """Dosyanın algısal özetini hesaplar ve katalog kaydına ekler (önceden hesaplandıysa onu kullanır)"""
+        if self.dedupe_distance is None:
+            return None
+        if entry.get("phash") is not None:
+            return entry["phash"]
+        try:
+            phash = dhash(self.catalog.path(name))
+        except Exception as e:
+            print(f"Algısal özet hatası ({name}): {e}")
+            return None
+
+        with self.catalog.lock:
+            if self.catalog.get(name) is entry:
+                entry["phash"] = phash
+                self.catalog.dirty = True
+        return phash
+
+    def _index(self, name, kind, phash):
+        """Analizi tamamlanan dosyayı kopya arama ağacına ekler (self.lock tutulurken çağrılır)"""
+        if self.indexed.get((kind, name)) == phash:
+            return
+        self._unindex_locked(kind, name)
+        self.duplicate_index[kind].add(phash, name)
+        self.indexed[(kind, name)] = phash
+
+    def _unindex_locked(self, kind, name):
+        phash = self.indexed.pop((kind, name), None)
+        if phash is not None:
+            self.duplicate_index[kind].remove(phash, name)
+
+    def _unindex(self, names):
+        """Dosyaların özetlerini tüm ağaçlardan çıkarır"""
+        with self.lock:
+            for name in names:
+                for kind in self.kinds:
+                    self._unindex_locked(kind, name)
+
+    def _find_duplicate(self, name, kind, phash):
+        """Özeti yakın ve piksel karşılaştırmasıyla doğrulanan ilk dosyayı (mesafe, ad) döndürür"""
+        with self.lock:
+            matches = self.duplicate_index[kind].search(phash, self.dedupe_distance)
+        for distance, _, original in matches:
+            if original == name:
+                continue
+            try:
+                difference = pixel_difference(self.catalog.path(name), self.catalog.path(original))
+            except Exception:
+                continue
+            if difference <= self.dedupe_max_pixel_diff:
+                return distance, original
+        return None
+
+    def _reuse_duplicate(self, name, kind, phash, source_hash, face_analyzer, body_analyzer):
+        """Neredeyse aynı bir dosyanın sonucu varsa onu bu dosya için yazar; 'kopya' veya None döndürür"""
+        if phash is None:
+            return None
+        match = self._find_duplicate(name, kind, phash)
+        if match is None:
+            return None
+
+        distance, original = match
+        prefix = self.result_prefixes[kind]
+        try:
+            with open(os.path.join(self.results_dir, prefix + os.path.splitext(original)[0] + ".json"),
+                      encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            # Önceki sonuç dosyası yoksa normal analize devam et
+            return None
+
+        viz_image = None
+        if self.save_visualization:
+            # Maske/landmark olmadan: yalnızca sonuç bilgileri bu dosyanın görüntüsü üzerine yazılır
+            image = decode_image(self.catalog.path(name))
+            if kind == "yuz":
+                viz_image = face_analyzer.visualize_results(image, None, None, None, result)
+            else:
+                viz_image = body_analyzer.visualize_results(image, None, result)
+
+        self._write_result(os.path.join(self.results_dir, prefix + name), viz_image, result)
+        if self.database is not None:
+            with self.lock:
+                self.records.append((kind, self.catalog.path(name), compact_result(kind, result), source_hash, None))
+
+        print(f"{name}: {original} ile neredeyse aynı ({distance} bit), {kind} sonucu yeniden kullanıldı")
+        return "kopya"
+
+    def _build_duplicate_index(self):
+        """Katalogdaki analizi tamamlanmış ve özeti bilinen dosyaları ağaçlara ekler"""
+        with self.catalog.lock:
+            for name, entry in self.catalog.entries.items():
+                if entry.get("phash") is None:
+                    continue
+                for kind in self.kinds:
+                    if entry["analiz"].get(kind) == "tamam":
+                        with self.lock:
+                            self._index(name, kind, entry["phash"])
+
+    def _worker(self):
+        """Analiz işçisi - kuyruktan dosya alır, eksik analizleri yapar"""
+        face_analyzer = FaceAnalyzer(color_table=True) if "yuz" in self.kinds else None
+        body_analyzer = BodyAnalyzer() if "vucut" in self.kinds else None
+
+        while True:
+            name = self.jobs.get()
+            if name is None:
+                self.jobs.task_done()
+                return
+
+            try:
+                entry = self.catalog.get(name)
+                phash = self._perceptual_hash(name, entry) if entry else None
+                for kind in self._pending_kinds(entry) if entry else []:
+                    try:
+                        status = self._reuse_duplicate(name, kind, phash, entry["ozet"],
+                                                       face_analyzer, body_analyzer) or \
+                            self._analyze(name, kind, face_analyzer, body_analyzer, entry["ozet"])
+                    except Exception as e:
+                        print(f"İzleme analiz hatası ({name}): {e}")
+                        status = "hata"
+
+                    with self.catalog.lock:
+                        # Analiz sırasında dosya değiştiyse kayıt yenilenmiştir; eski sonucu işaretleme
+                        current = self.catalog.get(name) is entry
+                        if current:
+                            self.catalog.mark_analyzed(name, kind, "tamam" if status == "kopya" else status,
+                                                       save=False)
+                        with self.lock:
+                            if current and status == "tamam" and phash is not None:
+                                self._index(name, kind, phash)
+
+                    with self.lock:
+                        if status == "tamam":
+                            self.stats["islenen"] += 1
+                        elif status == "kopya":
+                            self.stats["kopya"] += 1
+                        elif status == "bulunamadi":
+                            self.stats["bulunamayan"] += 1
+                        else:
+                            self.stats["hata"] += 1
+                    print(f"{name}: {kind} analizi {status}")
+            finally:
+                with self.lock:
+                    self.queued.discard(name)
+                self.jobs.task_done()
+
+    def start(self):
+        """İşçi havuzunu başlatır"""
+        self.running = True
+        if self.dedupe_distance is not None:
+            self._build_duplicate_index()
+        for _ in range(self.num_workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def run(self, max_polls=None):
+        """
+        İzleme döngüsü: her poll_interval saniyede klasörü tarar.
+        max_polls verilirse o kadar taramadan sonra kuyruk bitince döner. Ctrl+C ile durdurulur.
+        """
+        self.start()
+        print(f"'{self.images_dir}' klasörü izleniyor (durdurmak için Ctrl+C)...")
+
+        polls = 0
+        try:
+            while self.running:
+                self.scan(initial=polls == 0)
+                polls += 1
+                if max_polls is not None and polls >= max_polls:
+                    self.jobs.join()
+                    break
+                sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("\nİzleme durduruluyor...")
+        finally:
+            self.stop()
+
+        return dict(self.stats)
+
+    def stop(self):
+        """Başlamamış işleri bırakır, süren analizlerin bitmesini bekler ve kataloğu kaydeder"""
+        self.running = False
+        while True:
+            try:
+                name = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            with self.lock:
+                self.queued.discard(name)
+            self.jobs.task_done()
+
+        for _ in self._threads:
+            self.jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.catalog.save()
+        self.flush_records()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Resim klasörünü izleyip yeni dosyaları analiz eder")
+    parser.add_argument("--images", default=os.path.join(base_dir, "images"), help="İzlenecek klasör")
+    parser.add_argument("--results", default=os.path.join(base_dir, "results"), help="Sonuç klasörü")
+    parser.add_argument("--dedupe-distance", type=int, default=None,
+                        help="Bu kadar bit yakın (ve pikselce doğrulanan) kopyaların sonucunu yeniden kullan "
+                             "(varsayılan: kapalı)")
+    parser.add_argument("--dedupe-max-pixel-diff", type=float, default=3.0,
+                        help="Kopya sayılmak için küçültülmüş görüntülerde izin verilen ortalama piksel farkı")
+    args = parser.parse_args()
+
+    watcher = FolderWatcher(args.images, args.results, dedupe_distance=args.dedupe_distance,
+                            dedupe_max_pixel_diff=args.dedupe_max_pixel_diff)
+    watcher.run()
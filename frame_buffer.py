@@ -0,0 +1,193 @@
+import threading
+from time import time
+
+import cv2
+import numpy as np
+
+
+class FrameQualityScorer:
+    """
+    Kareler için ucuz kalite puanları hesaplar:
+    netlik (küçültülmüş gri görüntüde Laplace varyansı), yüz boyutu ve göz açıklığı (landmark'lardan).
+    """
+
+    # Göz açıklığı için yatay ve dikey landmark çiftleri (sağ ve sol göz)
+    eye_landmarks = [
+        ((33, 133), (159, 145)),
+        ((362, 263), (386, 374)),
+    ]
+
+    def __init__(self, sample_width=160, sharpness_weight=1.0, face_weight=1.0, eye_weight=1.0):
+        self.sample_width = sample_width
+        self.sharpness_weight = sharpness_weight
+        self.face_weight = face_weight
+        self.eye_weight = eye_weight
+
+    def sharpness(self, frame):
+        """Küçültülmüş gri kare üzerinde Laplace varyansı (yüksek = net)"""
+        h, w = frame.shape[:2]
+        scale = min(1.0, self.sample_width / w)
+        small = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
+        return float(stddev[0][0] ** 2)
+
+    def _to_array(self, landmarks):
+        """Landmark listesini veya dizisini (N, 2+) normalize koordinat dizisine çevirir"""
+        if hasattr(landmarks, "landmark"):
+            return np.array([(landmark.x, landmark.y) for landmark in landmarks.landmark], dtype=np.float32)
+        return np.asarray(landmarks)
+
+    def face_size(self, landmarks):
+        """Yüzün kare içindeki alan oranı (landmark sınır kutusu, 0-1)"""
+        points = np.clip(self._to_array(landmarks)[:, :2], 0.0, 1.0)
+        width, height = points.max(axis=0) - points.min(axis=0)
+        return float(width * height)
+
+    def eye_openness(self, landmarks, image_shape):
+        """İki gözün ortalama açıklık oranı (dikey / yatay mesafe)"""
+        h, w = image_shape[:2]
+        points = self._to_array(landmarks)[:, :2] * (w, h)
+        ratios = []
+        for (left, right), (top, bottom) in self.eye_landmarks:
+            horizontal = np.linalg.norm(points[right] - points[left])
+            vertical = np.linalg.norm(points[bottom] - points[top])
+            ratios.append(vertical / horizontal if horizontal > 0 else 0.0)
+        return float(np.mean(ratios))
+
+    def score(self, sharpness, landmarks=None, image_shape=None, max_sharpness=None):
+        """
+        Birleşik kalite puanı. Netlik aday kareler içindeki en yüksek değere göre normalize edilir.
+        Landmark yoksa (yüz bulunamadı) yalnızca netlik kullanılır ve puan düşürülür.
+        """
+        sharp = sharpness / max_sharpness if max_sharpness else 0.0
+        total = self.sharpness_weight * sharp
+
+        if landmarks is None:
+            return total - self.face_weight - self.eye_weight
+
+        # Göz açıklığı ~0.3 civarında tam açık kabul edilir
+        total += self.face_weight * min(1.0, self.face_size(landmarks) * 4)
+        total += self.eye_weight * min(1.0, self.eye_openness(landmarks, image_shape) / 0.3)
+        return total
+
+
+class FrameRingBuffer:
+    """
+    Son N kareyi önceden ayrılmış bellekte tutan döngüsel tampon.
+    Her kare eklenirken netlik puanı hesaplanır; anlık görüntü için en iyi kare seçilir.
+    Canlı döngü kare eklerken başka bir thread'den okunabilir; tüm erişimler kilitle yapılır.
+    """
+
+    def __init__(self, capacity=15, scorer=None):
+        self.capacity = capacity
+        self.scorer = scorer or FrameQualityScorer()
+        self.frames = None
+        self.sharpness = np.zeros(capacity, dtype=np.float32)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.landmarks = [None] * capacity
+        self.position = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        with self.lock:
+            self._clear()
+
+    def _clear(self):
+        self.position = 0
+        self.count = 0
+        self.landmarks = [None] * self.capacity
+
+    def push(self, frame, timestamp=None, landmarks=None):
+        """Kareyi tampona kopyalar (kare boyutu değişmedikçe yeni bellek ayrılmaz)"""
+        # Netlik kilit dışında hesaplanır; kilit yalnızca slot yazılırken tutulur
+        sharpness = self.scorer.sharpness(frame)
+
+        with self.lock:
+            if self.frames is None or self.frames.shape[1:] != frame.shape:
+                self.frames = np.empty((self.capacity,) + frame.shape, dtype=frame.dtype)
+                self._clear()
+
+            slot = self.position
+            np.copyto(self.frames[slot], frame)
+            self.sharpness[slot] = sharpness
+            self.timestamps[slot] = time() if timestamp is None else timestamp
+            self.landmarks[slot] = landmarks
+
+            self.position = (self.position + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def attach_landmarks(self, landmarks):
+        """Son eklenen kareye (ör. canlı analizden gelen) landmark'ları ekler"""
+        with self.lock:
+            if self.count:
+                self.landmarks[(self.position - 1) % self.capacity] = landmarks
+
+    def _slots(self):
+        """Dolu slotları eskiden yeniye sıralı döndürür"""
+        start = (self.position - self.count) % self.capacity
+        return [(start + i) % self.capacity for i in range(self.count)]
+
+    def select_best(self, landmark_fn=None, candidates=3):
+        """
+        En iyi kareyi seçer: önce netliğe göre en iyi 'candidates' kare alınır,
+        sonra bunlar yüz boyutu ve göz açıklığına göre puanlanır.
+        landmark_fn(frame) -> landmarks, tamponda landmark'ı olmayan adaylar için çağrılır.
+        (kare kopyası, landmarks, puan) döndürür.
+        """
+        # Adaylar kilit altında kopyalanır; landmark_fn (model) kilit dışında çalışır,
+        # böylece canlı döngü seçim sırasında kare eklemeye devam edebilir
+        with self.lock:
+            if not self.count:
+                return None, None, None
+
+            slots = self._slots()
+            slots.sort(key=lambda slot: self.sharpness[slot], reverse=True)
+            slots = slots[:candidates]
+            entries = [(slot, self.frames[slot].copy(), float(self.sharpness[slot]),
+                        float(self.timestamps[slot]), self.landmarks[slot]) for slot in slots]
+        max_sharpness = entries[0][2]
+
+        best = (None, None, None)
+        for slot, frame, sharpness, timestamp, landmarks in entries:
+            if landmarks is None and landmark_fn is not None:
+                landmarks = landmark_fn(frame)
+                with self.lock:
+                    # Slot bu arada yeni bir kareyle değişmediyse landmark'ları sakla
+                    if self.timestamps[slot] == timestamp:
+                        self.landmarks[slot] = landmarks
+
+            score = self.scorer.score(sharpness, landmarks, frame.shape, max_sharpness)
+            if best[2] is None or score > best[2]:
+                best = (frame, landmarks, score)
+
+        return best
+
+
+class BufferPool:
+    """
+    Canlı döngüde tekrar kullanılan, önceden ayrılmış kare tamponları.
+    Tampon yalnızca ilk istekte veya kare boyutu değiştiğinde ayrılır; 'allocations'
+    sayacı sabit durumda artmıyorsa döngü kare başına yeni bellek ayırmıyor demektir.
+    """
+
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """İsimli tamponu döndürür; boyut/tip uyuşmuyorsa yeniden ayırır"""
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self.buffers[name] = buffer
+            self.allocations += 1
+        return buffer
+
+    def nbytes(self):
+        """Tamponların toplam bellek kullanımı (bayt)"""
+        return sum(buffer.nbytes for buffer in self.buffers.values())
@@ -0,0 +1,290 @@
+import os
+from collections import deque
+from time import time
+
+import cv2
+import numpy as np
+
+
+# Tuşa basılmadığında sink'lerin döndürdüğü değer
+NO_KEY = -1
+
+
+def decode_image(source):
+    """
+    Görüntüyü BGR uint8 diziye çevirir. source şunlardan biri olabilir:
+    dosya yolu, kodlanmış görüntü baytları (bytes/bytearray/memoryview, ör. yükleme veya veritabanı alanı)
+    veya çözülmüş dizi (BGR, gri ya da BGRA). Baytlar kopyalanmadan memoryview üzerinden çözülür.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        image = cv2.imread(os.fspath(source))
+        if image is None:
+            raise ValueError(f"Görsel yüklenemedi: {source}")
+        return image
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = np.frombuffer(memoryview(source), dtype=np.uint8)
+        image = cv2.imdecode(source, cv2.IMREAD_COLOR) if source.size else None
+        if image is None:
+            raise ValueError("Görsel verisi çözülemedi")
+        return image
+
+    if isinstance(source, np.ndarray):
+        if source.ndim == 1 and source.dtype == np.uint8:
+            # Tek boyutlu uint8 dizi kodlanmış dosya içeriğidir
+            return decode_image(memoryview(source))
+        if source.dtype != np.uint8:
+            raise ValueError(f"Desteklenmeyen görüntü tipi: {source.dtype}")
+        if source.ndim == 2:
+            return cv2.cvtColor(source, cv2.COLOR_GRAY2BGR)
+        if source.ndim == 3 and source.shape[2] == 4:
+            return cv2.cvtColor(source, cv2.COLOR_BGRA2BGR)
+        if source.ndim == 3 and source.shape[2] == 3:
+            return source
+        raise ValueError(f"Desteklenmeyen görüntü boyutu: {source.shape}")
+
+    raise ValueError(f"Desteklenmeyen görüntü kaynağı: {type(source).__name__}")
+
+
+class FrameSource:
+    """
+    Kare kaynağı temel sınıfı.
+    cv2.VideoCapture ile aynı arayüzü (read, isOpened, release) sunar, böylece
+    CaptureAnalyzer kamerayı, video dosyasını veya sentetik kareleri aynı şekilde kullanır.
+    """
+
+    def __init__(self, width=0, height=0, fps=30):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_index = -1
+
+    def read(self):
+        """(ret, frame) döndürür"""
+        raise NotImplementedError
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def frame_time(self):
+        """Son okunan karenin zamanı (saniye). Dosya kaynaklarında kare sırasına göre hesaplanır."""
+        return max(self.frame_index, 0) / self.fps if self.fps else 0.0
+
+
+class CaptureSource(FrameSource):
+    """cv2.VideoCapture tabanlı kaynakların ortak okuma/kapatma işlemleri"""
+
+    capture = None
+
+    def read(self):
+        ret, frame = self.capture.read()
+        if ret:
+            self.frame_index += 1
+        return ret, frame
+
+    def isOpened(self):
+        return self.capture is not None and self.capture.isOpened()
+
+    def release(self):
+        if self.isOpened():
+            self.capture.release()
+
+
+class CameraSource(CaptureSource):
+    """Kamera kaynağı"""
+
+    def __init__(self, camera_id=0, width=640, height=480, fps=30):
+        super().__init__(width, height, fps)
+        self.camera_id = camera_id
+        self.capture = cv2.VideoCapture(camera_id)
+
+        if not self.capture.isOpened():
+            raise ValueError(f"Kamera {camera_id} açılamadı")
+
+        # Kamera çözünürlüğü ve FPS ayarları
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.capture.set(cv2.CAP_PROP_FPS, fps)
+
+        # Gerçek ayarları al
+        self.width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or fps
+
+    def frame_time(self):
+        """Canlı kamerada duvar saati kullanılır"""
+        return time()
+
+
+class VideoFileSource(CaptureSource):
+    """Video dosyası kaynağı"""
+
+    def __init__(self, video_path):
+        if not os.path.exists(video_path):
+            raise ValueError(f"Video dosyası bulunamadı: {video_path}")
+
+        super().__init__()
+        self.video_path = video_path
+        self.capture = cv2.VideoCapture(video_path)
+
+        if not self.capture.isOpened():
+            raise ValueError(f"Video dosyası açılamadı: {video_path}")
+
+        # Videonun gerçek ayarlarını al
+        self.width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30
+
+
+class ImageSequenceSource(FrameSource):
+    """Görsel dizisi kaynağı (dosya listesi veya klasör)"""
+
+    image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
+
+    def __init__(self, paths, fps=30, loop=False):
+        super().__init__(fps=fps)
+
+        # Klasör verilirse içindeki görselleri sıralı olarak al
+        if isinstance(paths, str):
+            paths = [os.path.join(paths, filename) for filename in sorted(os.listdir(paths))
+                     if os.path.splitext(filename)[1].lower() in self.image_extensions]
+
+        self.paths = list(paths)
+        self.loop = loop
+        self.position = 0
+
+        if not self.paths:
+            raise ValueError("Görsel dizisi boş")
+
+    def read(self):
+        """
+        Sıradaki görseli okur. Çözülemeyen dosyalar uyarıyla atlanır ve listeden çıkarılır
+        (döngü modunda tekrar denenmez); okunabilir görsel kalmazsa dizi biter.
+        """
+        while True:
+            if self.position >= len(self.paths):
+                if not self.loop or not self.paths:
+                    return False, None
+                self.position = 0
+
+            try:
+                frame = decode_image(self.paths[self.position])
+            except ValueError as e:
+                print(f"Uyarı: {e}, atlanıyor")
+                del self.paths[self.position]
+                continue
+
+            self.position += 1
+            break
+
+        self.frame_index += 1
+        self.height, self.width = frame.shape[:2]
+        return True, frame
+
+
+class SyntheticSource(FrameSource):
+    """
+    Deterministik sentetik kare üreteci (kamera olmadan test ve ölçüm için).
+    generator verilirse generator(kare_no) -> BGR kare kullanılır.
+    """
+
+    def __init__(self, width=640, height=480, fps=30, num_frames=300, generator=None, seed=0):
+        super().__init__(width, height, fps)
+        self.num_frames = num_frames
+        self.generator = generator
+
+        # Sabit gürültülü arka plan, her karede kaydırılarak hareket taklit edilir
+        rng = np.random.default_rng(seed)
+        self.background = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+    def read(self):
+        if self.num_frames is not None and self.frame_index + 1 >= self.num_frames:
+            return False, None
+
+        self.frame_index += 1
+        if self.generator is not None:
+            return True, self.generator(self.frame_index)
+
+        return True, np.roll(self.background, self.frame_index * 4, axis=1)
+
+
+class FrameSink:
+    """
+    Kare hedefi temel sınıfı.
+    write() kareyi işler ve basılan tuşu (yoksa NO_KEY) döndürür.
+    """
+
+    def __init__(self):
+        self.frame_count = 0
+
+    def write(self, frame):
+        self.frame_count += 1
+        return NO_KEY
+
+    def close(self):
+        pass
+
+
+class WindowSink(FrameSink):
+    """OpenCV penceresi (cv2.imshow / cv2.waitKey)"""
+
+    def __init__(self, title="Yüz Analizi", wait_ms=1):
+        super().__init__()
+        self.title = title
+        self.wait_ms = wait_ms
+
+    def write(self, frame):
+        super().write(frame)
+        cv2.imshow(self.title, frame)
+        key = cv2.waitKey(self.wait_ms)
+        return key & 0xFF if key != -1 else NO_KEY
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class VideoFileSink(FrameSink):
+    """Video dosyasına yazan hedef. Yazıcı ilk karenin boyutuyla oluşturulur."""
+
+    def __init__(self, output_path, fps=30, fourcc="mp4v"):
+        super().__init__()
+        self.output_path = output_path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.writer = None
+
+    def write(self, frame):
+        super().write(frame)
+        if self.writer is None:
+            h, w = frame.shape[:2]
+            self.writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+            if not self.writer.isOpened():
+                raise ValueError(f"Çıktı videosu oluşturulamadı: {self.output_path}")
+
+        self.writer.write(frame)
+        return NO_KEY
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+
+class NullSink(FrameSink):
+    """Kareleri yok sayan hedef (yalnızca sayar)"""
+
+
+class MemorySink(FrameSink):
+    """Kareleri bellekte tutan hedef. max_frames verilirse yalnızca son kareler saklanır."""
+
+    def __init__(self, max_frames=None):
+        super().__init__()
+        self.frames = deque(maxlen=max_frames)
+
+    def write(self, frame):
+        super().write(frame)
+        self.frames.append(frame.copy())
+        return NO_KEY
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import threading
+from time import monotonic
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+
+class ImageCatalog:
+    """
+    Resim klasörünün diske kaydedilen kataloğu.
+    Her dosya için boyut, değişiklik zamanı, içerik özeti (sha1), başlıktan okunan
+    genişlik/yükseklik ve son analiz durumu tutulur. Yenileme artımlıdır: yalnızca
+    boyutu veya değişiklik zamanı değişen dosyalar yeniden okunur.
+    Analiz durumu değişiklikleri en fazla save_interval saniyede bir diske yazılır; close() bekleyeni yazar.
+    """
+
+    version = 1
+
+    def __init__(self, images_dir, catalog_path=None, compute_hash=True, save_interval=2.0):
+        self.images_dir = images_dir
+        # Katalog resim klasörünün dışında tutulur; içeride olsaydı her yazma klasör zamanını değiştirirdi
+        self.catalog_path = catalog_path or os.path.join(
+            os.path.dirname(os.path.abspath(images_dir)), ".image_catalog.json")
+        self.compute_hash = compute_hash
+        self.save_interval = save_interval
+        self._last_save = None
+        self._save_timer = None
+        self.entries = {}
+        self.dir_mtime = None
+        self.dirty = False
+        self.lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """Kataloğu diskten yükler (yoksa veya bozuksa boş başlar)"""
+        if not os.path.exists(self.catalog_path):
+            return
+        try:
+            with open(self.catalog_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("surum") != self.version:
+                return
+            self.entries = data.get("dosyalar", {})
+            self.dir_mtime = data.get("klasor_zamani")
+        except Exception as e:
+            print(f"Katalog okuma hatası: {e}")
+            self.entries = {}
+            self.dir_mtime = None
+
+    def save(self, force=False):
+        """Değişiklik varsa kataloğu önce geçici dosyaya, sonra asıl yerine yazar"""
+        with self.lock:
+            if not self.dirty and not force:
+                return
+            data = {"surum": self.version, "klasor_zamani": self.dir_mtime, "dosyalar": self.entries}
+            temp_path = f"{self.catalog_path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(temp_path, self.catalog_path)
+                self.dirty = False
+                self._last_save = monotonic()
+            except Exception as e:
+                print(f"Katalog yazma hatası: {e}")
+
+    def save_later(self):
+        """
+        Kataloğu hemen ya da (son yazmadan bu yana save_interval geçmediyse) süre dolunca yazar.
+        Art arda gelen analiz işaretlemeleri tek yazmada toplanır.
+        """
+        with self.lock:
+            elapsed = None if self._last_save is None else monotonic() - self._last_save
+            if elapsed is None or elapsed >= self.save_interval:
+                self.save()
+                return
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_interval - elapsed, self._timed_save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _timed_save(self):
+        with self.lock:
+            self._save_timer = None
+            self.save()
+
+    def close(self):
+        """Bekleyen yazmayı iptal edip kataloğu hemen kaydeder"""
+        with self.lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self.save()
+
+    def file_hash(self, path, chunk_size=1 << 20):
+        """Dosya içeriğinin sha1 özeti"""
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def read_dimensions(self, path):
+        """Genişlik ve yüksekliği yalnızca dosya başlığından okur (görüntü çözülmez)"""
+        from PIL import Image
+        try:
+            with Image.open(path) as image:
+                return image.size
+        except Exception:
+            return None, None
+
+    def _describe(self, path, stat, previous=None):
+        """Dosya için katalog kaydı oluşturur; içerik değişmediyse analiz durumu korunur"""
+        width, height = self.read_dimensions(path)
+        entry = {
+            "boyut": stat.st_size,
+            "zaman": stat.st_mtime_ns,
+            "ozet": self.file_hash(path) if self.compute_hash else None,
+            "genislik": width,
+            "yukseklik": height,
+            "analiz": {},
+        }
+        if previous and entry["ozet"] is not None and previous.get("ozet") == entry["ozet"]:
+            entry["analiz"] = previous.get("analiz", {})
+        return entry
+
+    def _is_current(self, previous, stat):
+        return previous is not None and previous["boyut"] == stat.st_size and previous["zaman"] == stat.st_mtime_ns
+
+    def _stat_known(self, known):
+        """
+        Klasör listesi değişmediğinde yalnızca bilinen dosyaların stat bilgisine bakar:
+        yerinde üzerine yazılan dosya klasörün değişiklik zamanını değiştirmez.
+        (yeniden okunacak [(ad, yol, stat)], silinen adlar) döndürür.
+        """
+        stale, removed = [], []
+        for name, previous in known.items():
+            path = self.path(name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                removed.append(name)
+                continue
+            if not self._is_current(previous, stat):
+                stale.append((name, path, stat))
+        return stale, removed
+
+    def _scan_dir(self, known):
+        """Klasörü listeler; (yeniden okunacak [(ad, yol, stat)], silinen adlar) döndürür"""
+        stale, seen = [], set()
+        with os.scandir(self.images_dir) as it:
+            for item in it:
+                name = item.name
+                if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS or not item.is_file():
+                    continue
+                seen.add(name)
+                stat = item.stat()
+                if not self._is_current(known.get(name), stat):
+                    stale.append((name, item.path, stat))
+        return stale, [name for name in known if name not in seen]
+
+    def refresh(self, full=False):
+        """
+        Kataloğu klasörle eşitler. Klasörün değişiklik zamanı aynıysa (dosya eklenip silinmediyse)
+        klasör listelenmez, yalnızca bilinen dosyaların stat bilgisi kontrol edilir;
+        full=True her durumda klasörü baştan tarar.
+        Özet ve başlık okuma kilit dışında yapılır; sonuçlar kilit altında birleştirilir,
+        böylece tarama sürerken mark_analyzed/pending beklemez.
+        (eklenen, değişen, silinen) dosya adı listelerini döndürür.
+        """
+        try:
+            dir_mtime = os.stat(self.images_dir).st_mtime_ns
+        except OSError as e:
+            print(f"Resim listeleme hatası: {e}")
+            return [], [], []
+
+        with self.lock:
+            listed = full or dir_mtime != self.dir_mtime
+            known = dict(self.entries)
+
+        try:
+            stale, removed = self._scan_dir(known) if listed else self._stat_known(known)
+        except OSError as e:
+            print(f"Resim listeleme hatası: {e}")
+            return [], [], []
+
+        described = []
+        for name, path, stat in stale:
+            try:
+                described.append((name, self._describe(path, stat, known.get(name))))
+            except OSError as e:
+                print(f"Katalog güncelleme hatası ({name}): {e}")
+
+        added, changed, deleted = [], [], []
+        with self.lock:
+            # Tarama sırasında başka bir yenileme kaydı değiştirdiyse onun sonucu korunur
+            for name, entry in described:
+                previous = known.get(name)
+                if self.entries.get(name) is not previous:
+                    continue
+                self.entries[name] = entry
+                (changed if previous else added).append(name)
+            for name in removed:
+                if name in self.entries and self.entries[name] is known[name]:
+                    del self.entries[name]
+                    deleted.append(name)
+
+            if added or changed or deleted or (listed and dir_mtime != self.dir_mtime):
+                if listed:
+                    self.dir_mtime = dir_mtime
+                self.dirty = True
+                self.save()
+
+        return added, changed, deleted
+
+    def names(self):
+        """Katalogdaki resim adları (alfabetik)"""
+        with self.lock:
+            return sorted(self.entries)
+
+    def get(self, name):
+        with self.lock:
+            return self.entries.get(name)
+
+    def path(self, name):
+        return os.path.join(self.images_dir, name)
+
+    def mark_analyzed(self, name, kind, status, save=True):
+        """
+        Dosyanın son analiz durumunu kaydeder (kind: 'yuz' / 'vucut', status: ör. 'tamam', 'bulunamadi', 'hata').
+        save True ise yazma save_later ile toplanır; False ise çağıran save() ile yazar.
+        """
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                return
+            entry["analiz"][kind] = status
+            self.dirty = True
+            if save:
+                self.save_later()
+
+    def pending(self, kind):
+        """Verilen analiz türü henüz yapılmamış dosyalar (toplu işlem planlaması için)"""
+        with self.lock:
+            return sorted(name for name, entry in self.entries.items() if kind not in entry["analiz"])
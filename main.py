@@ -1,8 +1,9 @@
-from app import FaceAnalyzeApp
+from app import FaceAnalyzeApp, parse_args
 
 def main():
     """Ana uygulamayı başlatır"""
-    app = FaceAnalyzeApp()
+    args = parse_args()
+    app = FaceAnalyzeApp(dedupe_distance=args.dedupe_distance)
     app.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,237 @@
+import threading
+from collections import deque
+from time import time, sleep
+
+from capture_analyzer import CaptureAnalyzer
+from frame_io import CameraSource, WindowSink
+
+
+class RateMeter:
+    """Son olayların zaman damgalarından anlık hız (olay/saniye) hesaplar"""
+
+    def __init__(self, window=60):
+        self.timestamps = deque(maxlen=window)
+        self.count = 0
+
+    def tick(self, timestamp=None):
+        self.timestamps.append(time() if timestamp is None else timestamp)
+        self.count += 1
+
+    def rate(self):
+        if len(self.timestamps) < 2:
+            return 0.0
+        elapsed = self.timestamps[-1] - self.timestamps[0]
+        return (len(self.timestamps) - 1) / elapsed if elapsed > 0 else 0.0
+
+
+class StreamState:
+    """Tek bir kamera akışının kaynak, hedef, sonuç ve ölçüm bilgileri"""
+
+    def __init__(self, stream_id, source, sink, renderer):
+        self.stream_id = stream_id
+        self.source = source
+        self.sink = sink
+        # Yalnızca görselleştirme için (model yüklemez)
+        self.renderer = renderer
+
+        self.lock = threading.Lock()
+        self.pending_frame = None  # Analiz bekleyen en son kare
+        self.busy = False  # Bir işçi bu akışın karesini analiz ediyor mu
+        self.current_results = None
+        self.last_submit_time = None
+        self.latest_frame = None  # Gösterilecek en son görselleştirilmiş kare
+        self.finished = False
+
+        self.capture_rate = RateMeter()
+        self.analysis_rate = RateMeter()
+        self.dropped_frames = 0
+
+
+class MultiCaptureAnalyzer:
+    """
+    Birden fazla kamera akışını ortak, sabit boyutlu bir analiz işçi havuzu ile işler.
+    Her işçi kendi FaceMesh modelini yükler; akış sayısından bağımsız olarak yalnızca
+    num_workers adet model bellekte tutulur. İşçiler akışlar arasında sırayla (round-robin)
+    dolaşır ve her akış için yalnızca en son kare analiz edilir.
+    """
+
+    def __init__(self, face_analyzer, num_workers=2, analysis_interval=0.5):
+        self.face_analyzer = face_analyzer
+        self.num_workers = num_workers
+        self.analysis_interval = analysis_interval
+
+        self.streams = []
+        self.running = False
+
+        # Zamanlayıcı durumu
+        self._condition = threading.Condition()
+        self._next_stream = 0
+        self._threads = []
+
+    def add_stream(self, source, sink=None):
+        """
+        Yeni bir akış ekler. source bir kamera numarası veya frame_io kaynağı olabilir.
+        sink verilmezse akış için bir OpenCV penceresi kullanılır.
+        """
+        stream_id = len(self.streams)
+        if isinstance(source, int):
+            source = CameraSource(source)
+        if sink is None:
+            sink = WindowSink(f"Yüz Analizi - Kamera {stream_id}")
+
+        renderer = CaptureAnalyzer(face_analyzer=self.face_analyzer)
+        # Görselleştirilen kare ana thread'de gösterilirken üzerine yazılmaması için tampon paylaşma
+        renderer.reuse_buffers = False
+        stream = StreamState(stream_id, source, sink, renderer)
+        self.streams.append(stream)
+        return stream_id
+
+    def _submit(self, stream, frame, timestamp):
+        """Karenin analiz zamanı geldiyse akışın bekleyen karesini günceller"""
+        if stream.last_submit_time is not None and \
+                timestamp - stream.last_submit_time < self.analysis_interval:
+            return
+
+        with self._condition:
+            # Önceki kare henüz alınmadıysa en yenisiyle değiştir
+            if stream.pending_frame is not None:
+                stream.dropped_frames += 1
+            stream.pending_frame = frame
+            stream.last_submit_time = timestamp
+            self._condition.notify()
+
+    def _next_job(self):
+        """Bekleyen karesi olan bir sonraki akışı sırayla seçer (çağıran kilidi tutar)"""
+        count = len(self.streams)
+        for offset in range(count):
+            stream = self.streams[(self._next_stream + offset) % count]
+            if stream.pending_frame is not None and not stream.busy:
+                self._next_stream = (stream.stream_id + 1) % count
+                frame = stream.pending_frame
+                stream.pending_frame = None
+                stream.busy = True
+                return stream, frame
+        return None, None
+
+    def _worker(self):
+        """Analiz işçisi - kendi modeliyle akışlardan sırayla kare alır"""
+        analyzer = CaptureAnalyzer(face_analyzer=self.face_analyzer, static_image_mode=True)
+
+        while True:
+            with self._condition:
+                stream, frame = self._next_job()
+                while stream is None and self.running:
+                    self._condition.wait()
+                    stream, frame = self._next_job()
+                if stream is None:
+                    return
+
+            try:
+                analysis_result = analyzer.analyze_frame(frame)
+            except Exception as e:
+                print(f"Kamera {stream.stream_id} analiz hatası: {e}")
+                analysis_result = None
+
+            with stream.lock:
+                if analysis_result:
+                    stream.current_results = analysis_result
+                stream.analysis_rate.tick()
+
+            with self._condition:
+                stream.busy = False
+                self._condition.notify()
+
+    def _capture(self, stream):
+        """Bir akıştan kare okur, analize gönderir ve görselleştirir"""
+        try:
+            while self.running:
+                ret, frame = stream.source.read()
+                if not ret:
+                    break
+
+                timestamp = stream.source.frame_time() if hasattr(stream.source, "frame_time") else time()
+                stream.capture_rate.tick()
+                self._submit(stream, frame, timestamp)
+
+                with stream.lock:
+                    current_results = stream.current_results
+                if current_results:
+                    frame = stream.renderer.visualize_frame(frame, current_results)
+
+                with stream.lock:
+                    stream.latest_frame = frame
+        finally:
+            stream.finished = True
+            stream.source.release()
+
+    def start(self):
+        """İşçi havuzunu ve akış okuma thread'lerini başlatır"""
+        self.running = True
+
+        for _ in range(self.num_workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        for stream in self.streams:
+            thread = threading.Thread(target=self._capture, args=(stream,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def run(self):
+        """
+        Akışları başlatır ve görselleştirilmiş kareleri hedeflere yazar.
+        Pencere işlemleri ana thread'de yapılır; 'q' tuşu veya tüm kaynakların bitmesi döngüyü sonlandırır.
+        """
+        self.start()
+
+        try:
+            while self.running:
+                written = 0
+                for stream in self.streams:
+                    with stream.lock:
+                        frame = stream.latest_frame
+                        stream.latest_frame = None
+                    if frame is None:
+                        continue
+                    written += 1
+                    if stream.sink.write(frame) == ord('q'):
+                        self.running = False
+                        break
+
+                # Yeni kare yoksa işlemciyi boşuna meşgul etme
+                if not written:
+                    sleep(0.001)
+
+                if all(stream.finished for stream in self.streams) and \
+                        all(stream.latest_frame is None for stream in self.streams):
+                    break
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Tüm thread'leri durdurur ve kaynak/hedefleri kapatır"""
+        self.running = False
+        with self._condition:
+            self._condition.notify_all()
+
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+        for stream in self.streams:
+            stream.source.release()
+            stream.sink.close()
+
+    def get_metrics(self):
+        """Akış başına kare/analiz hızlarını döndürür"""
+        return {
+            stream.stream_id: {
+                "kamera_fps": round(stream.capture_rate.rate(), 1),
+                "analiz_fps": round(stream.analysis_rate.rate(), 1),
+                "okunan_kare": stream.capture_rate.count,
+                "analiz_edilen_kare": stream.analysis_rate.count,
+                "atlanan_kare": stream.dropped_frames
+            }
+            for stream in self.streams
+        }
@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+from frame_io import decode_image
+from image_catalog import IMAGE_EXTENSIONS
+
+
+# Her karenin başlangıcı bu sınıra hizalanır
+ALIGNMENT = 64
+
+
+def pack_directory(images_dir, output_path, max_size=None):
+    """
+    Klasördeki resimleri bir kez çözüp RGB olarak tek bir dosyaya art arda yazar.
+    output_path + '.bin' ham kareleri, output_path + '.json' ad/konum/boyut dizinini içerir.
+    max_size verilirse uzun kenarı bu değerden büyük resimler küçültülür.
+    İki dosya da geçici adlara yazılıp yerlerine taşınır (önce dizin); dizin veri boyutunu da
+    tuttuğundan yarıda kalan bir çalışmanın eşleşmeyen dizin/veri çifti açılırken reddedilir.
+    Paketlenen resim sayısını döndürür.
+    """
+    names = sorted(name for name in os.listdir(images_dir)
+                   if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS)
+
+    entries = []
+    data_path = output_path + ".bin"
+    index_path = output_path + ".json"
+    temp_path = data_path + ".tmp"
+    temp_index_path = index_path + ".tmp"
+
+    try:
+        _write_frames(images_dir, names, temp_path, entries, max_size)
+        with open(temp_index_path, "w", encoding="utf-8") as f:
+            json.dump({"kanallar": "RGB", "max_boyut": max_size, "klasor": os.path.abspath(images_dir),
+                       "veri_boyutu": os.path.getsize(temp_path), "dosyalar": entries}, f, ensure_ascii=False)
+        os.replace(temp_index_path, index_path)
+        os.replace(temp_path, data_path)
+    finally:
+        for path in (temp_path, temp_index_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    return len(entries)
+
+
+def _write_frames(images_dir, names, data_path, entries, max_size):
+    """Resimleri çözüp hizalanmış RGB kareler olarak data_path'e yazar, dizin kayıtlarını entries'e ekler"""
+    offset = 0
+    with open(data_path, "wb") as f:
+        for name in names:
+            path = os.path.join(images_dir, name)
+            try:
+                image = decode_image(path)
+            except ValueError as e:
+                print(f"Paketleme hatası: {e}")
+                continue
+
+            h, w = image.shape[:2]
+            if max_size and max(h, w) > max_size:
+                scale = max_size / max(h, w)
+                image = cv2.resize(image, (max(1, round(w * scale)), max(1, round(h * scale))),
+                                   interpolation=cv2.INTER_AREA)
+                h, w = image.shape[:2]
+
+            rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+            padding = -offset % ALIGNMENT
+            if padding:
+                f.write(b"\0" * padding)
+                offset += padding
+
+            f.write(rgb.data)
+            stat = os.stat(path)
+            entries.append({
+                "ad": name,
+                "ofset": offset,
+                "yukseklik": h,
+                "genislik": w,
+                "kaynak_boyut": stat.st_size,
+                "kaynak_zaman": stat.st_mtime_ns,
+            })
+            offset += rgb.nbytes
+
+
+class PackedImageDataset:
+    """
+    pack_directory ile oluşturulan dosyayı bellek eşlemeli (mmap) açar.
+    Her eleman dosya üzerinde kopyasız, salt okunur bir (H, W, 3) RGB görünümdür;
+    tekrarlanan geçişlerde kod çözme ve renk dönüşümü yapılmaz, sayfaları işletim sistemi önbellekler.
+    """
+
+    def __init__(self, path):
+        with open(path + ".json", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("kanallar") != "RGB":
+            raise ValueError(f"Desteklenmeyen paket biçimi: {path}")
+
+        self.path = path
+        self.entries = index["dosyalar"]
+        self.max_size = index.get("max_boyut")
+        # Kaynak klasör (eski paketlerde yoksa paketin bulunduğu klasör kullanılır)
+        self.source_dir = index.get("klasor") or os.path.dirname(os.path.abspath(path))
+        # Dizin ile veri dosyası aynı paketlemeden değilse kareler yanlış ofsetlerden okunur
+        data_size = os.path.getsize(path + ".bin")
+        if index.get("veri_boyutu", data_size) != data_size:
+            raise ValueError(f"Paket dizini veri dosyasıyla eşleşmiyor (yarım kalmış paketleme?): {path}")
+        self.data = np.memmap(path + ".bin", dtype=np.uint8, mode="r") if self.entries else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def names(self):
+        return [entry["ad"] for entry in self.entries]
+
+    def source_path(self, name):
+        """Paketlenen resmin kaynak dosya yolu (veritabanında son sonucu ayırt etmek için)"""
+        return os.path.join(self.source_dir, name)
+
+    def __getitem__(self, i):
+        """i. resmin RGB görünümü (kopyalanmaz)"""
+        entry = self.entries[i]
+        h, w = entry["yukseklik"], entry["genislik"]
+        start = entry["ofset"]
+        return self.data[start:start + h * w * 3].reshape(h, w, 3)
+
+    def __iter__(self):
+        for i, entry in enumerate(self.entries):
+            yield entry["ad"], self[i]
+
+    def analyze_faces(self, face_analyzer):
+        """Her resim için (ad, sonuç) üretir; sonuç yüz bulunamazsa None'dır"""
+        for name, image_rgb in self:
+            yield name, face_analyzer.analyze_face_rgb(image_rgb)[0]
+
+    def analyze_bodies(self, body_analyzer):
+        """Her resim için (ad, sonuç) üretir; sonuç vücut bulunamazsa None'dır"""
+        for name, image_rgb in self:
+            yield name, body_analyzer.analyze_body_rgb(image_rgb)[0]
+
+    def close(self):
+        # np.memmap açık eşlemeyi referansı kalmayınca kapatır
+        self.data = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resim klasörünü bellek eşlemeli pakete dönüştürür ve analiz eder")
+    subparsers = parser.add_subparsers(dest="komut", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="Klasörü paketle")
+    pack_parser.add_argument("images_dir")
+    pack_parser.add_argument("output", help="Paket yolu (uzantısız)")
+    pack_parser.add_argument("--max-size", type=int, default=None, help="Uzun kenar için üst sınır (piksel)")
+
+    run_parser = subparsers.add_parser("run", help="Paketteki tüm resimleri analiz et")
+    run_parser.add_argument("pack", help="Paket yolu (uzantısız)")
+    run_parser.add_argument("--tur", choices=["yuz", "vucut"], default="yuz")
+    run_parser.add_argument("--db", help="Sonuçların toplu olarak ekleneceği SQLite veritabanı")
+    run_parser.add_argument("--renk-yontemi", choices=["ortalama", "dagilim"], default="ortalama",
+                            help="Ten/göz rengi: bölge ortalaması veya piksel dağılımındaki baskın renk")
+
+    args = parser.parse_args()
+
+    if args.komut == "pack":
+        start = perf_counter()
+        count = pack_directory(args.images_dir, args.output, args.max_size)
+        print(f"{count} resim paketlendi ({perf_counter() - start:.1f} sn): {args.output}.bin")
+    else:
+        dataset = PackedImageDataset(args.pack)
+        if args.tur == "yuz":
+            from face_analyzer import FaceAnalyzer
+            results = dataset.analyze_faces(FaceAnalyzer(color_table=True, color_method=args.renk_yontemi))
+        else:
+            from body_analyzer import BodyAnalyzer
+            results = dataset.analyze_bodies(BodyAnalyzer())
+
+        database = None
+        if args.db:
+            from results_db import ResultsDatabase
+            from analysis_results import compact_result
+            database = ResultsDatabase(args.db)
+
+        start = perf_counter()
+        found = 0
+        records = []
+        last = start
+        for name, result in results:
+            now = perf_counter()
+            found += result is not None
+            if database is not None:
+                # Yazılmayı bekleyen sonuçlar sıkı tiplerde tutulur
+                records.append((args.tur, dataset.source_path(name), compact_result(args.tur, result), None,
+                                (now - last) * 1000))
+                # Veritabanına 500'lük gruplar halinde, her grup tek işlemde yazılır
+                if len(records) >= 500:
+                    database.add_results(records)
+                    records = []
+            last = now
+        if database is not None:
+            database.add_results(records)
+            database.close()
+        elapsed = perf_counter() - start
+        print(f"{len(dataset)} resim analiz edildi, {found} sonuç bulundu "
+              f"({elapsed:.1f} sn, {len(dataset) / elapsed if elapsed else 0:.1f} resim/sn)")
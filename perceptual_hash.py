@@ -0,0 +1,149 @@
+import os
+
+import cv2
+import numpy as np
+
+
+def _load_small_gray(source):
+    """
+    Görüntüyü küçültülmüş gri tonlu olarak yükler.
+    JPEG dosyalarında IMREAD_REDUCED_GRAYSCALE_8 çözümü DCT aşamasında 1/8 ölçekte yapar (tam çözme yok).
+    """
+    flags = cv2.IMREAD_REDUCED_GRAYSCALE_8
+    if isinstance(source, (str, os.PathLike)):
+        image = cv2.imread(os.fspath(source), flags)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        image = cv2.imdecode(np.frombuffer(memoryview(source), dtype=np.uint8), flags)
+    else:
+        image = np.asarray(source)
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    if image is None:
+        raise ValueError("Görsel yüklenemedi")
+    return image
+
+
+def dhash(source, hash_size=8):
+    """
+    Fark tabanlı algısal özet (dHash): görüntü (hash_size+1) x hash_size griye küçültülür,
+    yan yana piksellerin parlaklık farkının işareti bitlere dönüşür. Yeniden kodlama,
+    ölçekleme ve küçük parlaklık değişimlerinde özet neredeyse aynı kalır.
+    """
+    gray = _load_small_gray(source)
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    """İki özet arasındaki farklı bit sayısı"""
+    return bin(a ^ b).count("1")
+
+
+def pixel_difference(a, b, size=64):
+    """
+    İki görüntünün küçültülmüş gri tonlu hallerinin ortalama mutlak farkı (0-255).
+    Algısal özet eşleşmesini doğrulamak için kullanılır: yeniden kodlanmış veya ölçeklenmiş
+    aynı fotoğrafta birkaç birim, benzer kadrajlı farklı fotoğraflarda belirgin biçimde yüksektir.
+    """
+    thumbs = [cv2.resize(_load_small_gray(source), (size, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+              for source in (a, b)]
+    return float(np.abs(thumbs[0] - thumbs[1]).mean())
+
+
+class BKTree:
+    """
+    Hamming mesafesine göre BK ağacı. Yakın özet aramasında üçgen eşitsizliği sayesinde
+    ağacın büyük kısmı atlanır; her özet için tüm kayıtlarla karşılaştırma yapılmaz.
+    Silinen kayıtlar geçersiz işaretlenir; geçersiz düğümler ağacın rebuild_ratio oranını
+    aşınca ağaç yalnızca geçerli kayıtlarla yeniden kurulur.
+    """
+
+    def __init__(self, rebuild_ratio=0.5):
+        self.root = None  # [özet, değer, {mesafe: alt düğüm}, geçerli]
+        self.size = 0
+        self.dead = 0  # Ağaçta kalan geçersiz düğüm sayısı
+        self.rebuild_ratio = rebuild_ratio
+
+    def __len__(self):
+        return self.size
+
+    def add(self, key, value):
+        node = [key, value, {}, True]
+        self.size += 1
+        if self.root is None:
+            self.root = node
+            return
+
+        current = self.root
+        while True:
+            distance = hamming(key, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def remove(self, key, value):
+        """
+        Kaydı siler (düğüm geçersiz işaretlenir; alt düğümlere yol bozulmaz).
+        Geçersiz düğümler çoğalınca ağaç yeniden kurulur. Kayıt bulunursa True döndürür.
+        """
+        current = self.root
+        while current is not None:
+            distance = hamming(key, current[0])
+            if distance == 0 and current[3] and current[1] == value:
+                current[3] = False
+                self.size -= 1
+                self.dead += 1
+                if self.dead > self.rebuild_ratio * (self.size + self.dead):
+                    self.rebuild()
+                return True
+            current = current[2].get(distance)
+        return False
+
+    def items(self):
+        """Geçerli kayıtları (özet, değer) olarak döndürür"""
+        items = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            key, value, children, alive = stack.pop()
+            if alive:
+                items.append((key, value))
+            stack.extend(children.values())
+        return items
+
+    def rebuild(self):
+        """Ağacı yalnızca geçerli kayıtlarla yeniden kurar (geçersiz düğümler atılır)"""
+        items = self.items()
+        self.root = None
+        self.size = 0
+        self.dead = 0
+        for key, value in items:
+            self.add(key, value)
+
+    def search(self, key, max_distance):
+        """max_distance içindeki kayıtları [(mesafe, özet, değer), ...] olarak, en yakından döndürür"""
+        if self.root is None:
+            return []
+
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_key, value, children, alive = stack.pop()
+            distance = hamming(key, node_key)
+            if alive and distance <= max_distance:
+                matches.append((distance, node_key, value))
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def nearest(self, key, max_distance):
+        """En yakın kaydı (mesafe, özet, değer) döndürür; yoksa None"""
+        matches = self.search(key, max_distance)
+        return matches[0] if matches else None
@@ -0,0 +1,148 @@
+from time import time
+
+from frame_io import NO_KEY
+
+
+class FrameContext:
+    """Bir karenin pipeline aşamaları boyunca taşıdığı bilgiler"""
+
+    def __init__(self, frame, frame_index, timestamp):
+        self.frame = frame  # Kaynaktan gelen ham kare
+        self.frame_index = frame_index
+        self.timestamp = timestamp
+        self.analyzed = False  # Bu karede analiz yapıldı mı
+        self.result = None  # Kare için geçerli (yeni veya önceki) analiz sonucu
+        self.viz_frame = frame  # Hedefe yazılacak kare
+        self.key = NO_KEY  # Hedeften dönen tuş
+
+
+class AnalysisPipeline:
+    """
+    Canlı ve çevrimdışı analiz için tek akış: kaynak -> ön işleme -> analiz -> görselleştirme -> hedef.
+    Her aşamadan sonra o aşamaya eklenen kancalar (hook) FrameContext ile çağrılır.
+
+    Analiz zamanlaması ya süreye (analysis_interval, kaynağın kare zamanına göre)
+    ya da kare sayısına (analyze_every) göre yapılır. analyze=False ise analiz hiç yapılmaz.
+    reuse_buffers açıksa görselleştirilmiş kare analizcinin tekrar kullanılan tamponudur ve
+    bir sonraki karede üzerine yazılır.
+    """
+
+    stages = ("preprocess", "analyze", "visualize", "sink")
+
+    def __init__(self, analyzer, source=None, sink=None, analysis_interval=None, analyze_every=None,
+                 analyze=True, keep_last_result=True, use_frame_buffer=True, reuse_buffers=True):
+        self.analyzer = analyzer
+        self.source = source
+        self.sink = sink
+        self.analysis_interval = analysis_interval if analysis_interval is not None else analyzer.analysis_interval
+        self.analyze_every = analyze_every
+        self.analyze = analyze
+        self.keep_last_result = keep_last_result
+        self.use_frame_buffer = use_frame_buffer
+        self.reuse_buffers = reuse_buffers
+
+        self.hooks = {stage: [] for stage in self.stages}
+        self.running = False
+        self.frame_index = 0
+        self.last_analysis_time = None
+
+    def add_hook(self, stage, hook):
+        """Aşama sonrası çağrılacak hook(context) fonksiyonunu ekler"""
+        if stage not in self.hooks:
+            raise ValueError(f"Bilinmeyen pipeline aşaması: {stage}")
+        self.hooks[stage].append(hook)
+        return hook
+
+    def _run_hooks(self, stage, context):
+        for hook in self.hooks[stage]:
+            hook(context)
+
+    def _now(self):
+        """Kaynağın kare zamanı (yoksa duvar saati)"""
+        if self.source is not None and hasattr(self.source, "frame_time"):
+            return self.source.frame_time()
+        return time()
+
+    def _should_analyze(self, context):
+        if not self.analyze:
+            return False
+        if self.analyze_every is not None:
+            return context.frame_index % self.analyze_every == 0
+        return self.last_analysis_time is None or \
+            context.timestamp - self.last_analysis_time >= self.analysis_interval
+
+    def process_frame(self, frame, timestamp=None, force_analysis=False, face_landmarks=None):
+        """
+        Tek bir kareyi ön işleme, analiz ve görselleştirme aşamalarından geçirir.
+        force_analysis açıksa analiz zamanlamasına bakılmaz ve yalnızca bu karenin sonucu kullanılır.
+        """
+        context = FrameContext(frame, self.frame_index, self._now() if timestamp is None else timestamp)
+        self.frame_index += 1
+
+        # Ön işleme - anlık görüntü seçimi için kareyi tampona ekle
+        if self.use_frame_buffer:
+            self.analyzer.frame_buffer.push(frame, context.timestamp)
+        self._run_hooks("preprocess", context)
+
+        # Analiz
+        if force_analysis or self._should_analyze(context):
+            analysis_result = self.analyzer.analyze_frame(context.frame, face_landmarks)
+            context.analyzed = True
+            self.last_analysis_time = context.timestamp
+
+            if analysis_result and self.use_frame_buffer:
+                self.analyzer.frame_buffer.attach_landmarks(analysis_result["landmarks"])
+            if analysis_result or not self.keep_last_result or force_analysis:
+                self.analyzer.current_results = analysis_result
+
+        context.result = self.analyzer.current_results if self.analyze or force_analysis else None
+        self._run_hooks("analyze", context)
+
+        # Görselleştirme
+        if context.result:
+            context.viz_frame = self.analyzer.visualize_frame(context.frame, context.result,
+                                                              reuse_buffer=self.reuse_buffers)
+        self._run_hooks("visualize", context)
+
+        return context
+
+    def frames(self, max_frames=None):
+        """Kaynaktaki kareleri işler, hedefe yazar ve her kare için FrameContext üretir"""
+        self.running = True
+        self.frame_index = 0
+        self.last_analysis_time = None
+
+        while self.running and (max_frames is None or self.frame_index < max_frames):
+            ret, frame = self.source.read()
+            if not ret:
+                break
+
+            context = self.process_frame(frame)
+
+            if self.sink is not None:
+                context.key = self.sink.write(context.viz_frame)
+            self._run_hooks("sink", context)
+
+            yield context
+
+        self.running = False
+
+    def run(self, max_frames=None, on_key=None):
+        """
+        Pipeline'ı kaynak bitene, 'q' tuşuna basılana veya on_key(context) False döndürene kadar çalıştırır.
+        İşlenen kare sayısını döndürür.
+        """
+        count = 0
+        for context in self.frames(max_frames):
+            count += 1
+            if on_key is not None:
+                if on_key(context) is False:
+                    break
+            elif context.key == ord('q'):
+                break
+
+        self.running = False
+        return count
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,279 @@
+import argparse
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS yuz_sonuclari (
+    id INTEGER PRIMARY KEY,
+    kaynak TEXT NOT NULL,
+    kaynak_yolu TEXT,
+    kaynak_ozet TEXT,
+    ten_rengi TEXT,
+    ten_r INTEGER, ten_g INTEGER, ten_b INTEGER,
+    ten_hex TEXT,
+    goz_rengi TEXT,
+    goz_r INTEGER, goz_g INTEGER, goz_b INTEGER,
+    goz_hex TEXT,
+    yuz_sekli TEXT,
+    yuz_orani REAL,
+    sure_ms REAL,
+    zaman TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_yuz_ten_rengi ON yuz_sonuclari (ten_rengi);
+CREATE INDEX IF NOT EXISTS ix_yuz_goz_rengi ON yuz_sonuclari (goz_rengi);
+CREATE INDEX IF NOT EXISTS ix_yuz_yuz_sekli ON yuz_sonuclari (yuz_sekli);
+CREATE INDEX IF NOT EXISTS ix_yuz_kaynak_ozet ON yuz_sonuclari (kaynak_ozet);
+CREATE INDEX IF NOT EXISTS ix_yuz_kaynak ON yuz_sonuclari (kaynak);
+
+CREATE TABLE IF NOT EXISTS vucut_sonuclari (
+    id INTEGER PRIMARY KEY,
+    kaynak TEXT NOT NULL,
+    kaynak_yolu TEXT,
+    kaynak_ozet TEXT,
+    vucut_tipi TEXT,
+    aciklama TEXT,
+    omuz_kalca_orani REAL,
+    bel_kalca_orani REAL,
+    boy_genislik_orani REAL,
+    sure_ms REAL,
+    zaman TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_vucut_vucut_tipi ON vucut_sonuclari (vucut_tipi);
+CREATE INDEX IF NOT EXISTS ix_vucut_kaynak_ozet ON vucut_sonuclari (kaynak_ozet);
+CREATE INDEX IF NOT EXISTS ix_vucut_kaynak ON vucut_sonuclari (kaynak);
+"""
+
+# Her kaynağın son analizi: aynı adlı farklı dosyalar tam yollarıyla ayrılır
+# (kaynak_yolu sütunundan önceki kayıtlarda yalnızca dosya adı vardır)
+LATEST_IDS = "SELECT MAX(id) FROM {table} GROUP BY COALESCE(kaynak_yolu, kaynak)"
+
+# Analiz türüne göre tablo ve sorgulanabilir etiket sütunları
+TABLES = {
+    "yuz": ("yuz_sonuclari", ("ten_rengi", "goz_rengi", "yuz_sekli", "kaynak_ozet")),
+    "vucut": ("vucut_sonuclari", ("vucut_tipi", "kaynak_ozet")),
+}
+
+
+def _source_columns(source):
+    """Kaynak yolundan (dosya adı, tam yol) sütun değerleri"""
+    return os.path.basename(source), os.path.abspath(source)
+
+
+def face_row(source, result, source_hash=None, duration_ms=None, timestamp=None):
+    """analyze_face sonucunu (sözlük veya FaceResult) tablo satırına çevirir (source: dosya yolu)"""
+    if hasattr(result, "to_dict"):
+        result = result.to_dict()
+    skin, eye, shape = result["ten_rengi"], result["goz_rengi"], result["yuz_sekli"]
+    # NumPy skalerleri SQLite'a bağlanamaz, Python tiplerine çevir
+    return (*_source_columns(source), source_hash,
+            skin["tahmini_renk"], *(int(v) for v in skin["rgb"]), skin["hex"],
+            eye["tahmini_renk"], *(int(v) for v in eye["rgb"]), eye["hex"],
+            shape["sekil"], float(shape["oran"]),
+            duration_ms, timestamp or datetime.now().isoformat(timespec="seconds"))
+
+
+def body_row(source, result, source_hash=None, duration_ms=None, timestamp=None):
+    """analyze_body sonucunu (sözlük veya BodyResult) tablo satırına çevirir (source: dosya yolu)"""
+    if hasattr(result, "to_dict"):
+        result = result.to_dict()
+    ratios = result["oranlar"]
+    return (*_source_columns(source), source_hash, result["vucut_tipi"], result["aciklama"],
+            float(ratios["omuz_kalca_orani"]), float(ratios["bel_kalca_orani"]),
+            float(ratios["boy_genislik_orani"]),
+            duration_ms, timestamp or datetime.now().isoformat(timespec="seconds"))
+
+
+class ResultsDatabase:
+    """
+    Yüz ve vücut analiz sonuçlarını SQLite veritabanında saklar.
+    Etiket sütunları indekslidir; toplu eklemeler tek bir işlem (transaction) içinde yapılır.
+    Bağlantı thread'ler arasında paylaşılır, erişim bir kilitle sıraya konur.
+    """
+
+    FACE_INSERT = ("INSERT INTO yuz_sonuclari (kaynak, kaynak_yolu, kaynak_ozet, ten_rengi, ten_r, ten_g, ten_b, "
+                   "ten_hex, goz_rengi, goz_r, goz_g, goz_b, goz_hex, yuz_sekli, yuz_orani, sure_ms, zaman) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    BODY_INSERT = ("INSERT INTO vucut_sonuclari (kaynak, kaynak_yolu, kaynak_ozet, vucut_tipi, aciklama, "
+                   "omuz_kalca_orani, bel_kalca_orani, boy_genislik_orani, sure_ms, zaman) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # WAL: okuyucular (ör. sorgu komutu) yazma sırasında beklemez
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Eski veritabanlarına kaynak_yolu sütununu ve indeksini ekler"""
+        with self.connection:
+            for table, _ in TABLES.values():
+                columns = {row["name"] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+                if "kaynak_yolu" not in columns:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN kaynak_yolu TEXT")
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_kaynak_yolu ON {table} (kaynak_yolu)")
+
+    def add_face_result(self, source, result, source_hash=None, duration_ms=None):
+        self.add_results([("yuz", source, result, source_hash, duration_ms)])
+
+    def add_body_result(self, source, result, source_hash=None, duration_ms=None):
+        self.add_results([("vucut", source, result, source_hash, duration_ms)])
+
+    def add_results(self, records):
+        """
+        (tür, kaynak yolu, sonuç, kaynak_ozet, sure_ms) kayıtlarını tek işlemde ekler.
+        Kaynak olarak dosya yolu verilmelidir: son sonuç tam yola göre seçilir, kaynak sütununda dosya adı tutulur.
+        Sonucu None olan kayıtlar (yüz/vücut bulunamadı) atlanır. Eklenen satır sayısını döndürür.
+        """
+        face_rows, body_rows = [], []
+        for kind, source, result, source_hash, duration_ms in records:
+            if not result:
+                continue
+            if kind == "yuz":
+                face_rows.append(face_row(source, result, source_hash, duration_ms))
+            else:
+                body_rows.append(body_row(source, result, source_hash, duration_ms))
+
+        if not face_rows and not body_rows:
+            return 0
+
+        with self.lock, self.connection:
+            if face_rows:
+                self.connection.executemany(self.FACE_INSERT, face_rows)
+            if body_rows:
+                self.connection.executemany(self.BODY_INSERT, body_rows)
+        return len(face_rows) + len(body_rows)
+
+    def query(self, kind="yuz", latest_only=True, limit=None, **filters):
+        """
+        Etiket sütunlarına göre sonuçları döndürür, ör. query("yuz", goz_rengi="mavi", yuz_sekli="oval").
+        latest_only True ise her kaynak dosyası (tam yol) için yalnızca en son analiz döner.
+        """
+        if kind not in TABLES:
+            raise ValueError(f"Bilinmeyen analiz türü: {kind}")
+        table, columns = TABLES[kind]
+
+        conditions, params = [], []
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if column not in columns:
+                raise ValueError(f"Sorgulanamayan sütun: {column}")
+            conditions.append(f"{column} = ?")
+            params.append(value)
+
+        if latest_only:
+            conditions.append(f"id IN ({LATEST_IDS.format(table=table)})")
+
+        sql = f"SELECT * FROM {table}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY kaynak"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self.lock:
+            return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def label_counts(self, kind, column):
+        """Bir etiket sütunundaki değerlerin sayıları (her kaynağın son analizi)"""
+        table, columns = TABLES[kind]
+        if column not in columns:
+            raise ValueError(f"Sorgulanamayan sütun: {column}")
+        sql = (f"SELECT {column} AS deger, COUNT(*) AS sayi FROM {table} "
+               f"WHERE id IN ({LATEST_IDS.format(table=table)}) "
+               f"GROUP BY {column} ORDER BY sayi DESC")
+        with self.lock:
+            return [(row["deger"], row["sayi"]) for row in self.connection.execute(sql)]
+
+    def load_columns(self, kind, columns=None):
+        """
+        Her kaynağın son analizini sütun bazında NumPy dizileri olarak döndürür ({sütun: dizi}).
+        Metin sütunları str, sayısal sütunlar float64 dizidir (eksik değerler NaN).
+        """
+        if kind not in TABLES:
+            raise ValueError(f"Bilinmeyen analiz türü: {kind}")
+        table, _ = TABLES[kind]
+
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT * FROM {table} WHERE id IN ({LATEST_IDS.format(table=table)}) ORDER BY id")
+            names = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+
+        selected = columns or names
+        data = {}
+        for column in selected:
+            i = names.index(column)
+            values = [row[i] for row in rows]
+            if any(isinstance(value, str) for value in values):
+                data[column] = np.array(["" if value is None else value for value in values], dtype=str)
+            else:
+                data[column] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        return data
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def default_database_path():
+    """Varsayılan veritabanı: proje dizinindeki results/analiz.db"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "analiz.db")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analiz sonuçları veritabanını sorgular")
+    parser.add_argument("--db", default=default_database_path(), help="Veritabanı dosyası")
+    subparsers = parser.add_subparsers(dest="komut", required=True)
+
+    face_parser = subparsers.add_parser("yuz", help="Yüz analizi sonuçlarını listele")
+    face_parser.add_argument("--ten", dest="ten_rengi")
+    face_parser.add_argument("--goz", dest="goz_rengi")
+    face_parser.add_argument("--sekil", dest="yuz_sekli")
+    face_parser.add_argument("--limit", type=int)
+
+    body_parser = subparsers.add_parser("vucut", help="Vücut analizi sonuçlarını listele")
+    body_parser.add_argument("--tip", dest="vucut_tipi")
+    body_parser.add_argument("--limit", type=int)
+
+    subparsers.add_parser("ozet", help="Etiket dağılımlarını göster")
+
+    args = parser.parse_args()
+    database = ResultsDatabase(args.db)
+
+    if args.komut == "yuz":
+        rows = database.query("yuz", ten_rengi=args.ten_rengi, goz_rengi=args.goz_rengi,
+                              yuz_sekli=args.yuz_sekli, limit=args.limit)
+        for row in rows:
+            print(f"{row['kaynak']}: ten {row['ten_rengi']} ({row['ten_hex']}), "
+                  f"göz {row['goz_rengi']} ({row['goz_hex']}), yüz {row['yuz_sekli']} ({row['yuz_orani']})")
+        print(f"{len(rows)} sonuç")
+    elif args.komut == "vucut":
+        rows = database.query("vucut", vucut_tipi=args.vucut_tipi, limit=args.limit)
+        for row in rows:
+            print(f"{row['kaynak']}: {row['vucut_tipi']} (omuz/kalça {row['omuz_kalca_orani']}, "
+                  f"bel/kalça {row['bel_kalca_orani']}, boy/genişlik {row['boy_genislik_orani']})")
+        print(f"{len(rows)} sonuç")
+    else:
+        for kind, column in (("yuz", "ten_rengi"), ("yuz", "goz_rengi"), ("yuz", "yuz_sekli"),
+                             ("vucut", "vucut_tipi")):
+            print(f"\n{column}:")
+            for value, count in database.label_counts(kind, column):
+                print(f"  {value}: {count}")
+
+    database.close()
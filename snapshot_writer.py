@@ -0,0 +1,133 @@
+import atexit
+import collections
+import json
+import os
+import queue
+import threading
+import weakref
+
+import cv2
+
+
+# Açık yazıcılar; program kapanırken hepsi tek bir atexit kaydıyla kapatılır
+_writers = weakref.WeakSet()
+
+
+def _close_all():
+    for writer in list(_writers):
+        writer.close()
+
+
+atexit.register(_close_all)
+
+
+class SnapshotWriter:
+    """
+    Anlık görüntüleri (ve analiz JSON'larını) arka planda kodlayıp diske yazan sınıf.
+    Kuyruk sınırlıdır; doluysa yeni istekler reddedilir, böylece görüntü döngüsü hiç beklemez.
+    Tamamlanan işler on_done(path, error) ile ve poll() üzerinden bildirilir; poll() çağrılmazsa
+    yalnızca son max_completed sonuç tutulur (bellek sınırsız büyümez).
+    """
+
+    def __init__(self, max_queue=8, jpeg_quality=95, max_completed=32):
+        self.jpeg_quality = jpeg_quality
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.completed = collections.deque(maxlen=max_completed)
+        self.thread = None
+        self.lock = threading.Lock()
+
+        # Program kapanırken bekleyen yazmalar tamamlanır (bkz. _close_all)
+        _writers.add(self)
+
+    def _ensure_started(self):
+        """Yazıcı thread'ini ilk kullanımda başlatır"""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def submit(self, output_path, frame, analysis_result=None, json_path=None, on_done=None, copy=True):
+        """
+        Kareyi yazma kuyruğuna ekler. Kuyruk doluysa False döndürür.
+        analysis_result verilirse json_path'e (varsayılan: aynı ad .json) yazılır.
+        """
+        if frame is None:
+            return False
+
+        if analysis_result is not None and json_path is None:
+            json_path = os.path.splitext(output_path)[0] + ".json"
+
+        job = (output_path, frame.copy() if copy else frame, analysis_result, json_path, on_done)
+
+        self._ensure_started()
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            print(f"Anlık görüntü kuyruğu dolu, atlandı: {output_path}")
+            return False
+
+        return True
+
+    def _run(self):
+        """Kuyruktaki işleri sırayla kodlar ve yazar"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+
+            output_path, frame, analysis_result, json_path, on_done = job
+            error = None
+            try:
+                self._write(output_path, frame, analysis_result, json_path)
+            except Exception as e:
+                error = e
+
+            self.completed.append((output_path, error))
+            if on_done is not None:
+                try:
+                    on_done(output_path, error)
+                except Exception as e:
+                    print(f"Anlık görüntü geri çağırma hatası: {e}")
+
+            self.jobs.task_done()
+
+    def _write(self, output_path, frame, analysis_result, json_path):
+        """Kareyi kodlar ve dosyaya yazar"""
+        ext = os.path.splitext(output_path)[1].lower() or ".jpg"
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality] if ext in (".jpg", ".jpeg") else []
+
+        ok, encoded = cv2.imencode(ext, frame, params)
+        if not ok:
+            raise ValueError(f"Görüntü kodlanamadı: {output_path}")
+
+        with open(output_path, "wb") as f:
+            f.write(encoded.tobytes())
+
+        if analysis_result is not None:
+            # Landmark ve bölge çokgeni gibi JSON'a yazılamayan alanları atla
+            record = {key: value for key, value in analysis_result.items()
+                      if key not in ("landmarks", "polygons", "masks")}
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
+
+    def poll(self):
+        """Tamamlanan işleri [(path, error), ...] olarak döndürür (beklemez)"""
+        done = []
+        while True:
+            try:
+                done.append(self.completed.popleft())
+            except IndexError:
+                return done
+
+    def flush(self):
+        """Kuyruktaki tüm işler bitene kadar bekler"""
+        if self.thread is not None and self.thread.is_alive():
+            self.jobs.join()
+
+    def close(self):
+        """Bekleyen işleri tamamlar ve yazıcı thread'ini durdurur"""
+        if self.thread is not None and self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
+        self.thread = None
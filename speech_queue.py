@@ -0,0 +1,117 @@
+import heapq
+import itertools
+import threading
+from time import time
+
+
+# Öncelik seviyeleri (küçük değer önce seslendirilir)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class SpeechMessage:
+    """Seslendirme kuyruğundaki tek bir mesaj"""
+
+    def __init__(self, text, lang="tr", priority=PRIORITY_NORMAL, category=None, max_age=None):
+        self.text = text
+        self.lang = lang
+        self.priority = priority
+        self.category = category
+        self.max_age = max_age  # Bu süreden (saniye) eski mesajlar seslendirilmez
+        self.created = time()
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def is_stale(self):
+        return self.max_age is not None and time() - self.created > self.max_age
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class SpeechQueue:
+    """
+    Öncelikli, iptal edilebilir seslendirme kuyruğu.
+    Mesajlar arka plandaki tek bir thread'de sırayla çalınır; böylece analiz ve seslendirme örtüşür.
+    Aynı kategoride yeni mesaj gelince bekleyen eski mesajlar iptal edilir (replace=True).
+    """
+
+    def __init__(self, play_fn):
+        self.play_fn = play_fn
+        self.heap = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.current = None
+        self.thread = None
+        self.running = True
+
+    def _ensure_started(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def put(self, message, replace=True):
+        """Mesajı kuyruğa ekler; replace açıksa aynı kategorideki bekleyen mesajları iptal eder"""
+        with self.condition:
+            if replace and message.category is not None:
+                self._cancel_pending(message.category)
+            heapq.heappush(self.heap, (message.priority, next(self.counter), message))
+            self._ensure_started()
+            self.condition.notify_all()
+        return message
+
+    def _cancel_pending(self, category=None):
+        """Bekleyen mesajları iptal eder (çağıran kilidi tutar)"""
+        remaining = []
+        for entry in self.heap:
+            message = entry[2]
+            if category is None or message.category == category:
+                message.cancelled = True
+                message.done.set()
+            else:
+                remaining.append(entry)
+        heapq.heapify(remaining)
+        self.heap = remaining
+
+    def cancel(self, category=None):
+        """Bekleyen (henüz çalınmaya başlamamış) mesajları iptal eder"""
+        with self.condition:
+            self._cancel_pending(category)
+            self.condition.notify_all()
+
+    def is_idle(self):
+        with self.condition:
+            return not self.heap and self.current is None
+
+    def wait_until_idle(self, timeout=None):
+        """Kuyruk boşalıp çalan mesaj bitene kadar bekler"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.heap and self.current is None, timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.heap or not self.running)
+                if not self.running:
+                    return
+                _, _, message = heapq.heappop(self.heap)
+                self.current = message
+
+            try:
+                if not message.cancelled and not message.is_stale():
+                    self.play_fn(message.text, message.lang)
+            except Exception as e:
+                print(f"Seslendirme hatası: {e}")
+            finally:
+                message.done.set()
+                with self.condition:
+                    self.current = None
+                    self.condition.notify_all()
+
+    def close(self):
+        """Bekleyen mesajları iptal eder ve thread'i durdurur"""
+        with self.condition:
+            self._cancel_pending()
+            self.running = False
+            self.condition.notify_all()
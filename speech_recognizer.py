@@ -0,0 +1,112 @@
+import json
+import os
+
+import speech_recognition as sr
+
+
+class RecognizerBackend:
+    """
+    Konuşma tanıma arka ucu temel sınıfı.
+    needs_audio False ise mikrofon hiç açılmaz (ör. dosya tabanlı test arka ucu).
+    """
+
+    name = "base"
+    needs_audio = True
+
+    def recognize(self, audio, language="tr-TR", grammar=None):
+        """Ses verisini metne çevirir. Anlaşılamazsa None döndürür."""
+        raise NotImplementedError
+
+
+class GoogleRecognizerBackend(RecognizerBackend):
+    """Google Web Speech API (ağ bağlantısı gerektirir, dilbilgisi kısıtlaması desteklemez)"""
+
+    name = "google"
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, language="tr-TR", grammar=None):
+        try:
+            return self.recognizer.recognize_google(audio, language=language)
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError:
+            print("Google servisi bağlantı hatası")
+            return None
+
+
+class VoskRecognizerBackend(RecognizerBackend):
+    """
+    Vosk ile yerel/çevrimdışı tanıma. grammar verilirse yalnızca bu kelimeler tanınır;
+    küçük komut kümeleri için hem daha hızlı hem daha güvenilirdir.
+    """
+
+    name = "vosk"
+    sample_rate = 16000
+
+    def __init__(self, model_path):
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+
+        if not os.path.exists(model_path):
+            raise ValueError(f"Vosk modeli bulunamadı: {model_path}")
+
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+        self.recognizer_class = KaldiRecognizer
+
+    def recognize(self, audio, language="tr-TR", grammar=None):
+        if grammar:
+            # Dilbilgisi dışı sesler [unk] olarak işaretlenir
+            recognizer = self.recognizer_class(self.model, self.sample_rate,
+                                               json.dumps(list(grammar) + ["[unk]"], ensure_ascii=False))
+        else:
+            recognizer = self.recognizer_class(self.model, self.sample_rate)
+
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "")
+        text = " ".join(word for word in text.split() if word != "[unk]")
+        return text or None
+
+
+class ScriptedRecognizerBackend(RecognizerBackend):
+    """
+    Test için dosya tabanlı yer tutucu: her çağrıda komut dosyasındaki sıradaki satırı döndürür.
+    Mikrofon kullanılmaz. Boş satır 'anlaşılamadı' (None) anlamına gelir.
+    """
+
+    name = "scripted"
+    needs_audio = False
+
+    def __init__(self, script_path=None, lines=None):
+        if lines is None:
+            with open(script_path, encoding="utf-8") as f:
+                lines = [line.rstrip("\n") for line in f]
+        self.lines = list(lines)
+        self.position = 0
+
+    def recognize(self, audio=None, language="tr-TR", grammar=None):
+        if self.position >= len(self.lines):
+            return None
+        line = self.lines[self.position].strip()
+        self.position += 1
+        return line or None
+
+
+def create_recognizer_backend(recognizer):
+    """
+    Ortam değişkenlerine göre arka uç seçer:
+    HUMANALYZER_SPEECH_SCRIPT -> dosya tabanlı, HUMANALYZER_VOSK_MODEL -> yerel Vosk, aksi halde Google.
+    """
+    script_path = os.environ.get("HUMANALYZER_SPEECH_SCRIPT")
+    if script_path:
+        return ScriptedRecognizerBackend(script_path)
+
+    model_path = os.environ.get("HUMANALYZER_VOSK_MODEL")
+    if model_path:
+        try:
+            return VoskRecognizerBackend(model_path)
+        except Exception as e:
+            print(f"Yerel konuşma tanıma başlatılamadı ({e}), Google kullanılacak")
+
+    return GoogleRecognizerBackend(recognizer)
@@ -0,0 +1,128 @@
+"""
+Soğuk başlangıç ölçümü.
+
+Her ölçüm yeni bir Python sürecinde yapılır:
+- 'python -X importtime -c "import app"' çıktısından modül başına içe aktarma süreleri,
+- 'FaceAnalyzeApp()' oluşturulana kadar geçen toplam süre.
+
+Süreler BUDGET_MS bütçesini aşarsa veya DEFERRED_MODULES içindeki ağır/isteğe bağlı modüllerden
+biri başlangıçta yüklenirse betik 1 koduyla çıkar.
+
+Kullanım: python startup_benchmark.py [--tekrar 5] [--ilk 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+# Hedef süreler (milisaniye, tekrarların en iyisi)
+BUDGET_MS = {
+    "import_app": 1000,
+    "uygulama_baslatma": 1500,
+}
+
+# Başlangıçta yüklenmemesi gereken modüller (ilk kullanımda yüklenirler)
+DEFERRED_MODULES = ("mediapipe", "matplotlib", "PIL", "speech_recognition", "gtts", "playsound",
+                    "pyttsx3", "vosk")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STARTUP_SCRIPT = """
+import sys
+from time import perf_counter
+start = perf_counter()
+from app import FaceAnalyzeApp
+FaceAnalyzeApp()
+elapsed = (perf_counter() - start) * 1000
+print("sure:", elapsed)
+print("yuklenen:", ",".join(sorted(m for m in {modules!r} if m in sys.modules)))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime çıktısını {modül: (kendi_us, toplam_us)} sözlüğüne çevirir.
+    Ayrıca en üst düzey içe aktarmaların toplamını (mikrosaniye) döndürür.
+    """
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        modules[name] = (int(self_us), int(cumulative_us))
+        if depth == 1:
+            total += int(cumulative_us)
+    return modules, total
+
+
+def measure_imports(target="app"):
+    """Yeni süreçte 'import target' ölçümü"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                            cwd=BASE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"İçe aktarma başarısız: {result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def measure_startup():
+    """Yeni süreçte FaceAnalyzeApp oluşturma süresi (ms) ve yüklenen ertelenmiş modüller"""
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT.format(modules=DEFERRED_MODULES)],
+                            cwd=BASE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"Uygulama başlatılamadı: {result.stderr.strip().splitlines()[-1]}")
+    # Uygulamanın kendi çıktıları arasından etiketli satırları al
+    values = dict(line.split(":", 1) for line in result.stdout.splitlines()
+                  if line.startswith(("sure:", "yuklenen:")))
+    loaded = [name for name in values["yuklenen"].strip().split(",") if name]
+    return float(values["sure"]), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Humanalyzer soğuk başlangıç ölçümü")
+    parser.add_argument("--tekrar", type=int, default=5, help="Ölçüm tekrarı (en iyisi alınır)")
+    parser.add_argument("--ilk", type=int, default=15, help="Gösterilecek en yavaş modül sayısı")
+    args = parser.parse_args()
+
+    best_modules, best_import = None, None
+    best_startup, loaded = None, []
+    for _ in range(args.tekrar):
+        modules, total = measure_imports()
+        if best_import is None or total < best_import:
+            best_modules, best_import = modules, total
+        startup_ms, loaded_now = measure_startup()
+        loaded = sorted(set(loaded) | set(loaded_now))
+        best_startup = startup_ms if best_startup is None else min(best_startup, startup_ms)
+
+    import_ms = best_import / 1000
+    print(f"import app: {import_ms:.1f} ms (bütçe {BUDGET_MS['import_app']} ms)")
+    print(f"FaceAnalyzeApp(): {best_startup:.1f} ms (bütçe {BUDGET_MS['uygulama_baslatma']} ms)")
+
+    print(f"\nEn yavaş {args.ilk} modül (toplam süre):")
+    slowest = sorted(best_modules.items(), key=lambda item: item[1][1], reverse=True)[:args.ilk]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (kendi {self_us / 1000:6.1f} ms)  {name}")
+
+    failures = []
+    if import_ms > BUDGET_MS["import_app"]:
+        failures.append(f"import app bütçeyi aştı: {import_ms:.1f} ms")
+    if best_startup > BUDGET_MS["uygulama_baslatma"]:
+        failures.append(f"uygulama başlatma bütçeyi aştı: {best_startup:.1f} ms")
+    eager = sorted(set(loaded) | {name for name in best_modules if name.split(".")[0] in DEFERRED_MODULES})
+    eager = sorted({name.split(".")[0] for name in eager})
+    if eager:
+        failures.append(f"başlangıçta yüklenmemesi gereken modüller yüklendi: {', '.join(eager)}")
+
+    if failures:
+        print("\nBAŞARISIZ:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nBütçe içinde.")
+
+
+if __name__ == "__main__":
+    main()
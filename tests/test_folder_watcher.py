@@ -0,0 +1,82 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import folder_watcher  # noqa: E402
+from folder_watcher import FolderWatcher  # noqa: E402
+
+
+class CountingFaceAnalyzer:
+    """Model yüklemeden sabit sonuç döndüren, çağrı sayısını tutan yüz analizcisi"""
+
+    calls = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def analyze_face(self, image_path):
+        CountingFaceAnalyzer.calls.append(os.path.basename(image_path))
+        image = cv2.imread(image_path)
+        result = {
+            "ten_rengi": {"rgb": [200, 160, 130], "hex": "#c8a082", "tahmini_renk": "orta"},
+            "goz_rengi": {"rgb": [90, 60, 40], "hex": "#5a3c28", "tahmini_renk": "kahverengi"},
+            "yuz_sekli": {"sekil": "oval", "oran": 0.8},
+        }
+        return result, image, None, None, None
+
+    def visualize_results(self, image, skin_mask, right_eye_mask, left_eye_mask, result):
+        return image
+
+
+def _write_scene(path):
+    """Yumuşak geçişli, kodlama kaybına dayanıklı bir test görüntüsü"""
+    y, x = np.mgrid[0:240, 0:320]
+    image = np.dstack([x * 255 // 320, y * 255 // 240, (x + y) * 255 // 560]).astype(np.uint8)
+    cv2.circle(image, (160, 120), 60, (30, 200, 240), -1)
+    cv2.rectangle(image, (20, 150), (110, 220), (240, 40, 60), -1)
+    cv2.imwrite(path, image)
+    return image
+
+
+def test_near_duplicate_reuses_result(tmp_path, monkeypatch):
+    images_dir, results_dir = tmp_path / "images", tmp_path / "results"
+    images_dir.mkdir()
+    image = _write_scene(str(images_dir / "a.png"))
+    # Aynı sahnenin JPEG olarak yeniden kodlanmış kopyası
+    cv2.imwrite(str(images_dir / "b.jpg"), image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+
+    CountingFaceAnalyzer.calls = []
+    monkeypatch.setattr(folder_watcher, "FaceAnalyzer", CountingFaceAnalyzer)
+
+    watcher = FolderWatcher(str(images_dir), str(results_dir), kinds=("yuz",), num_workers=1,
+                            settle_time=0, poll_interval=0, dedupe_distance=6)
+    stats = watcher.run(max_polls=1)
+
+    assert CountingFaceAnalyzer.calls == ["a.png"]
+    assert stats["islenen"] == 1
+    assert stats["kopya"] == 1
+    assert (results_dir / "face_analyzed_a.json").exists()
+    assert (results_dir / "face_analyzed_b.json").exists()
+    assert watcher.catalog.get("b.jpg")["analiz"]["yuz"] == "tamam"
+
+
+def test_dedupe_disabled_analyzes_every_file(tmp_path, monkeypatch):
+    images_dir, results_dir = tmp_path / "images", tmp_path / "results"
+    images_dir.mkdir()
+    image = _write_scene(str(images_dir / "a.png"))
+    cv2.imwrite(str(images_dir / "b.jpg"), image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+
+    CountingFaceAnalyzer.calls = []
+    monkeypatch.setattr(folder_watcher, "FaceAnalyzer", CountingFaceAnalyzer)
+
+    watcher = FolderWatcher(str(images_dir), str(results_dir), kinds=("yuz",), num_workers=1,
+                            settle_time=0, poll_interval=0)
+    stats = watcher.run(max_polls=1)
+
+    assert sorted(CountingFaceAnalyzer.calls) == ["a.png", "b.jpg"]
+    assert stats["islenen"] == 2
+    assert stats["kopya"] == 0
@@ -0,0 +1,71 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_catalog import ImageCatalog  # noqa: E402
+
+
+def _write(path, data, mtime_ns):
+    with open(path, "wb") as f:
+        f.write(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_refresh_detects_added_overwritten_and_removed(tmp_path):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    _write(images_dir / "a.jpg", b"a", 10 ** 18)
+    _write(images_dir / "b.png", b"b", 10 ** 18)
+    catalog = ImageCatalog(str(images_dir), save_interval=0)
+
+    added, changed, removed = catalog.refresh()
+    assert (sorted(added), changed, removed) == (["a.jpg", "b.png"], [], [])
+    catalog.mark_analyzed("a.jpg", "yuz", "tamam")
+
+    # Yerinde üzerine yazma klasör zamanını değiştirmez; stat kontrolüyle bulunur
+    dir_mtime = os.stat(images_dir).st_mtime_ns
+    _write(images_dir / "b.png", b"bb", 2 * 10 ** 18)
+    os.utime(images_dir, ns=(dir_mtime, dir_mtime))
+    assert catalog.refresh() == ([], ["b.png"], [])
+    assert catalog.refresh() == ([], [], [])
+
+    os.remove(images_dir / "b.png")
+    assert catalog.refresh() == ([], [], ["b.png"])
+    assert catalog.get("a.jpg")["analiz"] == {"yuz": "tamam"}
+
+
+def test_hashing_does_not_hold_the_lock(tmp_path, monkeypatch):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    _write(images_dir / "a.jpg", b"a", 10 ** 18)
+    catalog = ImageCatalog(str(images_dir), save_interval=0)
+    catalog.refresh()
+
+    _write(images_dir / "b.jpg", b"b", 10 ** 18)
+    hashing, release = threading.Event(), threading.Event()
+    original_hash = catalog.file_hash
+
+    def slow_hash(path, *args, **kwargs):
+        hashing.set()
+        release.wait(5)
+        return original_hash(path, *args, **kwargs)
+
+    monkeypatch.setattr(catalog, "file_hash", slow_hash)
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(changes=catalog.refresh(full=True)))
+    thread.start()
+    assert hashing.wait(5)
+
+    # Özet hesaplanırken analiz işaretlemesi ve sorgular beklemez
+    acquired = catalog.lock.acquire(timeout=1)
+    assert acquired
+    catalog.lock.release()
+    catalog.mark_analyzed("a.jpg", "yuz", "tamam", save=False)
+    assert catalog.pending("yuz") == []
+
+    release.set()
+    thread.join(5)
+    assert result["changes"] == (["b.jpg"], [], [])
+    assert catalog.get("a.jpg")["analiz"] == {"yuz": "tamam"}
@@ -0,0 +1,34 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perceptual_hash import BKTree, hamming  # noqa: E402
+
+
+def _node_count(node):
+    return 0 if node is None else 1 + sum(_node_count(child) for child in node[2].values())
+
+
+def test_removed_entries_are_compacted():
+    rng = random.Random(0)
+    tree = BKTree()
+    live = {}
+    for i in range(5000):
+        if live and rng.random() < 0.5:
+            value = rng.choice(list(live))
+            assert tree.remove(live.pop(value), value)
+        else:
+            live[i] = rng.getrandbits(64)
+            tree.add(live[i], i)
+
+        # Geçersiz düğümler hiçbir zaman ağacın yarısını aşmaz
+        assert tree.dead <= tree.rebuild_ratio * _node_count(tree.root)
+
+    assert len(tree) == len(live)
+    for _ in range(100):
+        query = rng.getrandbits(64)
+        expected = sorted((hamming(query, key), value) for value, key in live.items()
+                          if hamming(query, key) <= 20)
+        assert sorted((distance, value) for distance, _, value in tree.search(query, 20)) == expected
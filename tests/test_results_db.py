@@ -0,0 +1,47 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from results_db import ResultsDatabase  # noqa: E402
+
+
+def _face(eye):
+    return {
+        "ten_rengi": {"rgb": [200, 160, 130], "hex": "#c8a082", "tahmini_renk": "orta"},
+        "goz_rengi": {"rgb": [90, 60, 40], "hex": "#5a3c28", "tahmini_renk": eye},
+        "yuz_sekli": {"sekil": "oval", "oran": 0.8},
+    }
+
+
+def test_latest_result_is_per_path_not_per_name(tmp_path):
+    database = ResultsDatabase(str(tmp_path / "analiz.db"))
+    first, second = str(tmp_path / "a" / "foto.jpg"), str(tmp_path / "b" / "foto.jpg")
+    database.add_results([("yuz", first, _face("mavi"), None, None),
+                          ("yuz", second, _face("yeşil"), None, None)])
+    database.add_results([("yuz", first, _face("kahverengi"), None, None)])
+
+    rows = database.query("yuz")
+    assert sorted((row["kaynak_yolu"], row["goz_rengi"]) for row in rows) == \
+        [(first, "kahverengi"), (second, "yeşil")]
+    assert {row["kaynak"] for row in rows} == {"foto.jpg"}
+    assert dict(database.label_counts("yuz", "goz_rengi")) == {"kahverengi": 1, "yeşil": 1}
+    database.close()
+
+
+def test_old_database_is_migrated(tmp_path):
+    path = str(tmp_path / "analiz.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE yuz_sonuclari (id INTEGER PRIMARY KEY, kaynak TEXT NOT NULL, "
+                       "kaynak_ozet TEXT, ten_rengi TEXT, ten_r INTEGER, ten_g INTEGER, ten_b INTEGER, "
+                       "ten_hex TEXT, goz_rengi TEXT, goz_r INTEGER, goz_g INTEGER, goz_b INTEGER, goz_hex TEXT, "
+                       "yuz_sekli TEXT, yuz_orani REAL, sure_ms REAL, zaman TEXT NOT NULL)")
+    connection.execute("INSERT INTO yuz_sonuclari (kaynak, goz_rengi, zaman) VALUES ('eski.jpg', 'gri', 'x')")
+    connection.commit()
+    connection.close()
+
+    database = ResultsDatabase(path)
+    database.add_results([("yuz", str(tmp_path / "yeni.jpg"), _face("mavi"), None, None)])
+    assert sorted(row["kaynak"] for row in database.query("yuz")) == ["eski.jpg", "yeni.jpg"]
+    database.close()
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import re
+import threading
+import wave
+from time import monotonic
+
+
+class GTTSBackend:
+    """Google TTS (ağ bağlantısı gerektirir, mp3 üretir)"""
+
+    name = "gtts"
+    extension = ".mp3"
+
+    def synthesize(self, text, lang, output_path):
+        from gtts import gTTS
+        tts = gTTS(text=text, lang=lang)
+        tts.save(output_path)
+
+
+class Pyttsx3Backend:
+    """Çevrimdışı yerel TTS (pyttsx3 kuruluysa kullanılır, wav üretir)"""
+
+    name = "pyttsx3"
+    extension = ".wav"
+
+    def __init__(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.lock = threading.Lock()
+        self.voices = {}  # dil -> ses kimliği (None: uygun ses yok, varsayılan kullanılır)
+
+    def _voice_for(self, lang):
+        """Dile uygun sistem sesini bulur (dil kodu sesin dillerinde, kimliğinde veya adında aranır)"""
+        if lang not in self.voices:
+            lang_code = lang.lower()
+            voice_id = None
+            for voice in self.engine.getProperty("voices"):
+                languages = [language.decode("utf-8", "ignore") if isinstance(language, bytes) else str(language)
+                             for language in (getattr(voice, "languages", None) or [])]
+                # Bazı sürücüler dil kodunun önüne kontrol baytı ekler ("\x05tr")
+                languages = [language.strip("\x00\x05").lower().replace("_", "-") for language in languages]
+                # Kimlik/ad parçaları: ör. "TTS_MS_TR-TR_TOLGA_11.0", "europe/tr"
+                tokens = re.split(r"[^a-z0-9]+", f"{voice.id} {getattr(voice, 'name', '')}".lower())
+                if any(language.split("-")[0] == lang_code for language in languages) or lang_code in tokens:
+                    voice_id = voice.id
+                    break
+            if voice_id is None:
+                print(f"'{lang}' dili için çevrimdışı ses bulunamadı, varsayılan ses kullanılıyor")
+            self.voices[lang] = voice_id
+        return self.voices[lang]
+
+    def synthesize(self, text, lang, output_path):
+        # pyttsx3 motoru thread güvenli değil
+        with self.lock:
+            voice_id = self._voice_for(lang)
+            if voice_id is not None:
+                self.engine.setProperty("voice", voice_id)
+            self.engine.save_to_file(text, output_path)
+            self.engine.runAndWait()
+
+
+class SilentBackend:
+    """
+    Ağ ve TTS motoru olmayan ortamlar için yer tutucu: metin uzunluğuyla orantılı sessiz wav üretir.
+    Test ve ölçümlerde seslendirme akışının tamamının çalışmasını sağlar.
+    """
+
+    name = "silent"
+    extension = ".wav"
+
+    def __init__(self, sample_rate=16000, seconds_per_char=0.06):
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+
+    def synthesize(self, text, lang, output_path):
+        frames = int(self.sample_rate * max(0.2, len(text) * self.seconds_per_char))
+        with wave.open(output_path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(self.sample_rate)
+            f.writeframes(b"\x00\x00" * frames)
+
+
+def create_offline_backend():
+    """Kullanılabilir en iyi çevrimdışı arka ucu döndürür (pyttsx3, yoksa sessiz yer tutucu)"""
+    try:
+        return Pyttsx3Backend()
+    except Exception:
+        return SilentBackend()
+
+
+class PhraseCache:
+    """
+    Seslendirilmiş cümleleri metin+dil anahtarıyla diskte saklar.
+    Aynı cümle tekrar istendiğinde yeniden sentezlenmez; yalnızca yeni metinler arka uca gider.
+    Birincil arka uç (ör. gTTS) hata verirse yedek arka uç (çevrimdışı) kullanılır.
+    Yedek ses yalnızca geçici bir çözümdür: birincil dosyası olmayan cümle için birincil arka uç
+    (son hatadan retry_interval saniye geçtikten sonra) tekrar denenir, başarılı olursa yedek dosya silinir.
+    """
+
+    def __init__(self, cache_dir, backend=None, fallback_backend=None, retry_interval=60.0):
+        self.cache_dir = cache_dir
+        self.backend = backend or GTTSBackend()
+        self.fallback_backend = fallback_backend
+        self.retry_interval = retry_interval
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._primary_failed_at = None  # Birincil arka ucun son hata zamanı
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def _key(self, text, lang):
+        return hashlib.sha1(f"{lang}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, text, lang, backend):
+        return os.path.join(self.cache_dir, f"{self._key(text, lang)}_{backend.name}{backend.extension}")
+
+    def lookup(self, text, lang="tr", primary_only=False):
+        """Önbellekteki ses dosyasını döndürür (yoksa None); primary_only ise yedek dosyalar sayılmaz"""
+        backends = (self.backend,) if primary_only else (self.backend, self.fallback_backend)
+        for backend in backends:
+            if backend is None:
+                continue
+            path = self._path(text, lang, backend)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _primary_available(self):
+        return self._primary_failed_at is None or monotonic() - self._primary_failed_at >= self.retry_interval
+
+    def get(self, text, lang="tr"):
+        """
+        Cümlenin ses dosyasını döndürür; birincil arka ucun dosyası yoksa onunla sentezler.
+        Birincil arka uç başarısızsa önbellekteki veya yeni üretilen yedek ses döner.
+        """
+        path = self.lookup(text, lang, primary_only=True)
+        if path is not None:
+            self.hits += 1
+            return path
+
+        fallback_path = self._path(text, lang, self.fallback_backend) if self.fallback_backend else None
+        has_fallback = fallback_path is not None and os.path.exists(fallback_path)
+
+        if self._primary_available():
+            try:
+                path = self._synthesize(self.backend, text, lang)
+                self._primary_failed_at = None
+                self.misses += 1
+                if has_fallback:
+                    # Birincil ses geldi; yedek ses artık kullanılmayacak
+                    try:
+                        os.remove(fallback_path)
+                    except OSError:
+                        pass
+                return path
+            except Exception as e:
+                self._primary_failed_at = monotonic()
+                if self.fallback_backend is None:
+                    raise
+                print(f"Seslendirme servisi kullanılamıyor ({e}), çevrimdışı seslendirme kullanılıyor")
+        elif self.fallback_backend is None:
+            raise ValueError("Seslendirme servisi geçici olarak kullanılamıyor")
+
+        if has_fallback:
+            self.hits += 1
+            return fallback_path
+        self.misses += 1
+        return self._synthesize(self.fallback_backend, text, lang)
+
+    def _synthesize(self, backend, text, lang):
+        """Dosyayı önce geçici ada yazar, sonra taşır (yarım dosya önbelleğe girmez)"""
+        path = self._path(text, lang, backend)
+        temp_path = f"{path}.{threading.get_ident()}.tmp{backend.extension}"
+        try:
+            backend.synthesize(text, lang, temp_path)
+            with self.lock:
+                os.replace(temp_path, path)
+        except Exception:
+            # Yarım kalan geçici dosya önbellek klasöründe bırakılmaz
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return path
+
+    def prewarm(self, phrases, lang="tr", background=True):
+        """Sabit cümleleri önceden sentezler (varsayılan olarak arka planda)"""
+        def warm():
+            for text in phrases:
+                try:
+                    # Yalnızca yedek sesi olan cümleler için birincil arka uç yeniden denenir
+                    if self.lookup(text, lang, primary_only=True) is None:
+                        self.get(text, lang)
+                except Exception as e:
+                    print(f"Önbellek hazırlama hatası: {e}")
+
+        if not background:
+            warm()
+            return None
+
+        thread = threading.Thread(target=warm, daemon=True)
+        thread.start()
+        return thread